@@ -0,0 +1 @@
+# Backend/bench/__init__.py
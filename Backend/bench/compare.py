@@ -0,0 +1,45 @@
+# Backend/bench/compare.py
+"""
+두 벤치마크 결과 비교 (엔드포인트별 p50/p95/p99 변화율)
+
+    python -m bench.compare bench/results/before.json bench/results/after.json
+"""
+
+import argparse
+import json
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return "    -"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+
+    print(f"before: {before['meta']['commit']}  after: {after['meta']['commit']}\n")
+    print(f"{'endpoint':<36}{'p50':>18}{'p95':>18}{'p99':>18}")
+    rows = sorted(set(before["endpoints"]) | set(after["endpoints"]))
+    for label in rows + ["TOTAL"]:
+        b = before["total"] if label == "TOTAL" else before["endpoints"].get(label, {})
+        a = after["total"] if label == "TOTAL" else after["endpoints"].get(label, {})
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if key in a and key in b:
+                cells.append(f"{a[key]:>9.1f} {_delta(b[key], a[key])}")
+            else:
+                cells.append(f"{'-':>18}")
+        print(f"{label:<36}" + "".join(f"{cell:>18}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# Backend/bench/fake_apis.py
+"""
+벤치마크용 가짜 외부 API 서버 - OpenAI Chat Completions, YouTube Data API, Google Custom Search
+
+프롬프트 내용을 보고 앱이 기대하는 모양의 JSON(퀴즈/추천/주간 계획/복습 자료)을 돌려주고,
+응답 전에 설정한 지연시간만큼 대기한다.
+
+단독 실행:
+    python -m bench.fake_apis --port 8900 --llm-latency-ms 800 --search-latency-ms 150
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import urlparse, parse_qs
+
+_DATES_RE = re.compile(r'학습 날짜:\s*([0-9,\-\s]+)')
+_counter = itertools.count(1)
+
+
+def _quizzes() -> Dict:
+    # 문제 은행에 중복 없이 쌓이도록 매번 다른 문장 생성
+    batch = next(_counter)
+    return {"quizzes": [
+        {
+            "id": i + 1,
+            "type": "OX",
+            "question": f"벤치마크 문제 {batch}-{i + 1}: 이 문장은 {'참' if i % 2 == 0 else '거짓'}이다.",
+            "options": [],
+            "answerKey": "O" if i % 2 == 0 else "X",
+            "explanation": "벤치마크용 가짜 해설입니다."
+        }
+        for i in range(10)
+    ]}
+
+
+def _recommendations() -> Dict:
+    courses = []
+    for c in range(6):
+        curriculum = [
+            {
+                "section": f"섹션 {s + 1}",
+                "lectures": [
+                    {"title": f"{s * 5 + l + 1}강: 주제 {s + 1}-{l + 1}",
+                     "duration": f"{random.choice([10, 15, 25, 30, 45])}분",
+                     "description": "벤치마크용 강의 설명"}
+                    for l in range(5)
+                ]
+            }
+            for s in range(3)
+        ]
+        courses.append({
+            "id": f"bench_course_{c + 1}",
+            "title": f"벤치마크 강좌 {c + 1}",
+            "provider": "인프런",
+            "instructor": "벤치 강사",
+            "type": "course",
+            "weeks": 4,
+            "free": c % 2 == 0,
+            "rating": 4.5,
+            "students": "1234명",
+            "total_lectures": 15,
+            "total_duration": "총 7시간",
+            "summary": "벤치마크용 강좌입니다.",
+            "reason": "벤치마크용 추천 사유입니다.",
+            "curriculum": curriculum,
+            "link": f"https://www.inflearn.com/course/bench-{c + 1}",
+            "price": "55000원",
+            "level_detail": "초급 수준"
+        })
+    return {"recommendations": courses}
+
+
+def _daily_schedule(prompt: str) -> Dict:
+    match = _DATES_RE.search(prompt)
+    dates = [d.strip() for d in match.group(1).split(',') if d.strip()] if match else [date.today().isoformat()]
+    return {"daily_schedule": [
+        {
+            "date": d,
+            "tasks": [
+                {"id": str(uuid.uuid4()), "title": f"{d} 강의 시청", "description": "강의 시청",
+                 "duration": "40분", "completed": False, "section": "섹션", "task_type": "lecture"},
+                {"id": str(uuid.uuid4()), "title": f"{d} 실습", "description": "실습",
+                 "duration": "30분", "completed": False, "section": "섹션", "task_type": "practice"},
+            ]
+        }
+        for d in dates
+    ]}
+
+
+def _materials() -> Dict:
+    return {"materials": [
+        {"title": f"복습 자료 {i + 1}", "type": "유튜브" if i < 2 else "블로그",
+         "url": f"https://www.youtube.com/watch?v=bench{i}", "description": "벤치마크용 자료", "duration": "10분"}
+        for i in range(5)
+    ]}
+
+
+def fake_completion(prompt: str) -> str:
+    """프롬프트 종류에 맞는 가짜 응답 본문"""
+    if 'O/X 퀴즈' in prompt:
+        data = _quizzes()
+    elif '"recommendations"' in prompt:
+        data = _recommendations()
+    elif '"daily_schedule"' in prompt:
+        data = _daily_schedule(prompt)
+    elif '"materials"' in prompt:
+        data = _materials()
+    else:
+        data = {"message": "bench"}
+    return f"```json\n{json.dumps(data, ensure_ascii=False)}\n```"
+
+
+def _search_items(kind: str, query: str, count: int) -> List[Dict]:
+    if kind == "youtube":
+        return [
+            {"id": {"videoId": f"bench{i}"}, "snippet": {"title": f"{query} 영상 {i + 1}"}}
+            for i in range(count)
+        ]
+    return [
+        {"title": f"{query} 블로그 {i + 1}", "link": f"https://velog.io/@bench/{i}", "snippet": "벤치마크용 검색 결과"}
+        for i in range(count)
+    ]
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    llm_latency = 0.0
+    search_latency = 0.0
+    stats = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: Dict, status: int = 200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, key: str):
+        with self.stats["lock"]:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith("/chat/completions"):
+            return self._send_json({"error": {"message": "not found"}}, 404)
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        prompt = ''.join(m.get('content', '') for m in request.get('messages', []) if isinstance(m.get('content'), str))
+        self._count("llm")
+        time.sleep(self.llm_latency)
+        content = fake_completion(prompt)
+        self._send_json({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4}
+        })
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        q = query.get("q", [""])[0]
+        if url.path.endswith("/youtube/v3/search"):
+            kind, count = "youtube", int(query.get("maxResults", ["1"])[0])
+        elif url.path.endswith("/customsearch/v1"):
+            kind, count = "blog", int(query.get("num", ["1"])[0])
+        else:
+            return self._send_json({"error": "not found"}, 404)
+        self._count(kind)
+        time.sleep(self.search_latency)
+        self._send_json({"items": _search_items(kind, q, count)})
+
+
+def start_fake_apis(port: int = 0, llm_latency_ms: float = 0, search_latency_ms: float = 0):
+    """백그라운드 스레드에서 가짜 API 서버 시작 - (server, base_url, stats) 반환"""
+    handler = type("ConfiguredFakeAPIHandler", (FakeAPIHandler,), {
+        "llm_latency": llm_latency_ms / 1000,
+        "search_latency": search_latency_ms / 1000,
+        "stats": {"lock": threading.Lock()},
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-apis").start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", handler.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 가짜 OpenAI/YouTube/CSE 서버")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--search-latency-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    server, base_url, _ = start_fake_apis(args.port, args.llm_latency_ms, args.search_latency_ms)
+    print(f"OPENAI_BASE_URL={base_url}/v1")
+    print(f"YOUTUBE_API_URL={base_url}/youtube/v3/search")
+    print(f"GOOGLE_CSE_API_URL={base_url}/customsearch/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# Backend/bench/run.py
+"""
+엔드포인트 벤치마크 - 임시 SQLite DB와 가짜 외부 API로 서버를 띄우고 실제 사용자 흐름을 동시에 실행
+
+흐름 (사용자 1명당):
+    회원가입 → 로그인 → 퀴즈 출제/채점 → 강좌 추천 → 계획 적용 → 오늘 태스크 완료 토글 → 통계/친구/홈
+
+실행 (Backend 디렉토리에서):
+    python -m bench.run --users 40 --concurrency 8 --llm-latency-ms 800 --search-latency-ms 150
+
+결과는 엔드포인트별 p50/p95/p99/처리량 JSON으로 저장되며, bench/compare.py로 커밋 간 비교할 수 있다.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List
+
+import requests
+
+from bench.fake_apis import start_fake_apis
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SKILLS = ["Python", "JavaScript", "SQL", "React", "Java", "데이터 분석"]
+PASSWORD = "Benchmark1"
+
+
+class Recorder:
+    """엔드포인트별 응답 시간/상태 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def call(self, session: requests.Session, label: str, method: str, url: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = None
+        try:
+            response = session.request(method, url, timeout=300, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.samples[label].append(elapsed)
+                if response is None or response.status_code >= 400:
+                    self.errors[label] += 1
+        return response
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder: Recorder, wall_seconds: float) -> Dict:
+    endpoints = {}
+    all_samples = []
+    for label, samples in recorder.samples.items():
+        ordered = sorted(samples)
+        all_samples.extend(ordered)
+        endpoints[label] = {
+            "count": len(ordered),
+            "errors": recorder.errors.get(label, 0),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "throughput_rps": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+        }
+    all_samples.sort()
+    total = {
+        "count": len(all_samples),
+        "errors": sum(recorder.errors.values()),
+        "p50_ms": round(percentile(all_samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(all_samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(all_samples, 99) * 1000, 2),
+        "throughput_rps": round(len(all_samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "wall_seconds": round(wall_seconds, 2),
+    }
+    return {"endpoints": endpoints, "total": total}
+
+
+def user_flow(base: str, recorder: Recorder, index: int, run_id: str, skill: str, toggles: int):
+    """사용자 1명의 전체 흐름"""
+    s = requests.Session()
+    email = f"bench-{run_id}-{index}@bench.local"
+
+    recorder.call(s, "POST /auth/signup", "POST", f"{base}/auth/signup", json={
+        "username": f"bench{index}", "email": email, "password": PASSWORD,
+        "name": f"벤치{index}", "birth": "2000-01-01"
+    })
+    r = recorder.call(s, "POST /auth/login", "POST", f"{base}/auth/login", json={"email": email, "password": PASSWORD})
+    if r.status_code != 200:
+        return
+    s.headers["Authorization"] = f"Bearer {r.json()['token']}"
+
+    r = recorder.call(s, "GET /quiz/items", "GET", f"{base}/quiz/items", params={"skill": skill, "level": "초급"})
+    if r.status_code == 200:
+        answers = [{"id": q["id"], "userAnswer": random.choice("OX")} for q in r.json()]
+        recorder.call(s, "POST /quiz/grade", "POST", f"{base}/quiz/grade", json={"answers": answers},
+                      headers={"X-Quiz-Session": r.headers.get("X-Quiz-Session", "")})
+
+    r = recorder.call(s, "GET /recommend/courses", "GET", f"{base}/recommend/courses",
+                      params={"skill": skill, "level": "초급"})
+    courses = r.json() if r.status_code == 200 else []
+    if courses:
+        recorder.call(s, "POST /plan/apply_recommendation", "POST", f"{base}/plan/apply_recommendation", json={
+            "selected_course": random.choice(courses),
+            "quiz_level": "초급",
+            "skill": skill,
+            "hourPerDay": random.choice([1, 1.5, 2, 3]),
+            "startDate": date.today().isoformat(),
+            "restDays": random.choice([[], ["토", "일"], ["일"]]),
+        })
+
+    today = date.today().isoformat()
+    r = recorder.call(s, "GET /plans/date/{target_date}", "GET", f"{base}/plans/date/{today}")
+    tasks = r.json().get("tasks", []) if r.status_code == 200 else []
+    for task in tasks[:toggles]:
+        recorder.call(s, "POST /plans/task/update", "POST", f"{base}/plans/task/update",
+                      params={"date": today, "task_id": task["id"], "completed": "true"})
+
+    for label, path in (
+        ("GET /home/header", "/home/header"),
+        ("GET /plans/all", "/plans/all"),
+        ("GET /stats/summary", "/stats/summary"),
+        ("GET /stats/weekly", "/stats/weekly"),
+        ("GET /friends", "/friends"),
+    ):
+        recorder.call(s, label, "GET", f"{base}{path}")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def start_server(port: int, workers: int, db_path: str, fake_base: str, extra_env: Dict[str, str]) -> subprocess.Popen:
+    """임시 DB와 가짜 API를 바라보는 uvicorn 서버 시작"""
+    env = {
+        **os.environ,
+        "ENV": "production",
+        "LOG_LEVEL": "ERROR",
+        "RATELIMIT_ENABLED": "false",
+        "PALEARN_DB_PATH": db_path,
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{fake_base}/v1",
+        "YOUTUBE_API_KEY": "bench",
+        "YOUTUBE_API_URL": f"{fake_base}/youtube/v3/search",
+        "GOOGLE_API_KEY": "bench",
+        "GOOGLE_CSE_ID": "bench",
+        "GOOGLE_CSE_API_URL": f"{fake_base}/customsearch/v1",
+        **extra_env,
+    }
+    # 친구 화면이 실제처럼 동작하도록 샘플 친구 데이터 추가
+    subprocess.run([sys.executable, "manage.py", "seed"], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    process = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버가 시작되지 않았습니다 (exit {process.returncode})")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("서버 시작 대기 시간 초과")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Palearn 엔드포인트 벤치마크")
+    parser.add_argument("--users", type=int, default=20, help="실행할 사용자 흐름 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 실행할 사용자 수")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--search-latency-ms", type=float, default=150)
+    parser.add_argument("--toggles", type=int, default=3, help="사용자당 태스크 완료 토글 수")
+    parser.add_argument("--skills", default=",".join(DEFAULT_SKILLS), help="사용자에게 돌아가며 배정할 분야 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: bench/results/<시각>-<커밋>.json)")
+    parser.add_argument("--env", action="append", default=[], help="서버에 추가로 넘길 환경변수 KEY=VALUE (반복 가능)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    skills = [s.strip() for s in args.skills.split(",") if s.strip()]
+    extra_env = dict(item.split("=", 1) for item in args.env if "=" in item)
+
+    fake_server, fake_base, fake_stats = start_fake_apis(0, args.llm_latency_ms, args.search_latency_ms)
+    tmp_dir = tempfile.mkdtemp(prefix="palearn-bench-")
+    port = _free_port()
+    server = start_server(port, args.workers, os.path.join(tmp_dir, "bench.db"), fake_base, extra_env)
+
+    recorder = Recorder()
+    run_id = datetime.now().strftime("%H%M%S")
+    base = f"http://127.0.0.1:{port}"
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [
+                executor.submit(user_flow, base, recorder, i, run_id, skills[i % len(skills)], args.toggles)
+                for i in range(args.users)
+            ]
+            for future in futures:
+                future.result()
+        wall = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        fake_server.shutdown()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "llm_latency_ms": args.llm_latency_ms,
+            "search_latency_ms": args.search_latency_ms,
+            "toggles": args.toggles,
+            "skills": skills,
+            "seed": args.seed,
+            "env": extra_env,
+            "upstream_calls": {k: v for k, v in fake_stats.items() if k != "lock"},
+        },
+        **summarize(recorder, wall),
+    }
+
+    output = args.output or os.path.join(
+        BACKEND_DIR, "bench", "results", f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    print(f"{'endpoint':<36}{'count':>7}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>8}")
+    for label, stat in sorted(report["endpoints"].items()):
+        print(f"{label:<36}{stat['count']:>7}{stat['errors']:>5}{stat['p50_ms']:>10.1f}"
+              f"{stat['p95_ms']:>10.1f}{stat['p99_ms']:>10.1f}{stat['throughput_rps']:>8.2f}")
+    total = report["total"]
+    print(f"{'TOTAL':<36}{total['count']:>7}{total['errors']:>5}{total['p50_ms']:>10.1f}"
+          f"{total['p95_ms']:>10.1f}{total['p99_ms']:>10.1f}{total['throughput_rps']:>8.2f}")
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
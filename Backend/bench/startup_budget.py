@@ -0,0 +1,156 @@
+# Backend/bench/startup_budget.py
+"""
+서버 시작 시간 예산 검사 - scale-to-zero 재시작이 빠르게 올라오는지 확인
+
+1. `python -X importtime -c "import main"` 결과로 import 시간 보고 (최상위 패키지별 누적, 느린 모듈 상위 N개)
+2. 시작 시점에 import되면 안 되는 무거운 SDK(openai, requests, jose, bcrypt)가 로드됐는지 확인
+3. uvicorn 프로세스 실행부터 /health 첫 200 응답까지 걸린 시간 (새 DB 1회 + 마이그레이션된 DB 재시작 N회)
+
+예산을 넘거나 금지 모듈이 로드되면 exit 1:
+
+    python -m bench.startup_budget --import-budget-ms 1500 --ready-budget-ms 3000
+"""
+
+import argparse
+import http.client
+import os
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FORBIDDEN = ["openai", "requests", "jose", "bcrypt"]
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_env(db_path: str) -> Dict[str, str]:
+    # API 키가 있어도 시작 시 SDK를 로드하지 않는지 보려고 가짜 키 설정 (실제 호출은 하지 않음)
+    return {
+        **os.environ,
+        "ENV": "production",
+        "LOG_LEVEL": "ERROR",
+        "PALEARN_DB_PATH": db_path,
+        "OPENAI_API_KEY": "startup-budget",
+        "YOUTUBE_API_KEY": "startup-budget",
+        "RECOMMEND_PREWARM_ENABLED": "false",
+    }
+
+
+def measure_imports(env: Dict[str, str]) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """`import main`의 importtime 측정 - (전체 ms, [(모듈, self_us, cumulative_us)])"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = int(match.group(1)), int(match.group(2)), match.group(4)
+        modules.append((name, self_us, cumulative_us))
+        if name == "main":
+            total_us = cumulative_us
+    return total_us / 1000, modules
+
+
+def time_to_first_200(env: Dict[str, str], timeout: float = 60) -> float:
+    """uvicorn 실행부터 /health 200까지 걸린 시간 (ms)"""
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버가 시작되지 않았습니다 (exit {process.returncode})")
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            try:
+                conn.request("GET", "/health")
+                if conn.getresponse().status == 200:
+                    return (time.perf_counter() - start) * 1000
+            except OSError:
+                pass
+            finally:
+                conn.close()
+            time.sleep(0.01)
+        raise RuntimeError("서버 시작 대기 시간 초과")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 시간 예산 검사")
+    parser.add_argument("--import-budget-ms", type=float, default=1500, help="`import main` 허용 시간")
+    parser.add_argument("--ready-budget-ms", type=float, default=3000, help="재시작 후 /health 첫 200까지 허용 시간 (중앙값)")
+    parser.add_argument("--restarts", type=int, default=3, help="마이그레이션된 DB로 재시작 측정 횟수")
+    parser.add_argument("--top", type=int, default=15, help="보고할 느린 모듈 수")
+    parser.add_argument("--forbid", default=",".join(DEFAULT_FORBIDDEN),
+                        help="시작 시 import되면 실패로 볼 패키지 (쉼표 구분, 빈 값이면 검사 안 함)")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="palearn-startup-")
+    env = _server_env(os.path.join(tmp_dir, "startup.db"))
+    failures = []
+    try:
+        import_ms, modules = measure_imports(env)
+
+        by_package: Dict[str, int] = defaultdict(int)
+        for name, self_us, _ in modules:
+            by_package[name.split(".")[0]] += self_us
+        print(f"import main: {import_ms:.1f}ms (예산 {args.import_budget_ms:.0f}ms)\n")
+        print(f"{'package':<32}{'self ms':>10}")
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"{package:<32}{self_us / 1000:>10.1f}")
+        print(f"\n{'module':<48}{'cumulative ms':>14}")
+        for name, _, cumulative_us in sorted(modules, key=lambda item: -item[2])[:args.top]:
+            print(f"{name:<48}{cumulative_us / 1000:>14.1f}")
+
+        if import_ms > args.import_budget_ms:
+            failures.append(f"import 시간 {import_ms:.1f}ms > 예산 {args.import_budget_ms:.0f}ms")
+
+        forbidden = [p.strip() for p in args.forbid.split(",") if p.strip()]
+        loaded = sorted({p for p in forbidden if p in by_package})
+        if loaded:
+            failures.append(f"시작 시 로드되면 안 되는 패키지: {', '.join(loaded)}")
+
+        fresh_ms = time_to_first_200(env)
+        restart_ms = [time_to_first_200(env) for _ in range(max(1, args.restarts))]
+        ready_ms = statistics.median(restart_ms)
+        print(f"\n/health 첫 200: 새 DB {fresh_ms:.0f}ms, 재시작 "
+              f"{', '.join(f'{ms:.0f}' for ms in restart_ms)}ms (중앙값 {ready_ms:.0f}ms, 예산 {args.ready_budget_ms:.0f}ms)")
+        if ready_ms > args.ready_budget_ms:
+            failures.append(f"재시작 후 첫 200 {ready_ms:.0f}ms > 예산 {args.ready_budget_ms:.0f}ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if failures:
+        print("\n예산 초과:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n예산 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,40 @@
 # Backend/main.py
 """Palearn API 메인 진입점 - 보안 강화 버전"""
 
+from dotenv import load_dotenv
+
+# 서비스 모듈들이 import 시점에 환경변수를 읽으므로 가장 먼저 .env 로드
+load_dotenv()
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
+import asyncio
 import os
-
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-
-from utils.logger import Colors
-from routers import auth, quiz, profile, home, plans, recommend, friends, notifications, review, plan_apply, stats
-
-# Rate Limiter 설정
-limiter = Limiter(key_func=get_remote_address)
+import time
+
+from utils.logger import Colors, LOG_FORMAT, log_info
+from routers import auth, quiz, profile, home, plans, recommend, friends, notifications, review, plan_apply, stats, admin
+from services.store import store
+from services.recommend_cache import start_refresher, stop_refresher
+from services.review_jobs import start_scheduler, stop_scheduler
+from services.batch_llm import start_worker, stop_worker
+from services.metrics import begin_request, finish_request, render_metrics
+from services.profiler import ProfilingMiddleware
+from services.compression import CompressionMiddleware
+from services.json_response import FastJSONResponse
+from services.db_trace import begin_trace, finish_trace
+from services.llm_admission import LLMBusyError
+from services.idempotency import IdempotencyError
 
 app = FastAPI(
     title="Palearn API",
     version="2.0.0",
-    description="AI 기반 개인화 학습 플랫폼 API"
+    description="AI 기반 개인화 학습 플랫폼 API",
+    default_response_class=FastJSONResponse  # orjson 직렬화
 )
 
-# Rate Limiter 등록
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # CORS 설정 - 화이트리스트 방식 (Flutter 웹 포트 포함)
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8080,http://127.0.0.1:3000,http://127.0.0.1:53832,http://localhost:53832").split(",")
 
@@ -39,10 +47,61 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
-    allow_headers=["Authorization", "Content-Type", "Accept"],
+    allow_headers=["Authorization", "Content-Type", "Accept", "X-Quiz-Session", "X-Profile", "X-Admin-Token", "If-None-Match", "Idempotency-Key"],
+    expose_headers=["Retry-After", "X-Quiz-Session", "X-Profile-Id", "X-Next-Cursor", "X-Data-Version", "ETag", "Idempotent-Replayed"],
     max_age=600,  # Preflight 캐시 10분
 )
 
+# 응답 압축 (brotli/gzip, 1KB 이상 JSON/텍스트)
+app.add_middleware(CompressionMiddleware)
+
+# 관리자 요청 프로파일링 (X-Profile + X-Admin-Token 헤더가 있는 요청만)
+app.add_middleware(ProfilingMiddleware)
+
+
+# 요청 처리 시간 / 요청당 DB 쿼리 지표 및 추적 (느린 쿼리, N+1 의심)
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    stats = begin_request()
+    begin_trace()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 경로 파라미터별로 라벨이 늘어나지 않도록 라우트 템플릿 사용
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        finish_request(request.method, route_path, status, time.perf_counter() - start, stats)
+        finish_trace(request.method, route_path)
+
+
+# Idempotency-Key 재사용 오류(422) / 같은 요청 처리 중(409 + Retry-After)
+@app.exception_handler(IdempotencyError)
+async def idempotency_error_handler(request: Request, exc: IdempotencyError):
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"success": False, "detail": exc.detail},
+        headers=headers
+    )
+
+
+# LLM 대기열 초과 - 잠시 후 재시도하도록 503 + Retry-After
+@app.exception_handler(LLMBusyError)
+async def llm_busy_handler(request: Request, exc: LLMBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={
+            "success": False,
+            "detail": "AI 요청이 많아 잠시 후 다시 시도해주세요.",
+            "retry_after": exc.retry_after
+        },
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 
 # 전역 에러 핸들러
 @app.exception_handler(Exception)
@@ -69,6 +128,7 @@ app.include_router(notifications.router)
 app.include_router(review.router)
 app.include_router(plan_apply.router)
 app.include_router(stats.router)
+app.include_router(admin.router)
 
 
 @app.get("/health")
@@ -81,6 +141,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 지표 - 이 워커 프로세스의 값 (worker 라벨)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """API 정보"""
@@ -99,6 +165,24 @@ async def root():
 
 @app.on_event("startup")
 async def startup_event():
+    # 스키마 마이그레이션 (최신이면 버전 확인만)
+    store.migrate()
+
+    # 인기 강좌 추천 미리 생성 (백그라운드)
+    start_refresher()
+    # 어제 복습 자료 미리 계산 (매일 자정 이후)
+    start_scheduler()
+    # 비대화형 GPT 요청 배치 제출/결과 처리 (BATCH_LLM_BACKEND 설정 시)
+    start_worker()
+
+    # 배너는 시작 경로에서 빼고 이벤트 루프가 돌기 시작한 뒤 출력 (JSON 로그 환경에서는 한 줄만)
+    if LOG_FORMAT == "pretty":
+        asyncio.get_running_loop().call_soon(_print_banner)
+    else:
+        log_info("Palearn API 서버 시작 완료")
+
+
+def _print_banner():
     print(f"""
 {Colors.CYAN}{'='*70}
 
@@ -120,7 +204,7 @@ async def startup_event():
 
 {Colors.GREEN}[DATABASE]{Colors.ENDC}
   - SQLite 영속성 저장소
-  - 자동 테이블 생성
+  - 버전 기반 스키마 마이그레이션
 
 {Colors.GREEN}[SERVER READY]{Colors.ENDC} http://localhost:8000
 {Colors.BLUE}[API DOCS]{Colors.ENDC}     http://localhost:8000/docs
@@ -145,6 +229,13 @@ async def startup_event():
 """)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_refresher()
+    stop_scheduler()
+    stop_worker()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
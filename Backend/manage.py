@@ -0,0 +1,73 @@
+# Backend/manage.py
+"""
+관리 명령
+
+    python manage.py migrate   # 스키마 마이그레이션 적용
+    python manage.py seed      # 마이그레이션 후 샘플 친구/학습 계획 데이터 추가 (개발용)
+    python manage.py status    # 현재 스키마 버전 확인
+    python manage.py review-snapshots [--date YYYY-MM-DD]   # 어제(또는 지정 날짜) 복습 스냅샷 계산 (cron용)
+    python manage.py llm-batch [--force]   # 배치 결과 처리 + 쌓인 요청 제출 (--force: 개수/대기 시간과 관계없이 제출)
+"""
+
+import argparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services.store import store, DB_PATH
+from services.migrations import current_version, LATEST_VERSION
+
+
+def cmd_migrate(args):
+    version = store.migrate()
+    print(f"스키마 버전: v{version}")
+
+
+def cmd_seed(args):
+    store.migrate()
+    store.init_sample_data()
+    print("샘플 데이터 준비 완료")
+
+
+def cmd_status(args):
+    print(f"DB: {DB_PATH}")
+    print(f"스키마 버전: v{current_version(DB_PATH)} (최신 v{LATEST_VERSION})")
+
+
+def cmd_review_snapshots(args):
+    from services.review_jobs import precompute_reviews
+    store.migrate()
+    computed = precompute_reviews(args.date)
+    print(f"복습 스냅샷 계산: {computed}명")
+
+
+def cmd_llm_batch(args):
+    from services import batch_llm
+    if not batch_llm.enabled():
+        print("BATCH_LLM_BACKEND가 off입니다")
+        return
+    store.migrate()
+    result = batch_llm.run_once(force=args.force)
+    print(f"배치 결과 처리: {result['handled']}개, 제출: {result['submitted']}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Palearn 관리 명령")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="스키마 마이그레이션 적용").set_defaults(func=cmd_migrate)
+    commands.add_parser("seed", help="샘플 친구/학습 계획 데이터 추가").set_defaults(func=cmd_seed)
+    commands.add_parser("status", help="스키마 버전 확인").set_defaults(func=cmd_status)
+    review = commands.add_parser("review-snapshots", help="복습 스냅샷 계산 (기본: 어제)")
+    review.add_argument("--date", help="복습 날짜 (YYYY-MM-DD)")
+    review.set_defaults(func=cmd_review_snapshots)
+    batch = commands.add_parser("llm-batch", help="LLM 배치 결과 처리 및 제출")
+    batch.add_argument("--force", action="store_true", help="쌓인 요청을 바로 제출")
+    batch.set_defaults(func=cmd_llm_batch)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
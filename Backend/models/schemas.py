@@ -1,7 +1,7 @@
 # Backend/models/schemas.py
 """Pydantic 모델 정의"""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 
 
@@ -34,6 +34,7 @@ class QuizAnswer(BaseModel):
 
 class QuizSubmitRequest(BaseModel):
     answers: List[QuizAnswer]
+    session: Optional[str] = None  # /quiz/items 응답의 X-Quiz-Session 토큰
 
 
 class PlanGenerateRequest(BaseModel):
@@ -44,6 +45,16 @@ class PlanGenerateRequest(BaseModel):
     selfLevel: str
 
 
+class TaskUpdateOp(BaseModel):
+    date: str
+    task_id: str
+    completed: bool
+
+
+class TaskBatchUpdateRequest(BaseModel):
+    updates: List[TaskUpdateOp] = Field(..., max_length=200)
+
+
 class AddFriendRequest(BaseModel):
     code: str
 
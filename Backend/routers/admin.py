@@ -0,0 +1,55 @@
+# Backend/routers/admin.py
+"""관리자 전용 라우터 - 요청 프로파일 / DB 쿼리 추적 / LLM 대기열 조회"""
+
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import FileResponse
+from typing import Dict, List
+
+from services.profiler import is_admin_token, list_profiles, get_profile_file
+from services.db_trace import route_summaries, slow_queries
+from services.llm_admission import admission
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+async def require_admin(x_admin_token: str = Header(None)):
+    """관리자 토큰 확인 (ADMIN_TOKEN 환경변수)"""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+async def get_profiles() -> List[Dict]:
+    """저장된 요청 프로파일 목록 (최신순)"""
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str):
+    """프로파일 파일 다운로드 - sample: collapsed stacks 텍스트, cprofile: pstats 바이너리"""
+    found = get_profile_file(profile_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+
+    path, mode = found
+    if mode == "sample":
+        return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"{profile_id}.collapsed")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
+
+
+@router.get("/db/routes", dependencies=[Depends(require_admin)])
+async def get_db_route_summaries(top: int = 5) -> List[Dict]:
+    """라우트별 DB 쿼리 요약 - 요청당 쿼리 수/시간, 자주 실행된 쿼리, N+1 의심 쿼리"""
+    return route_summaries(top_queries=max(1, min(top, 50)))
+
+
+@router.get("/db/slow", dependencies=[Depends(require_admin)])
+async def get_slow_queries() -> List[Dict]:
+    """최근 느린 쿼리와 실행 계획 (최신순)"""
+    return slow_queries()
+
+
+@router.get("/llm/admission", dependencies=[Depends(require_admin)])
+async def get_llm_admission() -> Dict:
+    """이 워커의 LLM 실행/대기 현황"""
+    return admission.snapshot()
@@ -5,15 +5,12 @@ from fastapi import APIRouter, HTTPException, Depends, Header, Request
 from typing import Dict
 import re
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
 from models.schemas import SignupRequest, LoginRequest
 from services.store import store
+from services.quota import charge_user_limit, enforce_limit
 from utils.logger import log_request, log_stage, log_success, log_error, log_navigation
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
-limiter = Limiter(key_func=get_remote_address)
 
 
 # ==================== 입력 검증 함수 ====================
@@ -68,11 +65,27 @@ async def get_current_user(authorization: str = Header(None)) -> Dict:
     return user
 
 
+# ==================== 요청 한도 의존성 ====================
+
+# 한도 확인은 SQLite 쓰기 잠금을 잡으므로 의존성은 def로 두어 스레드풀에서 실행 (이벤트 루프를 막지 않도록)
+def ip_rate_limit(policy: str):
+    """IP별 요청 한도 (인증 전 라우트) - 프록시 뒤에서는 uvicorn --proxy-headers로 실제 IP 전달"""
+    def dependency(request: Request):
+        enforce_limit(policy, request.client.host if request.client else "unknown", 1)
+    return dependency
+
+
+def user_rate_limit(cost: int, policy: str = "llm"):
+    """사용자별 요청 한도 - cost만큼 차감 (GPT/검색을 많이 쓰는 엔드포인트일수록 크게)"""
+    def dependency(current_user: Dict = Depends(get_current_user)):
+        charge_user_limit(current_user['user_id'], cost, policy)
+    return dependency
+
+
 # ==================== API 엔드포인트 ====================
 
-@router.post("/signup")
-@limiter.limit("5/minute")  # 분당 5회 제한
-async def signup(request: Request, data: SignupRequest):
+@router.post("/signup", dependencies=[Depends(ip_rate_limit("signup"))])  # 분당 5회 제한
+async def signup(data: SignupRequest):
     """회원가입 - 입력 검증 강화"""
     log_request("POST /auth/signup", data.name, f"email={data.email}")
     log_stage(1, "회원가입", data.name)
@@ -118,9 +131,8 @@ async def signup(request: Request, data: SignupRequest):
     }
 
 
-@router.post("/login")
-@limiter.limit("10/minute")  # 분당 10회 제한 (브루트포스 방지)
-async def login(request: Request, data: LoginRequest):
+@router.post("/login", dependencies=[Depends(ip_rate_limit("login"))])  # 분당 10회 제한 (브루트포스 방지)
+async def login(data: LoginRequest):
     """로그인 - Rate Limiting 적용"""
     log_request("POST /auth/login", data.email)
     log_stage(2, "로그인", data.email)
@@ -1,11 +1,12 @@
 # Backend/routers/home.py
 """홈 관련 라우터"""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from typing import Dict
 from datetime import date
 
 from services.store import store
+from services.etag import user_etag, check_not_modified
 from utils.logger import log_request, log_stage, log_navigation
 from .auth import get_current_user
 
@@ -13,12 +14,13 @@ router = APIRouter(prefix="/home", tags=["Home"])
 
 
 @router.get("/header")
-async def get_home_header(current_user: Dict = Depends(get_current_user)):
+async def get_home_header(request: Request, response: Response, current_user: Dict = Depends(get_current_user)):
     log_request("GET /home/header", current_user['name'])
     log_stage(3, "홈 화면", current_user['name'])
     log_navigation(current_user['name'], "홈 화면")
 
     user_id = current_user['user_id']
+    check_not_modified(request, response, user_etag(user_id, "home/header", current_user['name']))
     plans = store.plans.get(user_id, [])
 
     today_progress = 0
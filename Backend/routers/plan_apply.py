@@ -1,20 +1,31 @@
 # Backend/routers/plan_apply.py
 """계획 적용 관련 라우터 - 강좌 커리큘럼 기반 학습 계획 생성"""
 
-from fastapi import APIRouter, Depends
-from typing import Dict, List
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, Header, Response
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import uuid
 
 from models.schemas import ApplyRecommendationRequest
 from services.store import store
 from services.gpt_service import call_gpt, extract_json
+from services.idempotency import run_idempotent
+from services.quota import PLAN_LLM_COST, charge_user_limit
+from services.llm_admission import LLM_PER_USER_CONCURRENCY
 from services.web_search import search_materials_for_topic
+from services.plan_scheduler import (
+    build_schedule, lecture_topics, lesson_dates, schedule_duration, study_dates, parse_start_date
+)
 from utils.logger import log_request, log_success, log_error, log_navigation, log_info
 from .auth import get_current_user
 
 router = APIRouter(prefix="/plan", tags=["Plan"])
 
+# 학습 자료 검색 동시 실행 수
+MATERIAL_SEARCH_WORKERS = 8
+# 주차별 GPT 계획 생성 최대 시도 횟수
+SHARD_MAX_ATTEMPTS = 2
+
 
 def _get_materials_for_task(topic: str) -> dict:
     """태스크에 대한 학습 자료 검색"""
@@ -72,85 +83,111 @@ def _flatten_curriculum(curriculum) -> List[Dict]:
     return all_lessons
 
 
-def _create_plan_with_gpt(
-    course: Dict,
-    skill: str,
-    hour_per_day: float,
-    start_date: str,
-    rest_days: List[str],
-    level: str
-) -> Dict:
-    """GPT를 사용하여 커리큘럼 기반 학습 계획 생성"""
-
-    course_title = course.get('title', '학습 강좌')
-    curriculum = course.get('curriculum', course.get('syllabus', []))
-    total_lectures = course.get('total_lectures', len(_flatten_curriculum(curriculum)))
-    total_duration = course.get('total_duration', '')
+def _curriculum_text(lessons: List[Dict]) -> str:
+    """평탄화된 강의 목록을 섹션별 프롬프트 문자열로 변환"""
+    text = ""
+    current_section = None
+    for lesson in lessons:
+        if lesson['section'] != current_section:
+            current_section = lesson['section']
+            text += f"\n[{current_section}]\n"
+        detail = f" ({lesson['duration']})" if lesson.get('duration') else ""
+        desc = f" : {lesson['description']}" if lesson.get('description') else ""
+        text += f"  - {lesson['title']}{detail}{desc}\n"
+    return text
+
+
+def _week_shards(lessons: List[Dict], skill: str, hour_per_day: float, start_date: str, rest_days: List[str]) -> List[Dict]:
+    """학습일을 주 단위로 나누고, 스케줄러 배치 결과로 각 주에 해당하는 강의를 할당"""
+    dates = study_dates(parse_start_date(start_date), rest_days)
+    if not dates:
+        return []
+
+    first = dates[0]
+    weeks: Dict[int, Dict] = {}
+    for d in dates:
+        week_no = (d - first).days // 7
+        weeks.setdefault(week_no, {"week": week_no + 1, "dates": [], "lessons": []})
+        weeks[week_no]['dates'].append(d.isoformat())
+
+    # 스케줄러로 각 강의가 처음 배치될 날짜를 구해 주별 커리큘럼 조각을 만듦 (제목이 아니라 위치로 대응)
+    for lesson, lesson_date in zip(lessons, lesson_dates(lessons, hour_per_day, start_date, rest_days)):
+        if not lesson_date:
+            continue
+        week_no = (parse_start_date(lesson_date) - first).days // 7
+        weeks[week_no]['lessons'].append(lesson)
+
+    shards = [weeks[k] for k in sorted(weeks)]
+    if lessons:
+        # 배치된 강의가 없는 뒤쪽 주는 생성하지 않음
+        while shards and not shards[-1]['lessons']:
+            shards.pop()
+    return shards
+
+
+def _validate_shard_days(data: Optional[Dict], shard: Dict) -> List[Dict]:
+    """GPT가 반환한 일정을 검증 - 해당 주의 학습일이고 태스크가 있는 날만 채택"""
+    if not isinstance(data, dict) or not isinstance(data.get('daily_schedule'), list):
+        return []
+
+    allowed = set(shard['dates'])
+    days = {}
+    for day in data['daily_schedule']:
+        if not isinstance(day, dict) or not isinstance(day.get('date'), str):
+            continue
+        if day['date'] not in allowed or day['date'] in days or not isinstance(day.get('tasks'), list):
+            continue
+        # "tasks": null 등 잘못된 형식은 그 날을 버려서, 남는 날이 없으면 해당 주를 재시도
+        tasks = [t for t in day['tasks'] if isinstance(t, dict) and t.get('title')]
+        if not tasks:
+            continue
+        for task in tasks:
+            if not str(task.get('id', '')).startswith('uuid'):
+                task['id'] = str(uuid.uuid4())
+            task['completed'] = bool(task.get('completed', False))
+        days[day['date']] = {"date": day['date'], "tasks": tasks}
 
-    # 커리큘럼 정보를 문자열로 변환
-    curriculum_str = ""
-    for item in curriculum:
-        if isinstance(item, dict) and 'section' in item:
-            curriculum_str += f"\n[{item['section']}]\n"
-            for lecture in item.get('lectures', []):
-                if isinstance(lecture, dict):
-                    curriculum_str += f"  - {lecture.get('title', '')} ({lecture.get('duration', '')}) : {lecture.get('description', '')}\n"
-                else:
-                    curriculum_str += f"  - {lecture}\n"
-        else:
-            curriculum_str += f"  - {item}\n"
+    return [days[d] for d in shard['dates'] if d in days]
 
-    if not curriculum_str.strip():
-        curriculum_str = f"{skill} 기초부터 심화까지"
 
-    log_info(f"GPT로 학습 계획 생성 시작: {course_title}")
+def _generate_week_shard(shard: Dict, context: Dict) -> List[Dict]:
+    """한 주 분량의 계획을 GPT로 생성 - 실패 시 해당 주만 재시도"""
+    if shard['lessons']:
+        curriculum_str = _curriculum_text(shard['lessons'])
+    else:
+        curriculum_str = f"{context['skill']} 기초부터 심화까지 중 {shard['week']}주차/{context['total_weeks']}주 분량"
 
+    rest_text = ', '.join(context['rest_days']) if context['rest_days'] else '없음'
     prompt = f"""[시스템 지시] 학습 계획 생성 API입니다. 반드시 JSON만 출력하세요.
 
-선택된 강좌 정보를 바탕으로 최적의 학습 계획을 만들어주세요.
+선택된 강좌의 {shard['week']}주차 학습 일정을 만들어주세요. (전체 {context['total_weeks']}주 중 {shard['week']}주차)
 
 📚 강좌 정보:
-- 강좌명: {course_title}
-- 총 강의 수: {total_lectures}개
-- 총 학습 시간: {total_duration}
-- 학습 분야: {skill}
-- 학습자 수준: {level}
+- 강좌명: {context['course_title']}
+- 총 강의 수: {context['total_lectures']}개
+- 총 학습 시간: {context['total_duration']}
+- 학습 분야: {context['skill']}
+- 학습자 수준: {context['level']}
 
-📋 커리큘럼:
+📋 이번 주 커리큘럼:
 {curriculum_str}
 
 ⏰ 학습 조건:
-- 시작 날짜: {start_date.split('T')[0]}
-- 하루 학습 시간: {hour_per_day}시간
-- 쉬는 요일: {', '.join(rest_days) if rest_days else '없음'}
+- 이번 주 학습 날짜: {', '.join(shard['dates'])}
+- 하루 학습 시간: {context['hour_per_day']}시간
+- 쉬는 요일: {rest_text}
 
 🎯 계획 생성 규칙 (매우 중요!):
-1. 학습자 수준({level})에 맞게 난이도 조절
-2. ⭐ 하루에 반드시 2~5개의 다양한 태스크를 포함할 것! (절대 1개만 넣지 말 것)
-3. ⭐ 매일 다양한 유형의 학습 활동을 포함:
-   - 📹 강의 시청: 메인 강의 내용
-   - 💻 실습/코딩 연습: 배운 내용을 직접 실습 (코드 작성, 예제 풀이 등)
-   - 📝 복습/정리: 이전 내용 복습, 노트 정리
-   - 🎬 유튜브 추천: 해당 주제 관련 유튜브 영상 시청 (필요시)
-   - 📖 추가 학습: 공식 문서, 블로그 글 읽기 (심화 학습)
-   - 🎯 미니 프로젝트/퀴즈: 작은 과제나 퀴즈로 이해도 확인
-4. 하루 {hour_per_day}시간에 맞게 시간 분배 (각 태스크에 적절한 시간 배분)
-5. 관련 강의들은 같은 날에 연속 배치
-6. 최대 4주(28일) 내에 완료되도록 설계
-7. 쉬는 요일({', '.join(rest_days) if rest_days else '없음'})은 제외
-8. task_type 필드로 태스크 유형 명시: "lecture", "practice", "review", "youtube", "reading", "quiz"
-
-예시 하루 일정:
-- 태스크1: 파이썬 기초 변수 강의 시청 (30분) - type: "lecture"
-- 태스크2: 변수 선언 실습 코딩 (20분) - type: "practice"
-- 태스크3: 유튜브 '파이썬 변수 쉽게 설명' 영상 (15분) - type: "youtube"
-- 태스크4: 변수 관련 퀴즈 풀기 (10분) - type: "quiz"
+1. 학습자 수준({context['level']})에 맞게 난이도 조절
+2. ⭐ 위 학습 날짜에만 일정을 만들고, 하루에 반드시 2~5개의 다양한 태스크를 포함할 것!
+3. ⭐ 매일 강의 시청, 실습, 복습, 유튜브, 추가 읽기, 퀴즈 중 다양한 활동을 섞을 것
+4. 하루 {context['hour_per_day']}시간에 맞게 각 태스크에 시간 분배
+5. 이번 주 커리큘럼의 강의를 순서대로, 관련 강의는 같은 날에 연속 배치
+6. task_type 필드로 태스크 유형 명시: "lecture", "practice", "review", "youtube", "reading", "quiz"
 
 반드시 아래 JSON 형식으로만 응답:
 ```json
 {{
-  "plan_name": "{course_title} 학습 계획",
-  "total_duration": "N주",
   "daily_schedule": [
     {{
       "date": "YYYY-MM-DD",
@@ -170,39 +207,106 @@ def _create_plan_with_gpt(
 }}
 ```
 
-⚠️ 중요: 반드시 하루에 2~5개의 태스크를 포함해야 합니다! 1개만 있으면 안 됩니다!
-
 지금 바로 JSON을 출력하세요:"""
 
-    response = call_gpt(prompt, use_search=False)
-    data = extract_json(response)
+    for attempt in range(1, SHARD_MAX_ATTEMPTS + 1):
+        response = call_gpt(prompt, use_search=False, priority="batch", user_id=context['user_id'])
+        days = _validate_shard_days(extract_json(response), shard)
+        if days:
+            return days
+        log_info(f"{shard['week']}주차 계획 생성 실패 ({attempt}/{SHARD_MAX_ATTEMPTS})")
+    return []
 
-    if data and 'daily_schedule' in data:
-        log_success("GPT 학습 계획 생성 성공")
-        # 각 태스크에 UUID와 학습 자료 추가
-        for day in data['daily_schedule']:
-            for task in day['tasks']:
-                if 'id' not in task or not task['id'].startswith('uuid'):
-                    task['id'] = str(uuid.uuid4())
-                if 'completed' not in task:
-                    task['completed'] = False
-                # 학습 자료 검색
-                search_topic = f"{skill} {task.get('title', '')}"
-                materials = _get_materials_for_task(search_topic)
-                task['related_materials'] = materials.get('related_materials', [])
-                task['review_materials'] = materials.get('review_materials', [])
 
-        # 강좌 정보 추가
-        data['course_info'] = {
+def _create_plan_with_gpt(
+    course: Dict,
+    skill: str,
+    hour_per_day: float,
+    start_date: str,
+    rest_days: List[str],
+    level: str,
+    user_id: Optional[str] = None
+) -> Optional[Dict]:
+    """GPT를 사용하여 학습 계획 생성 - 주 단위로 나눠 병렬 생성 후 병합"""
+
+    course_title = course.get('title', '학습 강좌')
+    curriculum = course.get('curriculum', course.get('syllabus', []))
+    lessons = _flatten_curriculum(curriculum)
+    total_lectures = course.get('total_lectures', len(lessons))
+
+    shards = _week_shards(lessons, skill, hour_per_day, start_date, rest_days)
+    if not shards:
+        log_info("학습 가능한 날짜가 없습니다")
+        return None
+
+    context = {
+        "course_title": course_title,
+        "total_lectures": total_lectures,
+        "total_duration": course.get('total_duration', ''),
+        "skill": skill,
+        "level": level,
+        "hour_per_day": hour_per_day,
+        "rest_days": rest_days,
+        "total_weeks": len(shards),
+        "user_id": user_id,
+    }
+
+    if user_id:
+        charge_user_limit(user_id, PLAN_LLM_COST)
+    log_info(f"GPT로 학습 계획 생성 시작: {course_title} ({len(shards)}주 병렬)")
+
+    # 사용자별 LLM 동시 실행 한도까지만 병렬 (나머지 주차는 LLM 대기열이 아니라 executor에서 대기)
+    workers = min(len(shards), LLM_PER_USER_CONCURRENCY) if LLM_PER_USER_CONCURRENCY > 0 else len(shards)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda shard: _generate_week_shard(shard, context), shards))
+
+    failed = [shard for shard, days in zip(shards, results) if not days]
+    if len(failed) == len(shards):
+        log_info("GPT 응답 파싱 실패, 기본 계획 생성")
+        return None
+
+    schedule = []
+    for shard, days in zip(shards, results):
+        if not days:
+            # 재시도까지 실패한 주는 스케줄러로 채움
+            log_info(f"{shard['week']}주차는 커리큘럼 스케줄러로 대체")
+            fallback_lessons = shard['lessons'] or [
+                {"section": f"{shard['week']}주차", "title": f"{skill} 학습 Day {i + 1}",
+                 "duration": f"{int(hour_per_day * 60 * 0.6)}분", "description": ""}
+                for i in range(len(shard['dates']))
+            ]
+            days = build_schedule(fallback_lessons, skill, hour_per_day, shard['dates'][0], rest_days,
+                                  max_days=(parse_start_date(shard['dates'][-1]) - parse_start_date(shard['dates'][0])).days + 1)
+        schedule.extend(days)
+
+    schedule.sort(key=lambda day: day['date'])
+    log_success(f"GPT 학습 계획 생성 성공 ({len(shards) - len(failed)}/{len(shards)}주)")
+
+    # 각 태스크에 학습 자료 추가
+    _attach_materials([task for day in schedule for task in day['tasks']], skill)
+
+    return {
+        "plan_name": f"{course_title} 학습 계획",
+        "total_duration": schedule_duration(schedule),
+        "daily_schedule": schedule,
+        "course_info": {
             "title": course_title,
             "provider": course.get('provider', ''),
             "link": course.get('link', ''),
             "total_lectures": total_lectures
         }
-        return data
+    }
 
-    log_info("GPT 응답 파싱 실패, 기본 계획 생성")
-    return None
+
+def _attach_materials(tasks: List[Dict], skill: str):
+    """태스크에 학습 자료를 병렬로 검색해 추가"""
+    if not tasks:
+        return
+    topics = [f"{skill} {task['title'].replace('📹 ', '')}" for task in tasks]
+    with ThreadPoolExecutor(max_workers=min(MATERIAL_SEARCH_WORKERS, len(tasks))) as executor:
+        for task, materials in zip(tasks, executor.map(_get_materials_for_task, topics)):
+            task['related_materials'] = materials.get('related_materials', [])
+            task['review_materials'] = materials.get('review_materials', [])
 
 
 def _create_plan_from_curriculum(
@@ -213,7 +317,7 @@ def _create_plan_from_curriculum(
     rest_days: List[str],
     level: str
 ) -> Dict:
-    """커리큘럼을 기반으로 학습 계획 생성 (폴백용) - 하루 2~5개 태스크 포함"""
+    """커리큘럼 강의 시간을 기반으로 학습 계획 생성 (기본 경로, LLM 호출 없음)"""
 
     course_title = course.get('title', '학습 강좌')
     curriculum = course.get('curriculum', course.get('syllabus', []))
@@ -230,154 +334,12 @@ def _create_plan_from_curriculum(
             {"section": "실습", "title": f"{skill} 프로젝트", "duration": "", "description": ""}
         ]
 
-    # 날짜 계산
-    try:
-        start = datetime.strptime(start_date.split('T')[0], '%Y-%m-%d').date()
-    except:
-        start = datetime.now().date()
-
-    day_names = ['월', '화', '수', '목', '금', '토', '일']
-    schedule = []
-    current_date = start
-    lesson_index = 0
-
-    # 하루에 배정할 메인 강의 수 (최소 1개)
-    main_lessons_per_day = max(1, int(hour_per_day) // 2)
-
-    # 최대 4주(28일) 동안 배정
-    max_days = 28
-    days_count = 0
-
-    # 태스크 타입별 시간 분배 템플릿
-    def _get_task_time(task_type: str, hour_per_day: float) -> str:
-        if task_type == "lecture":
-            return f"{int(hour_per_day * 60 * 0.35)}분"  # 35%
-        elif task_type == "practice":
-            return f"{int(hour_per_day * 60 * 0.25)}분"  # 25%
-        elif task_type == "review":
-            return f"{int(hour_per_day * 60 * 0.15)}분"  # 15%
-        elif task_type == "youtube":
-            return f"{int(hour_per_day * 60 * 0.15)}분"  # 15%
-        elif task_type == "quiz":
-            return f"{int(hour_per_day * 60 * 0.10)}분"  # 10%
-        return "30분"
-
-    while lesson_index < len(all_lessons) and days_count < max_days:
-        day_name = day_names[current_date.weekday()]
-
-        # 쉬는 날 건너뛰기
-        if day_name in rest_days:
-            current_date += timedelta(days=1)
-            continue
-
-        # 해당 날짜의 태스크 생성 (2~5개)
-        day_tasks = []
-
-        # 메인 강의 태스크 추가
-        for _ in range(main_lessons_per_day):
-            if lesson_index >= len(all_lessons):
-                break
-
-            lesson_data = all_lessons[lesson_index]
-            lesson_title = lesson_data["title"]
-            section_name = lesson_data["section"]
-            description = lesson_data.get("description", "")
-
-            # 학습 자료 검색
-            search_topic = f"{skill} {lesson_title}"
-            materials = _get_materials_for_task(search_topic)
-
-            # 1. 메인 강의 태스크
-            day_tasks.append({
-                "id": str(uuid.uuid4()),
-                "title": f"📹 {lesson_title}",
-                "description": f"[{section_name}] {description}" if description else f"[{section_name}] {lesson_title} 강의 시청",
-                "duration": _get_task_time("lecture", hour_per_day),
-                "completed": False,
-                "section": section_name,
-                "task_type": "lecture",
-                "related_materials": materials.get('related_materials', []),
-                "review_materials": materials.get('review_materials', [])
-            })
-
-            # 2. 실습 태스크 추가
-            day_tasks.append({
-                "id": str(uuid.uuid4()),
-                "title": f"💻 {lesson_title} 실습",
-                "description": f"배운 내용을 직접 코드로 작성해보기",
-                "duration": _get_task_time("practice", hour_per_day),
-                "completed": False,
-                "section": section_name,
-                "task_type": "practice",
-                "related_materials": [],
-                "review_materials": []
-            })
-
-            lesson_index += 1
-
-        # 3. 유튜브 추천 태스크 (격일로)
-        if days_count % 2 == 0 and day_tasks:
-            first_lesson = day_tasks[0]["title"].replace("📹 ", "")
-            day_tasks.append({
-                "id": str(uuid.uuid4()),
-                "title": f"🎬 {skill} {first_lesson} 관련 유튜브 영상",
-                "description": "관련 유튜브 영상을 찾아 추가 학습하기",
-                "duration": _get_task_time("youtube", hour_per_day),
-                "completed": False,
-                "section": "추가학습",
-                "task_type": "youtube",
-                "related_materials": [],
-                "review_materials": []
-            })
-
-        # 4. 복습 태스크 (3일마다)
-        if days_count > 0 and days_count % 3 == 0:
-            day_tasks.append({
-                "id": str(uuid.uuid4()),
-                "title": f"📝 이전 학습 내용 복습",
-                "description": "지금까지 배운 내용을 정리하고 복습하기",
-                "duration": _get_task_time("review", hour_per_day),
-                "completed": False,
-                "section": "복습",
-                "task_type": "review",
-                "related_materials": [],
-                "review_materials": []
-            })
-
-        # 5. 퀴즈/미니 프로젝트 (4일마다)
-        if days_count > 0 and days_count % 4 == 0:
-            day_tasks.append({
-                "id": str(uuid.uuid4()),
-                "title": f"🎯 {skill} 미니 퀴즈",
-                "description": "학습한 내용에 대한 이해도 확인 퀴즈",
-                "duration": _get_task_time("quiz", hour_per_day),
-                "completed": False,
-                "section": "평가",
-                "task_type": "quiz",
-                "related_materials": [],
-                "review_materials": []
-            })
-
-        if day_tasks:
-            schedule.append({
-                "date": current_date.isoformat(),
-                "tasks": day_tasks
-            })
-
-        current_date += timedelta(days=1)
-        days_count += 1
-
-    # 계획 기간 계산
-    if schedule:
-        total_days = (datetime.fromisoformat(schedule[-1]["date"]) - datetime.fromisoformat(schedule[0]["date"])).days + 1
-        weeks = (total_days + 6) // 7
-        duration_str = f"{weeks}주"
-    else:
-        duration_str = "1주"
+    schedule = build_schedule(all_lessons, skill, hour_per_day, start_date, rest_days)
+    _attach_materials(lecture_topics(schedule), skill)
 
     return {
         "plan_name": f"{course_title} 학습 계획",
-        "total_duration": duration_str,
+        "total_duration": schedule_duration(schedule),
         "course_info": {
             "title": course_title,
             "provider": course.get('provider', ''),
@@ -389,8 +351,16 @@ def _create_plan_from_curriculum(
 
 
 @router.post("/apply_recommendation")
-async def apply_recommendation(request: ApplyRecommendationRequest, current_user: Dict = Depends(get_current_user)):
-    """선택한 강좌의 커리큘럼을 기반으로 GPT가 학습 계획 생성"""
+def apply_recommendation(request: ApplyRecommendationRequest, response: Response,
+                         current_user: Dict = Depends(get_current_user),
+                         idempotency_key: Optional[str] = Header(None)):
+    """선택한 강좌의 커리큘럼을 기반으로 GPT가 학습 계획 생성 - Idempotency-Key가 같은 재시도는 같은 결과 반환"""
+    return run_idempotent(current_user['user_id'], "POST /plan/apply_recommendation", idempotency_key,
+                          request.model_dump(), response, lambda: _apply_recommendation(request, current_user))
+
+
+def _apply_recommendation(request: ApplyRecommendationRequest, current_user: Dict) -> Dict:
+    """강좌 기반 계획 생성 - 요청 한도는 GPT로 생성할 때만 차감 (커리큘럼 스케줄러 경로는 차감 없음)"""
     log_request("POST /plan/apply_recommendation", current_user['name'])
 
     user_id = current_user['user_id']
@@ -400,15 +370,34 @@ async def apply_recommendation(request: ApplyRecommendationRequest, current_user
     curriculum = course.get('curriculum', course.get('syllabus', []))
     log_info(f"커리큘럼 항목 수: {len(curriculum)}")
 
-    # 1차: GPT로 학습 계획 생성 (우선)
-    log_info("GPT로 학습 계획 생성 시도...")
+    # 1차: 커리큘럼 강의 시간 기반 스케줄링 (LLM 호출 없음)
+    if _flatten_curriculum(curriculum):
+        plan = _create_plan_from_curriculum(
+            course=course,
+            skill=request.skill,
+            hour_per_day=request.hourPerDay,
+            start_date=request.startDate,
+            rest_days=request.restDays,
+            level=request.quiz_level
+        )
+
+        if plan and plan.get('daily_schedule'):
+            store.plans[user_id].append(plan)
+            log_success(f"커리큘럼 기반 계획 생성 완료: {plan.get('plan_name')}")
+            log_info(f"총 {len(plan['daily_schedule'])}일, {sum(len(d['tasks']) for d in plan['daily_schedule'])}개 태스크")
+            log_navigation(current_user['name'], "홈 화면")
+            return {"success": True, "plan": plan}
+
+    # 2차: 커리큘럼이 없으면 GPT로 학습 계획 생성
+    log_info("커리큘럼 정보 없음, GPT로 학습 계획 생성 시도...")
     plan = _create_plan_with_gpt(
         course=course,
         skill=request.skill,
         hour_per_day=request.hourPerDay,
         start_date=request.startDate,
         rest_days=request.restDays,
-        level=request.quiz_level
+        level=request.quiz_level,
+        user_id=user_id
     )
 
     if plan and plan.get('daily_schedule'):
@@ -418,8 +407,8 @@ async def apply_recommendation(request: ApplyRecommendationRequest, current_user
         log_navigation(current_user['name'], "홈 화면")
         return {"success": True, "plan": plan}
 
-    # 2차: 폴백 - 커리큘럼 기반 단순 배치
-    log_info("GPT 계획 생성 실패, 커리큘럼 기반 단순 배치로 폴백")
+    # 3차: GPT 실패 시 기본 강의 목록으로 스케줄링
+    log_info("GPT 계획 생성 실패, 기본 강의 목록으로 스케줄링")
     plan = _create_plan_from_curriculum(
         course=course,
         skill=request.skill,
@@ -431,12 +420,11 @@ async def apply_recommendation(request: ApplyRecommendationRequest, current_user
 
     if plan and plan.get('daily_schedule'):
         store.plans[user_id].append(plan)
-        log_success(f"커리큘럼 기반 계획 생성 완료: {plan.get('plan_name')}")
-        log_info(f"총 {len(plan['daily_schedule'])}일, {sum(len(d['tasks']) for d in plan['daily_schedule'])}개 태스크")
+        log_success(f"기본 계획 생성 완료: {plan.get('plan_name')}")
         log_navigation(current_user['name'], "홈 화면")
         return {"success": True, "plan": plan}
 
-    # 3차: 최종 폴백 - GPT 프롬프트로 생성
+    # 4차: 최종 폴백 - GPT 프롬프트로 생성
     log_info("커리큘럼 없음, GPT 프롬프트로 계획 생성 시도")
     curriculum = course.get('curriculum', course.get('syllabus', []))
 
@@ -487,7 +475,8 @@ async def apply_recommendation(request: ApplyRecommendationRequest, current_user
 ```
 """
 
-    response = call_gpt(prompt, use_search=False)
+    charge_user_limit(user_id, PLAN_LLM_COST)
+    response = call_gpt(prompt, use_search=False, priority="batch", user_id=user_id)
     data = extract_json(response)
 
     if data and 'daily_schedule' in data:
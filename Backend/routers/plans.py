@@ -1,34 +1,99 @@
 # Backend/routers/plans.py
 """학습 계획 관련 라우터"""
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from typing import Dict, Optional, Tuple
 from datetime import datetime, date, timedelta
+import base64
+import json
 import uuid
 
-from models.schemas import PlanGenerateRequest, ApplyRecommendationRequest
+from models.schemas import PlanGenerateRequest, ApplyRecommendationRequest, TaskBatchUpdateRequest
 from services.store import store
+from services.etag import user_etag, check_not_modified
+from services.json_response import splice_json, raw_json_response
 from services.gpt_service import call_gpt, extract_json
+from services.idempotency import run_idempotent
+from services.quota import PLAN_LLM_COST, charge_user_limit
 from services.web_search import search_materials_for_topic
+from services.review_jobs import get_review_json
 from utils.logger import log_request, log_stage, log_success, log_navigation, log_info
-from .auth import get_current_user
+from .auth import get_current_user, user_rate_limit
 
 router = APIRouter(prefix="/plans", tags=["Plans"])
 
 
+PLAN_FIELDS = ("full", "summary", "schedule")
+
+
+def _encode_cursor(plan: Dict) -> str:
+    raw = json.dumps([plan['created_at'], plan['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, plan_id = json.loads(raw)
+        return str(created_at), int(plan_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
+
 @router.get("/all")
-async def get_all_plans(current_user: Dict = Depends(get_current_user)):
-    """사용자의 모든 학습 계획 목록 조회"""
-    log_request("GET /plans/all", current_user['name'])
+async def get_all_plans(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: str = "full",
+    current_user: Dict = Depends(get_current_user)
+):
+    """사용자의 학습 계획 목록 조회 (최신순)
+
+    - limit/cursor: 커서 페이지네이션 - 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서 전달 (limit 없으면 전체)
+    - fields: full(전체) | summary(진행률 요약, 일정 제외) | schedule(일정 포함, 태스크별 자료 제외)
+    """
+    log_request("GET /plans/all", current_user['name'], f"limit={limit}, fields={fields}")
+
+    if fields not in PLAN_FIELDS:
+        raise HTTPException(status_code=400, detail=f"fields는 {', '.join(PLAN_FIELDS)} 중 하나여야 합니다.")
 
     user_id = current_user['user_id']
-    plans = store.plans.get(user_id, [])
+    before = _decode_cursor(cursor) if cursor else None
+    # 변경 동기화(/plans/changes?since=) 기준 버전 - 계획보다 먼저 읽어서 사이에 생긴 변경은 다시 받도록
+    version = store.get_data_version(user_id)
+    check_not_modified(request, response, user_etag(user_id, "plans/all", limit, cursor, fields, version=version))
+    response.headers["X-Data-Version"] = str(version)
+    # full은 저장된 일정 JSON을 파싱/재직렬화하지 않고 응답에 그대로 끼워 넣음
+    raw = fields == "full"
+    plans, has_more = store.get_plans_page(user_id, fields=fields, limit=limit, before=before, decode=not raw)
+
+    if has_more:
+        response.headers["X-Next-Cursor"] = _encode_cursor(plans[-1])
+
+    if raw:
+        body = b",".join(
+            splice_json({k: v for k, v in plan.items() if k != 'daily_schedule'}, 'daily_schedule', plan.get('daily_schedule'))
+            for plan in plans
+        )
+        return raw_json_response(b"[" + body + b"]", response)
 
     return plans
 
 
-@router.get("/related_materials")
-async def get_related_materials(topic: str, current_user: Dict = Depends(get_current_user)):
+@router.get("/changes")
+async def get_plan_changes(since: int = Query(..., ge=0), current_user: Dict = Depends(get_current_user)):
+    """since 버전 이후 바뀐 계획/태스크만 조회 (기준 버전은 /plans/all의 X-Data-Version 또는 이전 응답의 version)
+
+    resync가 true면 변경 기록이 정리된 구간이므로 /plans/all로 전체를 다시 받아야 함
+    """
+    log_request("GET /plans/changes", current_user['name'], f"since={since}")
+    return store.get_plan_changes(current_user['user_id'], since)
+
+
+@router.get("/related_materials", dependencies=[Depends(user_rate_limit(2))])
+def get_related_materials(topic: str, current_user: Dict = Depends(get_current_user)):
     """특정 학습 주제에 대한 연관 자료 검색"""
     log_request("GET /plans/related_materials", current_user['name'], f"topic={topic}")
 
@@ -72,7 +137,7 @@ async def get_related_materials(topic: str, current_user: Dict = Depends(get_cur
 - 반드시 한국어 또는 영어로 된 실제 자료
 """
 
-    response = call_gpt(prompt, use_search=True)
+    response = call_gpt(prompt, use_search=True, user_id=current_user['user_id'])
     data = extract_json(response)
 
     if data and 'materials' in data:
@@ -93,10 +158,12 @@ async def get_related_materials(topic: str, current_user: Dict = Depends(get_cur
 
 
 @router.get("")
-async def get_plans(scope: str = "daily", current_user: Dict = Depends(get_current_user)):
+async def get_plans(request: Request, response: Response, scope: str = "daily",
+                    current_user: Dict = Depends(get_current_user)):
     log_request("GET /plans", current_user['name'], f"scope={scope}")
 
     user_id = current_user['user_id']
+    check_not_modified(request, response, user_etag(user_id, "plans", scope))
     plans = store.plans.get(user_id, [])
 
     if not plans:
@@ -147,54 +214,10 @@ async def get_review_plans(current_user: Dict = Depends(get_current_user)):
 
 
 @router.get("/yesterday_review")
-async def get_yesterday_review(current_user: Dict = Depends(get_current_user)):
-    """어제 학습 내용 기반 복습 자료 반환 (유튜브 1개 + 블로그 1개)"""
+def get_yesterday_review(current_user: Dict = Depends(get_current_user)):
+    """어제 학습 내용 기반 복습 자료 반환 (유튜브 1개 + 블로그 1개) - 자정 이후 미리 계산된 스냅샷"""
     log_request("GET /plans/yesterday_review", current_user['name'])
-
-    user_id = current_user['user_id']
-    plans = store.plans.get(user_id, [])
-
-    if not plans:
-        return {"has_review": False, "materials": [], "yesterday_topic": ""}
-
-    current_plan = plans[-1]
-    yesterday = (date.today() - timedelta(days=1)).isoformat()
-
-    # 어제 학습한 내용 찾기
-    yesterday_topics = []
-    if 'daily_schedule' in current_plan:
-        for day in current_plan['daily_schedule']:
-            if day['date'] == yesterday:
-                for task in day['tasks']:
-                    yesterday_topics.append(task.get('title', ''))
-
-    if not yesterday_topics:
-        return {"has_review": False, "materials": [], "yesterday_topic": ""}
-
-    # 첫 번째 토픽으로 복습 자료 검색
-    topic = yesterday_topics[0]
-
-    # 태스크에 미리 저장된 복습 자료가 있는지 확인
-    for day in current_plan.get('daily_schedule', []):
-        if day['date'] == yesterday:
-            for task in day['tasks']:
-                if task.get('review_materials'):
-                    return {
-                        "has_review": True,
-                        "materials": task['review_materials'][:2],  # 유튜브 1 + 블로그 1
-                        "yesterday_topic": topic
-                    }
-
-    # 없으면 기본 검색 링크 반환
-    search_query = topic.replace(' ', '+')
-    return {
-        "has_review": True,
-        "materials": [
-            {"title": f"{topic} 복습 영상", "type": "유튜브", "url": f"https://www.youtube.com/results?search_query={search_query}+강의"},
-            {"title": f"{topic} 복습 글", "type": "블로그", "url": f"https://www.google.com/search?q={search_query}+블로그"}
-        ],
-        "yesterday_topic": topic
-    }
+    return raw_json_response(get_review_json(current_user['user_id'], "yesterday_review").encode("utf-8"))
 
 
 def _get_materials_for_task(topic: str) -> dict:
@@ -217,7 +240,16 @@ def _get_materials_for_task(topic: str) -> dict:
 
 
 @router.post("/generate")
-async def generate_plan(request: PlanGenerateRequest, current_user: Dict = Depends(get_current_user)):
+def generate_plan(request: PlanGenerateRequest, response: Response, current_user: Dict = Depends(get_current_user),
+                  idempotency_key: Optional[str] = Header(None)):
+    """학습 계획 생성 - Idempotency-Key가 같은 재시도는 다시 생성하지 않고 같은 결과 반환"""
+    return run_idempotent(current_user['user_id'], "POST /plans/generate", idempotency_key, request.model_dump(),
+                          response, lambda: _generate_plan(request, current_user))
+
+
+def _generate_plan(request: PlanGenerateRequest, current_user: Dict) -> Dict:
+    """학습 계획 생성 - 요청 한도는 재시도(저장된 응답 반환)가 아니라 실제로 생성할 때만 차감"""
+    charge_user_limit(current_user['user_id'], PLAN_LLM_COST)
     log_request("POST /plans/generate", current_user['name'], f"skill={request.skill}")
     log_stage(7, "계획 생성", current_user['name'])
 
@@ -259,7 +291,7 @@ async def generate_plan(request: PlanGenerateRequest, current_user: Dict = Depen
 하루에 2-3개의 구체적인 학습 태스크를 배정해주세요.
 """
 
-    response = call_gpt(prompt, use_search=False)
+    response = call_gpt(prompt, use_search=False, priority="batch", user_id=user_id)
     data = extract_json(response)
 
     if data and 'daily_schedule' in data:
@@ -324,33 +356,31 @@ async def generate_plan(request: PlanGenerateRequest, current_user: Dict = Depen
 @router.get("/date/{target_date}")
 async def get_plans_by_date(
     target_date: str,
+    request: Request,
+    response: Response,
     current_user: Dict = Depends(get_current_user)
 ):
     """특정 날짜의 상세 계획 조회"""
     log_request("GET /plans/date", current_user['name'], f"date={target_date}")
 
     user_id = current_user['user_id']
-    plans = store.plans.get(user_id, [])
+    check_not_modified(request, response, user_etag(user_id, "plans/date", target_date))
+    found = store.get_day_tasks_json(user_id, target_date)
 
-    if not plans:
+    if found is None:
         return {"date": target_date, "tasks": [], "message": "아직 학습 계획이 없습니다."}
 
-    current_plan = plans[-1]
-
-    for day in current_plan.get('daily_schedule', []):
-        if day['date'] == target_date:
-            return {
-                "date": target_date,
-                "tasks": day['tasks'],
-                "plan_name": current_plan.get('plan_name', '학습 계획'),
-                "message": None
-            }
+    plan_name, tasks_json = found
+    if tasks_json is not None:
+        # 태스크 JSON은 DB에서 잘라낸 텍스트 그대로 응답에 끼워 넣음
+        envelope = {"date": target_date, "plan_name": plan_name or '학습 계획', "message": None}
+        return raw_json_response(splice_json(envelope, "tasks", tasks_json), response)
 
     return {"date": target_date, "tasks": [], "message": "해당 날짜에 계획이 없습니다."}
 
 
 @router.post("/task/update")
-async def update_task(
+def update_task(
     date: str,
     task_id: str,
     completed: bool,
@@ -362,11 +392,32 @@ async def update_task(
     success = store.update_task(user_id, date, task_id, completed)
 
     if success:
-        # 메모리 캐시도 무효화 (다음 조회 시 DB에서 다시 로드)
-        if hasattr(store.plans, '_cache') and user_id in store.plans._cache:
-            del store.plans._cache[user_id]
-
+        # 캐시 무효화는 store가 모든 워커에 전달
         log_success(f"태스크 업데이트: {task_id} → {'완료' if completed else '미완료'}")
         return {"success": True}
 
     raise HTTPException(status_code=404, detail="Task not found")
+
+
+@router.post("/tasks/batch")
+def update_tasks_batch(data: TaskBatchUpdateRequest, current_user: Dict = Depends(get_current_user)):
+    """여러 태스크 완료 상태를 한 번에 변경 (한 트랜잭션, 계획당 한 번만 저장) - 작업별 결과 반환"""
+    log_request("POST /plans/tasks/batch", current_user['name'], f"updates={len(data.updates)}")
+
+    user_id = current_user['user_id']
+    results = store.update_tasks_batch(
+        user_id, [(op.date, op.task_id, op.completed) for op in data.updates]
+    )
+
+    updated = sum(results)
+    if updated:
+        log_success(f"태스크 일괄 업데이트: {updated}/{len(results)}개")
+
+    return {
+        "success": all(results),
+        "updated": updated,
+        "results": [
+            {"date": op.date, "task_id": op.task_id, "completed": op.completed, "success": ok}
+            for op, ok in zip(data.updates, results)
+        ]
+    }
@@ -6,8 +6,8 @@ from typing import Dict
 import uuid
 
 from models.schemas import SelectCourseRequest, ApplyRecommendationRequest
-from services.store import store
-from services.gpt_service import call_gpt, extract_json, get_search_status
+from services.gpt_service import get_search_status
+from services.recommend_cache import get_recommendations
 from utils.logger import log_request, log_stage, log_success, log_navigation, log_info
 from .auth import get_current_user
 
@@ -21,7 +21,7 @@ async def get_current_search_status():
 
 
 @router.get("/courses")
-async def get_recommended_courses(
+def get_recommended_courses(
     skill: str = "programming",
     level: str = "초급",
     current_user: Dict = Depends(get_current_user)
@@ -30,81 +30,11 @@ async def get_recommended_courses(
     log_stage(6, "강좌 추천", current_user['name'])
     log_navigation(current_user['name'], "강좌 추천 화면")
 
-    # 강화된 프롬프트 - 상세한 커리큘럼 정보 요청
-    prompt = f"""[시스템 지시] 당신은 교육 콘텐츠 추천 API입니다. 반드시 JSON만 출력하세요. 질문, 확인, 설명 없이 오직 JSON 데이터만 반환합니다.
-
-'{skill}' 분야 {level} 수준 학습자를 위한 강좌/도서 6개를 추천하세요.
-
-검색 플랫폼: 인프런, 유데미(Udemy), 부스트코스, 코세라(Coursera), 교보문고, 예스24
-
-⚠️ 절대 규칙:
-1. JSON 외의 텍스트 출력 금지 (질문, 설명, 확인 요청 금지)
-2. 찾을 수 없다는 응답 금지 - 반드시 6개 추천
-3. example.com URL 사용 금지
-4. 숫자에 쉼표 금지 (1234 형식)
-
-📚 커리큘럼 필수 요구사항 (매우 중요!):
-- 각 강좌의 전체 목차/커리큘럼을 상세히 포함
-- 섹션명과 각 섹션별 강의 목록 모두 포함
-- 각 강의가 무엇을 다루는지 간단한 설명 포함
-- 최소 15개 이상의 강의 항목 포함 (실제 강좌 구조 반영)
-
-필수 JSON 형식:
-```json
-{{
-  "recommendations": [
-    {{
-      "id": "unique_id_1",
-      "title": "강좌/도서 제목",
-      "provider": "플랫폼명",
-      "instructor": "강사/저자명",
-      "type": "course",
-      "weeks": 4,
-      "free": false,
-      "rating": 4.5,
-      "students": "1234명",
-      "total_lectures": 25,
-      "total_duration": "총 15시간 30분",
-      "summary": "상세 설명 2-3문장",
-      "reason": "{level} 학습자가 {skill} 기초를 다지기에 적합합니다",
-      "curriculum": [
-        {{
-          "section": "섹션 1: 입문",
-          "lectures": [
-            {{"title": "1강: 오리엔테이션", "duration": "10분", "description": "강좌 소개 및 학습 방법 안내"}},
-            {{"title": "2강: 개발환경 설정", "duration": "25분", "description": "필요한 도구 설치 및 환경 구성"}},
-            {{"title": "3강: 첫 번째 코드 작성", "duration": "30분", "description": "Hello World부터 시작하기"}}
-          ]
-        }},
-        {{
-          "section": "섹션 2: 기초 문법",
-          "lectures": [
-            {{"title": "4강: 변수와 자료형", "duration": "40분", "description": "데이터를 저장하는 방법"}},
-            {{"title": "5강: 연산자", "duration": "35분", "description": "다양한 연산 방법 학습"}}
-          ]
-        }}
-      ],
-      "link": "https://www.inflearn.com/course/실제강좌주소",
-      "price": "55000원",
-      "level_detail": "{level} 수준"
-    }}
-  ]
-}}
-```
-
-지금 바로 JSON을 출력하세요:"""
-
-    response = call_gpt(prompt, use_search=True)
-    data = extract_json(response)
-
-    if data and 'error' not in data:
-        # recommendations 또는 courses 키 모두 지원
-        courses = data.get('recommendations', data.get('courses', []))
-        # example.com 필터링
-        valid_courses = [c for c in courses if 'example' not in c.get('link', '').lower()]
-        if valid_courses:
-            log_success(f"강좌 {len(valid_courses)}개 추천 완료")
-            return valid_courses[:6]
+    # 미리 생성된 스냅샷 우선 (오래됐으면 백그라운드 갱신)
+    courses = get_recommendations(skill, level, user_id=current_user['user_id'])
+    if courses:
+        log_success(f"강좌 {len(courses)}개 추천 완료")
+        return courses[:6]
 
     log_info("GPT 응답 실패 또는 API 키 없음, 기본 추천 반환")
     return [
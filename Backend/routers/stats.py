@@ -1,11 +1,12 @@
 # Backend/routers/stats.py
 """학습 통계 라우터"""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from typing import Dict
 from datetime import datetime, timedelta
 
 from services.store import store
+from services.etag import user_etag, check_not_modified
 from utils.logger import log_request, log_stage
 from .auth import get_current_user
 
@@ -13,12 +14,13 @@ router = APIRouter(prefix="/stats", tags=["Statistics"])
 
 
 @router.get("/summary")
-async def get_stats_summary(current_user: Dict = Depends(get_current_user)):
+async def get_stats_summary(request: Request, response: Response, current_user: Dict = Depends(get_current_user)):
     """학습 통계 요약 조회"""
     log_request("GET /stats/summary", current_user['name'])
     log_stage(9, "통계 조회", current_user['name'])
 
     user_id = current_user['user_id']
+    check_not_modified(request, response, user_etag(user_id, "stats/summary"))
     plans = store.get_plans(user_id)
 
     # 통계 계산
@@ -126,11 +128,12 @@ async def get_stats_summary(current_user: Dict = Depends(get_current_user)):
 
 
 @router.get("/weekly")
-async def get_weekly_stats(current_user: Dict = Depends(get_current_user)):
+async def get_weekly_stats(request: Request, response: Response, current_user: Dict = Depends(get_current_user)):
     """주간 통계 조회"""
     log_request("GET /stats/weekly", current_user['name'])
 
     user_id = current_user['user_id']
+    check_not_modified(request, response, user_etag(user_id, "stats/weekly"))
     plans = store.get_plans(user_id)
 
     today = datetime.now().date()
@@ -174,11 +177,12 @@ async def get_weekly_stats(current_user: Dict = Depends(get_current_user)):
 
 
 @router.get("/achievements")
-async def get_achievements(current_user: Dict = Depends(get_current_user)):
+async def get_achievements(request: Request, response: Response, current_user: Dict = Depends(get_current_user)):
     """업적 조회"""
     log_request("GET /stats/achievements", current_user['name'])
 
     user_id = current_user['user_id']
+    check_not_modified(request, response, user_etag(user_id, "stats/achievements"))
     plans = store.get_plans(user_id)
 
     # 통계 계산
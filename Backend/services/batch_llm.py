@@ -0,0 +1,401 @@
+# Backend/services/batch_llm.py
+"""
+비대화형 GPT 작업의 배치 처리 - 문제 은행 보충, 인기 추천 갱신처럼 기다리는 사용자가 없는 요청
+
+요청을 llm_batch_requests에 쌓아 두고, 리스를 가진 워커 하나가 주기적으로
+1) 제출된 배치의 완료 여부를 확인해 결과를 종류(kind)별 처리기로 넘기고
+2) 쌓인 요청을 한 번에 배치 백엔드로 제출한다.
+
+백엔드 (BATCH_LLM_BACKEND):
+- off (기본): 배치를 쓰지 않음 - enabled()가 False이므로 호출하는 쪽이 기존처럼 바로 call_gpt
+- openai: OpenAI Batch API (/v1/chat/completions, 24시간 완료 창, 동기 호출보다 저렴)
+- local: BATCH_LLM_DIR에 입력/출력 JSONL을 쓰고 확인할 때 call_gpt로 처리 (테스트/개발용 대체 구현)
+
+배치 요청은 사용자별 LLM 한도와 대화형 입장 제어를 거치지 않는다.
+"""
+
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from services.store import store
+from services.gpt_service import OPENAI_MODEL_SEARCH_PRIMARY, OPENAI_MODEL_NORMAL, call_gpt, _get_client
+from utils.logger import log_info, log_error, log_success
+
+BATCH_LLM_BACKEND = os.getenv("BATCH_LLM_BACKEND", "off").lower()
+BATCH_LLM_DIR = os.getenv("BATCH_LLM_DIR") or os.path.join(os.path.dirname(__file__), "..", "data", "llm_batches")
+# 완료 확인/제출 주기
+BATCH_LLM_POLL_SECONDS = int(os.getenv("BATCH_LLM_POLL_SECONDS", "60"))
+# 이만큼 쌓이거나 가장 오래된 요청이 BATCH_LLM_MAX_WAIT_SECONDS를 넘으면 제출
+BATCH_LLM_MIN_SIZE = int(os.getenv("BATCH_LLM_MIN_SIZE", "20"))
+BATCH_LLM_MAX_WAIT_SECONDS = int(os.getenv("BATCH_LLM_MAX_WAIT_SECONDS", str(10 * 60)))
+BATCH_LLM_MAX_SIZE = 1000
+# 끝난 요청 보관 기간
+BATCH_LLM_KEEP_SECONDS = 7 * 24 * 60 * 60
+
+_LEASE_NAME = "llm_batch"
+_LEASE_TTL_SECONDS = BATCH_LLM_POLL_SECONDS * 3
+# local 백엔드 - 이 시간 동안 진행이 없는 running 표시는 죽은 워커의 것으로 보고 넘겨받음
+_LOCAL_RUNNING_STALE_SECONDS = 10 * 60
+_worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+# kind → 처리기(context, 응답 텍스트) - 아래 모듈이 import될 때 등록
+_handlers: Dict[str, Callable[[Dict, str], None]] = {}
+_HANDLER_MODULES = ("services.quiz_bank", "services.recommend_cache")
+
+_stop_event = threading.Event()
+_worker_thread: Optional[threading.Thread] = None
+
+
+def register_handler(kind: str, handler: Callable[[Dict, str], None]):
+    """배치 결과 처리기 등록 (모듈 import 시점에)"""
+    _handlers[kind] = handler
+
+
+def _renew_lease():
+    """긴 처리 중에 리스 연장 - 다른 워커가 리스를 가져가 같은 배치를 다시 처리하지 않도록"""
+    store.try_acquire_lease(_LEASE_NAME, _worker_id, _LEASE_TTL_SECONDS)
+
+
+def _request_line(custom_id: str, prompt: str, use_search: bool) -> Dict:
+    # 동기 경로의 1차 모델과 같은 모델
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": OPENAI_MODEL_SEARCH_PRIMARY if use_search else OPENAI_MODEL_NORMAL,
+            "messages": [{"role": "user", "content": prompt}],
+        },
+    }
+
+
+def _parse_output(lines) -> Dict[str, Optional[str]]:
+    """배치 출력 JSONL → custom_id별 응답 텍스트 (요청별 오류면 None)"""
+    results = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        try:
+            if item.get("error") or response.get("status_code") != 200:
+                raise KeyError("error")
+            results[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            results[item["custom_id"]] = None
+    return results
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API"""
+
+    name = "openai"
+
+    def _client(self):
+        client = _get_client()
+        if client is None:
+            raise RuntimeError("OpenAI 클라이언트가 없어 배치를 제출할 수 없습니다")
+        return client
+
+    def submit(self, requests: List[Dict]) -> str:
+        client = self._client()
+        data = "\n".join(json.dumps(r, ensure_ascii=False) for r in requests).encode("utf-8")
+        input_file = client.files.create(file=("batch.jsonl", data), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """끝났으면 custom_id별 결과 (결과에 없는 요청은 실패), 진행 중이면 None"""
+        client = self._client()
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+            return None
+        if not batch.output_file_id:
+            return {}
+        return _parse_output(client.files.content(batch.output_file_id).text.splitlines())
+
+
+class LocalFileBackend:
+    """파일 기반 대체 구현 - 제출은 입력 JSONL 저장, 확인할 때 call_gpt로 처리해 출력 JSONL 작성
+
+    처리하는 동안 <batch_id>.running 표시 파일을 두어 다른 워커/manage.py는 그 배치를 진행 중으로 보고 건너뛴다.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: str = BATCH_LLM_DIR):
+        self.directory = directory
+
+    def _path(self, batch_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.{suffix}.jsonl")
+
+    def submit(self, requests: List[Dict]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        batch_id = f"local_{uuid.uuid4().hex}"
+        with open(self._path(batch_id, "input"), "w", encoding="utf-8") as f:
+            for request in requests:
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+        return batch_id
+
+    def _running_path(self, batch_id: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.running")
+
+    def _claim_run(self, batch_id: str) -> bool:
+        """running 표시 선점 - 다른 곳에서 처리 중이면 False (오래 멈춘 표시는 넘겨받음)"""
+        path = self._running_path(batch_id)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                idle = time.time() - os.path.getmtime(path)
+            except FileNotFoundError:
+                # 방금 끝남 - 다음 확인 때 출력 파일을 읽음
+                return False
+            if idle < _LOCAL_RUNNING_STALE_SECONDS:
+                return False
+            log_info(f"멈춘 로컬 배치 처리 넘겨받음: {batch_id}")
+            os.utime(path)
+            return True
+        with os.fdopen(fd, "w") as f:
+            f.write(_worker_id)
+        return True
+
+    def _run(self, batch_id: str):
+        output_path = self._path(batch_id, "output")
+        running_path = self._running_path(batch_id)
+        with open(self._path(batch_id, "input"), encoding="utf-8") as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        lines = []
+        for request in requests:
+            body = request["body"]
+            content = call_gpt(body["messages"][0]["content"], use_search=body["model"] == OPENAI_MODEL_SEARCH_PRIMARY,
+                               priority="background")
+            failed = content.startswith(("GPT 호출 중 오류", '{"error"'))
+            lines.append({
+                "custom_id": request["custom_id"],
+                "response": None if failed else {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}},
+                "error": {"message": content} if failed else None,
+            })
+            # 요청마다 진행 표시와 리스를 갱신 (최대 BATCH_LLM_MAX_SIZE개를 순서대로 호출하므로 리스 TTL보다 오래 걸림)
+            os.utime(running_path)
+            _renew_lease()
+        with open(output_path + ".tmp", "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        os.replace(output_path + ".tmp", output_path)
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, Optional[str]]]:
+        output_path = self._path(batch_id, "output")
+        if not os.path.exists(output_path):
+            if not self._claim_run(batch_id):
+                return None
+            try:
+                self._run(batch_id)
+            finally:
+                try:
+                    os.remove(self._running_path(batch_id))
+                except FileNotFoundError:
+                    pass
+        with open(output_path, encoding="utf-8") as f:
+            return _parse_output(f)
+
+
+_BACKENDS = {"openai": OpenAIBatchBackend, "local": LocalFileBackend}
+
+
+def get_backend():
+    """설정된 배치 백엔드 (off면 None)"""
+    backend = _BACKENDS.get(BATCH_LLM_BACKEND)
+    return backend() if backend else None
+
+
+def enabled() -> bool:
+    return BATCH_LLM_BACKEND in _BACKENDS
+
+
+class BatchQueue:
+    """llm_batch_requests 테이블 접근"""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection]):
+        self._connect = connect
+
+    def enqueue(self, kind: str, prompt: str, use_search: bool, context: Dict, dedupe_key: Optional[str] = None) -> bool:
+        """요청 추가 - 같은 dedupe_key 요청이 처리 중이면 추가하지 않고 False"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                INSERT OR IGNORE INTO llm_batch_requests
+                    (custom_id, kind, dedupe_key, prompt, use_search, context, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, 'queued', ?, ?)
+            ''', (uuid.uuid4().hex, kind, dedupe_key, prompt, int(use_search),
+                  json.dumps(context, ensure_ascii=False), now, now))
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def queued(self, limit: int) -> List[sqlite3.Row]:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT custom_id, prompt, use_search, created_at FROM llm_batch_requests "
+                "WHERE status = 'queued' ORDER BY created_at LIMIT ?", (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def mark_submitted(self, custom_ids: List[str], batch_id: str):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "UPDATE llm_batch_requests SET status = 'submitted', batch_id = ?, updated_at = ? WHERE custom_id = ?",
+                [(batch_id, now, custom_id) for custom_id in custom_ids]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def submitted_batches(self) -> List[str]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT DISTINCT batch_id FROM llm_batch_requests WHERE status = 'submitted'"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def batch_requests(self, batch_id: str) -> List[sqlite3.Row]:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT custom_id, kind, context FROM llm_batch_requests WHERE batch_id = ? AND status = 'submitted'",
+                (batch_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def finish(self, statuses: Dict[str, str]):
+        """custom_id → done / failed"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "UPDATE llm_batch_requests SET status = ?, updated_at = ? WHERE custom_id = ?",
+                [(status, now, custom_id) for custom_id, status in statuses.items()]
+            )
+            conn.execute(
+                "DELETE FROM llm_batch_requests WHERE status IN ('done', 'failed') AND updated_at < ?",
+                (now - BATCH_LLM_KEEP_SECONDS,)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+queue = BatchQueue(store._get_connection)
+
+
+def enqueue(kind: str, prompt: str, use_search: bool = False, context: Optional[Dict] = None,
+            dedupe_key: Optional[str] = None) -> bool:
+    """배치 요청 추가 (처리기는 register_handler로 등록된 kind의 것)"""
+    return queue.enqueue(kind, prompt, use_search, context or {}, dedupe_key)
+
+
+def collect_results(backend) -> int:
+    """제출된 배치 중 끝난 것의 결과를 처리기로 전달 - 처리한 요청 수 반환"""
+    handled = 0
+    for batch_id in queue.submitted_batches():
+        try:
+            results = backend.poll(batch_id)
+        except Exception as e:
+            log_error(f"배치 상태 확인 실패 ({batch_id}): {e}")
+            continue
+        if results is None:
+            continue
+
+        statuses = {}
+        for row in queue.batch_requests(batch_id):
+            content = results.get(row['custom_id'])
+            handler = _handlers.get(row['kind'])
+            if content is None or handler is None:
+                statuses[row['custom_id']] = "failed"
+                continue
+            try:
+                handler(json.loads(row['context'] or '{}'), content)
+                statuses[row['custom_id']] = "done"
+                handled += 1
+            except Exception as e:
+                log_error(f"배치 결과 처리 실패 ({row['kind']}): {e}")
+                statuses[row['custom_id']] = "failed"
+        queue.finish(statuses)
+        log_info(f"배치 완료: {batch_id} ({sum(s == 'done' for s in statuses.values())}/{len(statuses)}개 처리)")
+    return handled
+
+
+def submit_pending(backend, force: bool = False) -> int:
+    """쌓인 요청이 충분하거나 오래 기다렸으면 배치로 제출 - 제출한 요청 수 반환"""
+    rows = queue.queued(BATCH_LLM_MAX_SIZE)
+    if not rows:
+        return 0
+    if not force and len(rows) < BATCH_LLM_MIN_SIZE and time.time() - rows[0]['created_at'] < BATCH_LLM_MAX_WAIT_SECONDS:
+        return 0
+
+    requests = [_request_line(row['custom_id'], row['prompt'], bool(row['use_search'])) for row in rows]
+    batch_id = backend.submit(requests)
+    queue.mark_submitted([row['custom_id'] for row in rows], batch_id)
+    log_success(f"배치 제출: {batch_id} ({len(rows)}개)")
+    return len(rows)
+
+
+def run_once(force: bool = False) -> Dict[str, int]:
+    """완료 확인 후 제출 한 번 (manage.py / 스케줄러)"""
+    backend = get_backend()
+    if backend is None:
+        return {"handled": 0, "submitted": 0}
+    # main 없이 실행(manage.py)해도 처리기가 등록되도록
+    for module in _HANDLER_MODULES:
+        importlib.import_module(module)
+    handled = collect_results(backend)
+    try:
+        submitted = submit_pending(backend, force)
+    except Exception as e:
+        log_error(f"배치 제출 실패: {e}")
+        submitted = 0
+    return {"handled": handled, "submitted": submitted}
+
+
+def _worker_loop():
+    while not _stop_event.wait(BATCH_LLM_POLL_SECONDS):
+        # 여러 워커 중 리스를 가진 하나만 제출/확인
+        if store.try_acquire_lease(_LEASE_NAME, _worker_id, _LEASE_TTL_SECONDS):
+            try:
+                run_once()
+            except Exception as e:
+                log_error(f"배치 처리 실패: {e}")
+
+
+def start_worker():
+    """배치 제출/확인 스레드 시작 (BATCH_LLM_BACKEND가 off면 시작하지 않음)"""
+    global _worker_thread
+    if not enabled() or (_worker_thread and _worker_thread.is_alive()):
+        return
+    _stop_event.clear()
+    _worker_thread = threading.Thread(target=_worker_loop, daemon=True, name="llm-batch")
+    _worker_thread.start()
+
+
+def stop_worker():
+    """배치 스레드 종료"""
+    _stop_event.set()
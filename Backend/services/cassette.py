@@ -0,0 +1,150 @@
+# Backend/services/cassette.py
+"""
+외부 호출 녹화/재생 (cassette) - GPT 프롬프트→응답, 검색어→결과를 JSONL 파일에 기록하고 오프라인에서 재생
+
+- CASSETTE_MODE=record: 실제 호출 결과를 CASSETTE_PATH에 추가 기록
+- CASSETTE_MODE=replay: 네트워크 없이 기록된 결과만 반환 (없으면 호출 실패로 처리)
+- CASSETTE_LATENCY: 재생 시 지연 - "recorded"면 녹화 당시 지연시간, 숫자면 고정 ms (기본 0)
+
+프롬프트 속 날짜(YYYY-MM-DD)는 키에서 제외하고, 재생 시 응답의 날짜를 녹화 당시와의 차이만큼 옮겨서
+다른 날 재생해도 같은 계획이 나오도록 한다. 같은 키가 여러 번 녹화됐으면 순서대로 돌려준다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from utils.logger import log_info, log_error
+
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off").lower()
+CASSETTE_PATH = os.getenv("CASSETTE_PATH") or os.path.join(os.path.dirname(__file__), "..", "data", "cassettes", "default.jsonl")
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "0")
+
+_DATE_RE = re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b')
+
+
+def _first_date(text: str) -> Optional[date]:
+    for match in _DATE_RE.finditer(text):
+        try:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        except ValueError:
+            continue
+    return None
+
+
+def _shift_dates(value: Any, days: int) -> Any:
+    """문자열/리스트/딕셔너리 안의 YYYY-MM-DD 날짜를 days만큼 이동"""
+    if not days:
+        return value
+    if isinstance(value, str):
+        def shift(match):
+            try:
+                moved = date(int(match.group(1)), int(match.group(2)), int(match.group(3))) + timedelta(days=days)
+            except ValueError:
+                return match.group(0)
+            return moved.isoformat()
+        return _DATE_RE.sub(shift, value)
+    if isinstance(value, list):
+        return [_shift_dates(item, days) for item in value]
+    if isinstance(value, dict):
+        return {key: _shift_dates(item, days) for key, item in value.items()}
+    return value
+
+
+class Cassette:
+    """JSONL 녹화 파일 - 한 줄에 한 호출 {kind, key, request, response, latency_ms, anchor_date}"""
+
+    def __init__(self, mode: str, path: str, latency: str):
+        self.mode = mode if mode in ("record", "replay") else "off"
+        self.path = path
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries: Dict[str, list] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        if self.mode == "replay":
+            self._load()
+            log_info(f"cassette 재생 모드: {self.path} ({sum(len(v) for v in self._entries.values())}건)")
+        elif self.mode == "record":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            log_info(f"cassette 녹화 모드: {self.path}")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            log_error(f"cassette 파일이 없습니다: {self.path}")
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._entries[entry["key"]].append(entry)
+
+    @staticmethod
+    def _key(kind: str, request: Dict) -> str:
+        normalized = _DATE_RE.sub("<date>", json.dumps(request, ensure_ascii=False, sort_keys=True))
+        return hashlib.sha256(f"{kind}:{normalized}".encode("utf-8")).hexdigest()
+
+    def record(self, kind: str, request: Dict, response: Any, latency_seconds: float):
+        """호출 1건 기록"""
+        anchor = _first_date(json.dumps(request, ensure_ascii=False))
+        entry = {
+            "kind": kind,
+            "key": self._key(kind, request),
+            "request": request,
+            "response": response,
+            "latency_ms": round(latency_seconds * 1000, 1),
+            "anchor_date": anchor.isoformat() if anchor else None,
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def replay(self, kind: str, request: Dict) -> Optional[Any]:
+        """기록된 응답 반환 (없으면 None) - 같은 키는 녹화 순서대로, 마지막 것은 반복"""
+        key = self._key(kind, request)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            index = min(self._cursor[key], len(entries) - 1)
+            self._cursor[key] += 1
+            entry = entries[index]
+
+        if self.latency == "recorded":
+            time.sleep(entry.get("latency_ms", 0) / 1000)
+        else:
+            try:
+                delay = float(self.latency)
+            except ValueError:
+                delay = 0
+            if delay > 0:
+                time.sleep(delay / 1000)
+
+        response = entry["response"]
+        anchor = entry.get("anchor_date")
+        current = _first_date(json.dumps(request, ensure_ascii=False))
+        if anchor and current:
+            response = _shift_dates(response, (current - date.fromisoformat(anchor)).days)
+        return response
+
+
+cassette = Cassette(CASSETTE_MODE, CASSETTE_PATH, CASSETTE_LATENCY)
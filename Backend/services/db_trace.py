@@ -0,0 +1,171 @@
+# Backend/services/db_trace.py
+"""
+DB 쿼리 추적 - 요청별 SQL 기록, 느린 쿼리 로그(EXPLAIN QUERY PLAN 포함), N+1 의심 패턴 감지
+
+- 쿼리는 리터럴을 ?로 바꾼 "모양(shape)"으로 묶어 요청 단위로 집계
+- 한 요청에서 같은 모양의 쿼리가 DB_N_PLUS_ONE_THRESHOLD번 이상 실행되면 N+1 의심으로 기록
+- 라우트별 요약은 /admin/db/routes, 최근 느린 쿼리는 /admin/db/slow에서 조회
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from utils.logger import log_info
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "3"))
+# 요청당 보관하는 개별 쿼리 수 (초과분은 집계만)
+DB_TRACE_MAX_STATEMENTS = 500
+# 보관할 최근 느린 쿼리 수
+DB_SLOW_QUERY_KEEP = 100
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+_current: ContextVar[Optional[dict]] = ContextVar("palearn_db_trace", default=None)
+
+_lock = threading.Lock()
+_routes: Dict[str, dict] = {}
+_slow_queries: deque = deque(maxlen=DB_SLOW_QUERY_KEEP)
+
+
+@lru_cache(maxsize=1024)
+def query_shape(sql: str) -> str:
+    """리터럴과 IN 목록을 정규화한 쿼리 모양"""
+    shape = _STRING_RE.sub("?", sql)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _SPACE_RE.sub(" ", shape).strip()
+    return _IN_LIST_RE.sub("(?...)", shape)
+
+
+def begin_trace():
+    """현재 요청의 쿼리 추적 시작"""
+    _current.set({"statements": [], "shapes": Counter(), "queries": 0, "seconds": 0.0})
+
+
+def _explain(conn: sqlite3.Connection, sql: str, parameters) -> List[str]:
+    try:
+        # 계측되지 않는 기본 커서로 실행해 추적이 재귀하지 않도록 함
+        rows = conn.cursor(sqlite3.Cursor).execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        return [row[-1] for row in rows]
+    except sqlite3.Error as e:
+        return [f"(EXPLAIN 실패: {e})"]
+
+
+def trace_statement(conn: sqlite3.Connection, sql: str, parameters, seconds: float):
+    """쿼리 1회 기록 - 느린 쿼리는 실행 계획과 함께 로그 (parameters가 None이면 실행 계획 생략)"""
+    shape = None
+    trace = _current.get()
+    if trace is not None:
+        shape = query_shape(sql)
+        trace["queries"] += 1
+        trace["seconds"] += seconds
+        trace["shapes"][shape] += 1
+        if len(trace["statements"]) < DB_TRACE_MAX_STATEMENTS:
+            trace["statements"].append((shape, seconds))
+
+    if seconds * 1000 < DB_SLOW_QUERY_MS:
+        return
+
+    shape = shape or query_shape(sql)
+    explainable = parameters is not None and shape.upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT"))
+    plan = _explain(conn, sql, parameters) if explainable else []
+    with _lock:
+        _slow_queries.append({
+            "query": shape,
+            "duration_ms": round(seconds * 1000, 2),
+            "plan": plan,
+            "created_at": time.time(),
+        })
+    log_info(f"느린 쿼리 ({seconds * 1000:.1f}ms): {shape[:200]} | 실행 계획: {' / '.join(plan) or '-'}")
+
+
+def finish_trace(method: str, route: str) -> Optional[dict]:
+    """요청 종료 - N+1 의심 패턴 확인 후 라우트별 요약에 합산"""
+    trace = _current.get()
+    if trace is None:
+        return None
+    _current.set(None)
+
+    suspects = {
+        shape: count for shape, count in trace["shapes"].items()
+        if count >= DB_N_PLUS_ONE_THRESHOLD
+    }
+    key = f"{method} {route}"
+    for shape, count in suspects.items():
+        log_info(f"N+1 의심 ({key}): 같은 쿼리 {count}회 - {shape[:200]}")
+
+    shape_seconds = Counter()
+    for shape, seconds in trace["statements"]:
+        shape_seconds[shape] += seconds
+
+    with _lock:
+        summary = _routes.get(key)
+        if summary is None:
+            summary = _routes[key] = {
+                "route": key,
+                "requests": 0,
+                "queries": 0,
+                "db_seconds": 0.0,
+                "max_queries": 0,
+                "n_plus_one_requests": 0,
+                "shapes": Counter(),
+                "shape_seconds": Counter(),
+                "n_plus_one": Counter(),
+            }
+        summary["requests"] += 1
+        summary["queries"] += trace["queries"]
+        summary["db_seconds"] += trace["seconds"]
+        summary["max_queries"] = max(summary["max_queries"], trace["queries"])
+        summary["shapes"].update(trace["shapes"])
+        summary["shape_seconds"].update(shape_seconds)
+        if suspects:
+            summary["n_plus_one_requests"] += 1
+            summary["n_plus_one"].update(suspects)
+
+    return trace
+
+
+def route_summaries(top_queries: int = 5) -> List[Dict]:
+    """라우트별 쿼리 요약 (요청당 평균 쿼리 수가 많은 순)"""
+    result = []
+    with _lock:
+        routes = list(_routes.values())
+        for summary in routes:
+            requests = summary["requests"] or 1
+            result.append({
+                "route": summary["route"],
+                "requests": summary["requests"],
+                "avg_queries": round(summary["queries"] / requests, 2),
+                "max_queries": summary["max_queries"],
+                "avg_db_ms": round(summary["db_seconds"] / requests * 1000, 2),
+                "n_plus_one_requests": summary["n_plus_one_requests"],
+                "n_plus_one": [
+                    {"query": shape, "count": count}
+                    for shape, count in summary["n_plus_one"].most_common(top_queries)
+                ],
+                "top_queries": [
+                    {
+                        "query": shape,
+                        "count": summary["shapes"][shape],
+                        "total_ms": round(seconds * 1000, 2),
+                    }
+                    for shape, seconds in summary["shape_seconds"].most_common(top_queries)
+                ],
+            })
+    return sorted(result, key=lambda r: r["avg_queries"], reverse=True)
+
+
+def slow_queries() -> List[Dict]:
+    """최근 느린 쿼리 (최신순)"""
+    with _lock:
+        return list(reversed(_slow_queries))
@@ -0,0 +1,45 @@
+# Backend/services/etag.py
+"""
+사용자 데이터 버전 기반 ETag (조건부 GET)
+
+계획 저장/태스크 변경 때 증가하는 사용자 데이터 버전 + 오늘 날짜(오늘 진행률/주간 통계가 날짜에 따라 바뀜)로
+ETag를 만들고, If-None-Match가 같으면 계획 JSON을 읽지 않고 바로 304를 돌려준다.
+"""
+
+import hashlib
+import os
+from datetime import date
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+
+from services.store import store
+
+# 응답 형식이 바뀌는 배포 때 값을 바꾸면 기존 ETag가 모두 무효화됨
+ETAG_SALT = os.getenv("ETAG_SALT", "")
+# 캐시는 하되 매번 재검증
+CACHE_CONTROL = "private, no-cache"
+
+
+def user_etag(user_id: str, scope: str, *parts, version: Optional[int] = None) -> str:
+    """사용자 데이터 버전 기반 strong ETag (version을 이미 읽었으면 넘겨서 재조회 생략)"""
+    if version is None:
+        version = store.get_data_version(user_id)
+    raw = "\x1f".join([ETAG_SALT, scope, user_id, str(version), date.today().isoformat(), *map(str, parts)])
+    return f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match는 약한 비교 (압축 미들웨어가 W/를 붙여 보낸 값도 일치)
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def check_not_modified(request: Request, response: Response, etag: str):
+    """If-None-Match가 일치하면 304 (본문 없음), 아니면 응답에 ETag 설정"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -4,69 +4,117 @@
 import json
 import re
 import os
+import threading
+import time
 from typing import Optional, Dict
-from dotenv import load_dotenv
 
+from services.store import store
+from services.metrics import timed, LLM_REQUEST_DURATION, LLM_FALLBACKS
+from services.cassette import cassette
+from services.llm_admission import AdmissionHandle, admission
 from utils.logger import log_info, log_error, log_gpt
 
-load_dotenv()
-
-# OpenAI 클라이언트 설정 - API 키가 없어도 서버가 시작되도록 함
-_openai_api_key = os.getenv("OPENAI_API_KEY")
-client = None
+# OpenAI 클라이언트 - SDK import가 무거워서(~0.5초) 첫 GPT 호출 때 생성 (서버 시작을 늦추지 않도록)
+# API 키가 없어도 서버는 동작하고 GPT 기능만 비활성화
+_client = None
+_client_ready = False
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """OpenAI 클라이언트 반환 (최초 호출 시 생성, 키가 없거나 실패하면 None)"""
+    global _client, _client_ready
+    if _client_ready:
+        return _client
+    with _client_lock:
+        if not _client_ready:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if api_key:
+                try:
+                    from openai import OpenAI
+                    _client = OpenAI(api_key=api_key)
+                    log_info("OpenAI 클라이언트 초기화 성공")
+                except Exception as e:
+                    log_error(f"OpenAI 클라이언트 초기화 실패: {e}")
+                    _client = None
+            else:
+                log_info("OPENAI_API_KEY가 설정되지 않음 - GPT 기능 비활성화")
+            _client_ready = True
+    return _client
 
-if _openai_api_key:
-    try:
-        from openai import OpenAI
-        client = OpenAI(api_key=_openai_api_key)
-        log_info("OpenAI 클라이언트 초기화 성공")
-    except Exception as e:
-        log_error(f"OpenAI 클라이언트 초기화 실패: {e}")
-        client = None
-else:
-    log_info("OPENAI_API_KEY가 설정되지 않음 - GPT 기능 비활성화")
 
 # 모델 설정 - fallback 지원
 OPENAI_MODEL_SEARCH_PRIMARY = "gpt-5-search-api"  # 1차 웹 검색용 모델
 OPENAI_MODEL_SEARCH_FALLBACK = "gpt-4o-search-preview"  # 2차 fallback 모델
 OPENAI_MODEL_NORMAL = "gpt-4o"  # 일반 모델
 
-# 현재 사용 중인 모델 상태 (프론트엔드에서 조회 가능)
-current_search_status = {"model": None, "status": "idle"}
+# 현재 사용 중인 모델 상태 (프론트엔드에서 조회 가능) - 모든 워커가 같은 값을 보도록 공유 상태에 저장
+_IDLE_STATUS = {"model": None, "status": "idle"}
 
 
-def get_search_status() -> dict:
-    """현재 검색 상태 반환"""
-    return current_search_status
+def _set_search_status(model: Optional[str], status: str):
+    store.shared.set("gpt", "search_status", {"model": model, "status": status})
 
 
-def call_gpt(prompt: str, use_search: bool = False) -> str:
+def get_search_status() -> dict:
+    """현재 검색 상태 반환"""
+    return store.shared.get("gpt", "search_status", _IDLE_STATUS)
+
+
+def call_gpt(prompt: str, use_search: bool = False, priority: str = "interactive", user_id: Optional[str] = None,
+             handle: Optional[AdmissionHandle] = None) -> str:
+    """
+    GPT 호출 - cassette 재생 모드면 기록된 응답, 녹화 모드면 실제 응답을 기록
+    실제 호출은 입장 제어(priority/user_id별 슬롯)를 거치며, 슬롯을 못 받으면 LLMBusyError
+    handle을 넘기면 대기 중에 다른 요청이 우선순위를 올릴 수 있음 (admission.upgrade)
+    """
+    request = {"prompt": prompt, "use_search": use_search}
+    if cassette.replaying:
+        content = cassette.replay("gpt", request)
+        if content is None:
+            log_error("cassette에 기록된 GPT 응답이 없음")
+            return '{"error": "cassette에 기록된 응답이 없습니다."}'
+        log_gpt(prompt[:100], content)
+        return content
+
+    with admission.admit(priority, user_id, handle):
+        start = time.perf_counter()
+        content = _call_gpt_live(prompt, use_search)
+    if cassette.recording and not content.startswith(("GPT 호출 중 오류", '{"error"')):
+        cassette.record("gpt", request, content, time.perf_counter() - start)
+    return content
+
+
+def _call_gpt_live(prompt: str, use_search: bool = False) -> str:
     """GPT 호출 - fallback 로직 포함"""
-    global current_search_status
-
     # 클라이언트가 없으면 더미 응답 반환
+    client = _get_client()
     if client is None:
         log_error("OpenAI 클라이언트가 초기화되지 않음")
-        current_search_status = {"model": None, "status": "unavailable"}
+        _set_search_status(None, "unavailable")
         return '{"error": "GPT 서비스를 사용할 수 없습니다. API 키를 확인하세요."}'
 
     if use_search:
         # 1차 시도: gpt-5-search-api
-        current_search_status = {"model": "gpt-5-search-api", "status": "searching"}
+        _set_search_status("gpt-5-search-api", "searching")
         log_info(f"GPT 호출 중... (1차: gpt-5-search-api)")
 
         try:
             messages = [{"role": "user", "content": prompt}]
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL_SEARCH_PRIMARY,
-                messages=messages
-            )
-            content = response.choices[0].message.content
+            with timed(LLM_REQUEST_DURATION, model=OPENAI_MODEL_SEARCH_PRIMARY) as call:
+                response = client.chat.completions.create(
+                    model=OPENAI_MODEL_SEARCH_PRIMARY,
+                    messages=messages
+                )
+                content = response.choices[0].message.content
+                has_json = '```json' in content or '"recommendations"' in content or '"id"' in content
+                if not has_json:
+                    call.outcome = "rejected"
 
             # 응답이 JSON을 포함하는지 확인 (검색 거부 응답 감지)
-            if '```json' in content or '"recommendations"' in content or '"id"' in content:
+            if has_json:
                 log_gpt(prompt[:100], content)
-                current_search_status = {"model": "gpt-5-search-api", "status": "completed"}
+                _set_search_status("gpt-5-search-api", "completed")
                 return content
             else:
                 log_info("1차 모델이 JSON 응답을 반환하지 않음, fallback 시도")
@@ -76,7 +124,8 @@ def call_gpt(prompt: str, use_search: bool = False) -> str:
             log_error(f"1차 모델 실패: {str(e)}")
 
             # 2차 시도: gpt-4o-search-preview (fallback)
-            current_search_status = {"model": "gpt-4o-search-preview (fallback)", "status": "searching"}
+            LLM_FALLBACKS.inc(from_model=OPENAI_MODEL_SEARCH_PRIMARY, to_model=OPENAI_MODEL_SEARCH_FALLBACK)
+            _set_search_status("gpt-4o-search-preview (fallback)", "searching")
             log_info(f"GPT fallback 호출 중... (2차: gpt-4o-search-preview)")
 
             try:
@@ -88,29 +137,31 @@ def call_gpt(prompt: str, use_search: bool = False) -> str:
 ⚠️ 중요: 위 요청에 대해 반드시 JSON 형식으로만 응답하세요. 추가 질문이나 설명 없이 오직 JSON만 출력합니다."""
 
                 messages = [{"role": "user", "content": fallback_prompt}]
-                response = client.chat.completions.create(
-                    model=OPENAI_MODEL_SEARCH_FALLBACK,
-                    messages=messages
-                )
-                content = response.choices[0].message.content
+                with timed(LLM_REQUEST_DURATION, model=OPENAI_MODEL_SEARCH_FALLBACK):
+                    response = client.chat.completions.create(
+                        model=OPENAI_MODEL_SEARCH_FALLBACK,
+                        messages=messages
+                    )
+                    content = response.choices[0].message.content
                 log_gpt(prompt[:100], content)
-                current_search_status = {"model": "gpt-4o-search-preview (fallback)", "status": "completed"}
+                _set_search_status("gpt-4o-search-preview (fallback)", "completed")
                 return content
 
             except Exception as e2:
                 log_error(f"2차 모델도 실패: {str(e2)}")
-                current_search_status = {"model": None, "status": "failed"}
+                _set_search_status(None, "failed")
                 return f"GPT 호출 중 오류: {str(e2)}"
     else:
         # 일반 모델 사용
         try:
             log_info(f"GPT 호출 중... (일반 모델: gpt-4o)")
             messages = [{"role": "user", "content": prompt}]
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL_NORMAL,
-                messages=messages
-            )
-            content = response.choices[0].message.content
+            with timed(LLM_REQUEST_DURATION, model=OPENAI_MODEL_NORMAL):
+                response = client.chat.completions.create(
+                    model=OPENAI_MODEL_NORMAL,
+                    messages=messages
+                )
+                content = response.choices[0].message.content
             log_gpt(prompt[:100], content)
             return content
 
@@ -0,0 +1,238 @@
+# Backend/services/idempotency.py
+"""
+Idempotency-Key - 시간 초과 후 재시도된 비싼 POST(계획 생성/적용)를 한 번만 실행
+
+- 클라이언트가 Idempotency-Key 헤더를 보내면 (사용자, 키)별로 idempotency_keys에 실행 중/완료 상태를 기록
+- 같은 키로 다시 오면 실행 중인 작업에 붙어서 결과를 기다리거나(같은 워커는 Future, 다른 워커는 DB 폴링) 저장된 응답을 그대로 반환
+- 같은 키에 다른 요청 본문이면 422, 기다리다 시간이 지나면 409 + Retry-After
+- 작업이 예외로 끝나면 키를 지워서 재시도가 다시 실행되도록 함
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Response
+
+from services.json_response import dumps_json, raw_json_response
+from services.store import store
+from utils.logger import log_info
+
+# 완료된 응답 보관 시간
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+# 재시도가 실행 중인 작업을 기다리는 최대 시간
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "120"))
+# 이보다 오래 running인 키는 워커가 죽은 것으로 보고 다른 요청이 넘겨받음
+IDEMPOTENCY_RUNNING_TIMEOUT_SECONDS = int(os.getenv("IDEMPOTENCY_RUNNING_TIMEOUT_SECONDS", "600"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# 다른 워커의 결과를 기다릴 때 확인 간격
+_POLL_SECONDS = 0.5
+# 대기 시간 초과(409) 시 재시도 힌트
+_RETRY_AFTER_SECONDS = 5
+# 몇 번 실행할 때마다 만료된 키를 정리할지
+_PRUNE_EVERY = 100
+# 재시도 응답 표시 헤더
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class IdempotencyError(Exception):
+    """키 재사용 오류 또는 실행 중인 작업 대기 시간 초과"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[int] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class IdempotencyStore:
+    """idempotency_keys 테이블 - 상태: running(owner 실행 중) → done(response 저장)"""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection]):
+        self._connect = connect
+        self._claims = 0
+
+    def claim(self, user_id: str, key: str, endpoint: str, request_hash: str, owner: str) -> bool:
+        """키 선점 - 처음 보는 키이거나 만료/멈춘 키일 때만 성공"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            claimed = conn.execute('''
+                INSERT INTO idempotency_keys
+                    (user_id, key, endpoint, request_hash, status, owner, response, created_at, updated_at, expires_at)
+                VALUES (?, ?, ?, ?, 'running', ?, NULL, ?, ?, ?)
+                ON CONFLICT (user_id, key) DO UPDATE SET
+                    endpoint = excluded.endpoint, request_hash = excluded.request_hash, status = 'running',
+                    owner = excluded.owner, response = NULL, created_at = excluded.created_at,
+                    updated_at = excluded.updated_at, expires_at = excluded.expires_at
+                WHERE idempotency_keys.expires_at < ?
+                   OR (idempotency_keys.status = 'running' AND idempotency_keys.updated_at < ?)
+            ''', (user_id, key, endpoint, request_hash, owner, now, now, now + IDEMPOTENCY_TTL_SECONDS,
+                  now, now - IDEMPOTENCY_RUNNING_TIMEOUT_SECONDS)).rowcount > 0
+
+            self._claims += 1
+            if self._claims % _PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM idempotency_keys WHERE expires_at < ?", (now,))
+            conn.commit()
+        finally:
+            conn.close()
+        return claimed
+
+    def get(self, user_id: str, key: str) -> Optional[sqlite3.Row]:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT request_hash, status, response, updated_at FROM idempotency_keys WHERE user_id = ? AND key = ?",
+                (user_id, key)
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def complete(self, user_id: str, key: str, owner: str, response: str):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('''
+                UPDATE idempotency_keys SET status = 'done', response = ?, updated_at = ?, expires_at = ?
+                WHERE user_id = ? AND key = ? AND owner = ?
+            ''', (response, now, now + IDEMPOTENCY_TTL_SECONDS, user_id, key, owner))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def release(self, user_id: str, key: str, owner: str):
+        """실패한 실행의 키 삭제 (재시도가 다시 실행하도록)"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM idempotency_keys WHERE user_id = ? AND key = ? AND owner = ?",
+                         (user_id, key, owner))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+keys = IdempotencyStore(store._get_connection)
+
+# 이 워커에서 실행 중인 (사용자, 키) → 응답 JSON 텍스트 Future
+_inflight: Dict[Tuple[str, str], Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def request_hash(endpoint: str, payload: Any) -> str:
+    """엔드포인트 + 요청 본문 해시 (같은 키를 다른 요청에 쓰는지 확인용)"""
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(f"{endpoint}\n{body}".encode("utf-8")).hexdigest()
+
+
+def _replay(text: str, response: Response) -> Response:
+    replayed = raw_json_response(text.encode("utf-8"), response)
+    replayed.headers[REPLAYED_HEADER] = "true"
+    return replayed
+
+
+def _busy() -> IdempotencyError:
+    return IdempotencyError(409, "같은 요청을 아직 처리 중입니다. 잠시 후 다시 시도해주세요.",
+                            retry_after=_RETRY_AFTER_SECONDS)
+
+
+def _wait_other_worker(user_id: str, key: str, digest: str, deadline: float) -> Optional[str]:
+    """다른 워커가 실행 중인 키의 결과 대기 - 응답 텍스트, 키가 사라졌거나 멈춘 실행이면 None (다시 선점 시도)"""
+    while True:
+        row = keys.get(user_id, key)
+        if row is None or row['request_hash'] != digest:
+            return None
+        if row['status'] == 'done':
+            return row['response']
+        if row['updated_at'] < time.time() - IDEMPOTENCY_RUNNING_TIMEOUT_SECONDS:
+            return None
+        if time.time() >= deadline:
+            raise _busy()
+        time.sleep(_POLL_SECONDS)
+
+
+def run_idempotent(user_id: str, endpoint: str, key: Optional[str], payload: Any,
+                   response: Response, fn: Callable[[], Any]) -> Any:
+    """
+    fn()을 (user_id, key)당 한 번만 실행 - 키가 없으면 그냥 실행
+
+    처음 실행한 요청은 fn() 결과를, 재시도는 저장된 같은 응답(Idempotent-Replayed 헤더 포함)을 받는다.
+    요청 한도 차감처럼 실제로 실행할 때만 할 일은 fn 안에서 한다 (재시도는 차감하지 않음).
+    """
+    if key is None:
+        return fn()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise IdempotencyError(400, f"Idempotency-Key는 1~{IDEMPOTENCY_KEY_MAX_LENGTH}자여야 합니다.")
+
+    digest = request_hash(endpoint, payload)
+    slot = (user_id, key)
+    deadline = time.time() + IDEMPOTENCY_WAIT_SECONDS
+
+    while True:
+        with _inflight_lock:
+            future = _inflight.get(slot)
+
+        if future is None:
+            # DB 쓰기는 잠금 밖에서 - 선점에 성공한 요청만 Future를 등록
+            if keys.claim(user_id, key, endpoint, digest, _worker_id):
+                future = Future()
+                with _inflight_lock:
+                    _inflight[slot] = future
+                break
+            # 선점 실패 - 같은 워커의 다른 요청이 방금 선점했을 수 있으므로 다시 확인
+            with _inflight_lock:
+                future = _inflight.get(slot)
+
+        if future is not None:
+            # 같은 워커에서 실행 중 - 끝나면 같은 응답
+            row = keys.get(user_id, key)
+            if row is not None and row['request_hash'] != digest:
+                raise IdempotencyError(422, "Idempotency-Key가 다른 요청에 이미 사용되었습니다.")
+            try:
+                text = future.result(timeout=max(0.0, deadline - time.time()))
+            except FutureTimeoutError:
+                raise _busy()
+            except Exception:
+                # 먼저 온 요청이 실패 - 키가 지워졌으므로 이 요청이 다시 실행
+                continue
+            log_info(f"멱등 키 재시도 - 실행 중이던 결과 반환 ({endpoint})")
+            return _replay(text, response)
+
+        row = keys.get(user_id, key)
+        if row is None:
+            # 방금 다른 요청이 실패하고 지움 - 다시 선점 시도
+            continue
+        if row['request_hash'] != digest:
+            raise IdempotencyError(422, "Idempotency-Key가 다른 요청에 이미 사용되었습니다.")
+        if row['status'] == 'done':
+            log_info(f"멱등 키 재시도 - 저장된 응답 반환 ({endpoint})")
+            return _replay(row['response'], response)
+
+        text = _wait_other_worker(user_id, key, digest, deadline)
+        if text is not None:
+            log_info(f"멱등 키 재시도 - 다른 워커 결과 반환 ({endpoint})")
+            return _replay(text, response)
+
+    # Future는 결과를 알리기 전에 빼서, 이후 요청은 DB의 저장된 응답(또는 지워진 키)을 보도록
+    try:
+        result = fn()
+        text = dumps_json(result).decode("utf-8")
+        keys.complete(user_id, key, _worker_id, text)
+    except BaseException as e:
+        keys.release(user_id, key, _worker_id)
+        with _inflight_lock:
+            _inflight.pop(slot, None)
+        future.set_exception(e)
+        raise
+    with _inflight_lock:
+        _inflight.pop(slot, None)
+    future.set_result(text)
+    return result
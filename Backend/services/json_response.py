@@ -0,0 +1,56 @@
+# Backend/services/json_response.py
+"""
+빠른 JSON 응답
+
+- FastJSONResponse: orjson으로 직렬화하는 기본 응답 클래스 (orjson이 없으면 표준 json)
+- raw_json_response: DB에 저장된 JSON 텍스트(계획 일정 등)를 파싱하지 않고 응답 본문에 그대로 끼워 넣은 bytes 응답
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 - 없으면 표준 json
+    orjson = None
+
+# 엔드포인트에서 주입받은 Response에 설정한 헤더 중 raw 응답으로 옮길 것
+_CARRIED_HEADERS = ("etag", "cache-control", "x-next-cursor", "x-data-version")
+
+
+def dumps_json(value: Any) -> bytes:
+    """JSON bytes 직렬화 (한글은 이스케이프하지 않음)"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 직렬화 응답 (앱 기본 응답 클래스)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def splice_json(envelope: Dict, key: str, raw: Optional[str]) -> bytes:
+    """envelope 객체 끝에 key: raw(이미 JSON인 텍스트)를 파싱 없이 붙인 JSON 객체 bytes"""
+    head = dumps_json(envelope)
+    if raw is None:
+        value = b"null"
+    elif raw == "":
+        value = b'""'
+    else:
+        value = raw.encode("utf-8")
+    separator = b"," if len(head) > 2 else b""
+    return head[:-1] + separator + dumps_json(key) + b":" + value + b"}"
+
+
+def raw_json_response(body: bytes, response: Optional[Response] = None) -> Response:
+    """완성된 JSON bytes 응답 - 주입받은 response의 ETag/커서 헤더를 함께 전달"""
+    headers = {}
+    if response is not None:
+        headers = {name: value for name, value in response.headers.items() if name in _CARRIED_HEADERS}
+    return Response(content=body, media_type="application/json", headers=headers)
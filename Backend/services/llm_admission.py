@@ -0,0 +1,270 @@
+# Backend/services/llm_admission.py
+"""
+LLM 호출 입장 제어 - 우선순위별 동시 실행 수 제한 + 대기열
+
+OpenAI 처리량을 대화형 요청(퀴즈/추천/자료 검색)과 오래 걸리는 배치성 작업(주차별 계획 생성)이 똑같이 나눠 쓰면
+한도 근처에서 모두 함께 느려진다. 그래서 호출 전에 슬롯을 받게 한다.
+
+- 우선순위: interactive(사용자가 화면에서 기다림) > batch(계획 생성) > background(스냅샷/문제 은행 보충)
+- batch/background는 LLM_BATCH_MAX_CONCURRENCY까지만 실행 - 나머지 슬롯은 항상 interactive 몫
+- 사용자별 동시 실행 수 제한 (LLM_PER_USER_CONCURRENCY)
+- 대기열이 가득 찼거나 예상 대기 시간이 우선순위별 대기 한도를 넘으면 기다리지 않고 바로 LLMBusyError(재시도 힌트 포함)
+
+워커 프로세스마다 따로 집계한다 (전체 한도는 워커 수 × 설정값).
+"""
+
+import bisect
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.metrics import LLM_ADMISSION_WAIT
+
+# 0이면 입장 제어 없이 바로 호출
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_BATCH_MAX_CONCURRENCY = int(os.getenv("LLM_BATCH_MAX_CONCURRENCY", "5"))
+LLM_PER_USER_CONCURRENCY = int(os.getenv("LLM_PER_USER_CONCURRENCY", "4"))
+# 대기열 길이 - interactive와 batch/background를 따로 센다
+LLM_QUEUE_MAX = int(os.getenv("LLM_QUEUE_MAX", "32"))
+LLM_BATCH_QUEUE_MAX = int(os.getenv("LLM_BATCH_QUEUE_MAX", "16"))
+
+# 우선순위 → (순위, 최대 대기 초)
+PRIORITIES: Dict[str, Tuple[int, float]] = {
+    "interactive": (0, float(os.getenv("LLM_INTERACTIVE_WAIT_SECONDS", "10"))),
+    "batch": (1, float(os.getenv("LLM_BATCH_WAIT_SECONDS", "120"))),
+    "background": (2, float(os.getenv("LLM_BACKGROUND_WAIT_SECONDS", "60"))),
+}
+
+# 호출 시간 이동 평균의 초기값 (초) - 예상 대기 시간 계산용
+_INITIAL_CALL_SECONDS = 3.0
+
+
+class LLMBusyError(Exception):
+    """LLM 슬롯을 받지 못함 - retry_after초 뒤 재시도"""
+
+    def __init__(self, retry_after: int, reason: str):
+        super().__init__(f"LLM 요청이 많아 처리할 수 없습니다 ({reason})")
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+# 대기 티켓: (순위, 도착 순번, user_id) - 튜플 정렬 순서가 곧 입장 순서
+Ticket = Tuple[int, int, Optional[str]]
+
+
+class AdmissionHandle:
+    """우선순위를 나중에 올릴 수 있는 호출의 상태 (예: 사용자가 기다리기 시작한 미리 생성)
+
+    on_admit은 슬롯을 받은 직후(실제 호출 직전) 호출된다.
+    """
+
+    def __init__(self, priority: str, on_admit: Optional[Callable[[], None]] = None):
+        self.priority = priority
+        self.on_admit = on_admit
+        self.ticket: Optional[Ticket] = None
+        self.deadline: Optional[float] = None
+
+
+class AdmissionController:
+    """프로세스 내 LLM 동시 실행 관리"""
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 batch_concurrency: int = LLM_BATCH_MAX_CONCURRENCY,
+                 per_user: int = LLM_PER_USER_CONCURRENCY,
+                 queue_max: int = LLM_QUEUE_MAX,
+                 batch_queue_max: int = LLM_BATCH_QUEUE_MAX):
+        self.max_concurrency = max_concurrency
+        self.batch_concurrency = min(batch_concurrency, max_concurrency)
+        self.per_user = per_user
+        self.queue_max = queue_max
+        self.batch_queue_max = batch_queue_max
+
+        self._cond = threading.Condition()
+        self._waiting: List[Ticket] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._running_batch = 0
+        self._running_by_user: Dict[str, int] = {}
+        # 실행 중인 티켓 순번 → 시작 시각 (남은 시간 추정용)
+        self._started: Dict[int, float] = {}
+        self._avg_call_seconds = _INITIAL_CALL_SECONDS
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrency > 0
+
+    def _can_run(self, ticket: Ticket) -> bool:
+        rank, _, user_id = ticket
+        if self._running >= self.max_concurrency:
+            return False
+        if rank > 0 and self._running_batch >= self.batch_concurrency:
+            return False
+        if user_id is not None and self.per_user > 0 and self._running_by_user.get(user_id, 0) >= self.per_user:
+            return False
+        return True
+
+    def _next_runnable(self) -> Optional[Ticket]:
+        # 사용자 한도에 걸린 티켓은 건너뛰어서 뒤 요청이 막히지 않도록
+        for ticket in self._waiting:
+            if self._can_run(ticket):
+                return ticket
+        return None
+
+    def _estimate_wait(self, ticket: Ticket) -> float:
+        """실행 중인 호출의 남은 시간과 앞선 대기 티켓 수로 본 예상 대기 초"""
+        now = time.monotonic()
+        ahead = bisect.bisect_left(self._waiting, ticket)
+        slots = self.max_concurrency if ticket[0] == 0 else max(1, self.batch_concurrency)
+        # 슬롯이 비는 시각 - 먼저 끝날 호출부터 (평균보다 오래 걸리는 호출은 곧 끝나는 것으로 봄)
+        free = sorted(max(0.0, self._avg_call_seconds - (now - started)) for started in self._started.values())[:slots]
+        free += [0.0] * (slots - len(free))
+        heapq.heapify(free)
+        # 앞선 티켓이 먼저 비는 슬롯부터 차지
+        for _ in range(ahead):
+            heapq.heappush(free, heapq.heappop(free) + self._avg_call_seconds)
+        return free[0]
+
+    def _overload_reason(self, ticket: Ticket, max_wait: float) -> Optional[str]:
+        rank, _, user_id = ticket
+        if rank == 0:
+            queued = sum(1 for t in self._waiting if t[0] == 0)
+            if queued > self.queue_max:
+                return "queue_full"
+        else:
+            queued = sum(1 for t in self._waiting if t[0] > 0)
+            if queued > self.batch_queue_max:
+                return "queue_full"
+        if user_id is not None and self.per_user > 0:
+            if sum(1 for t in self._waiting if t[2] == user_id) > self.per_user:
+                return "user_queue_full"
+        if self._estimate_wait(ticket) > max_wait:
+            return "wait_too_long"
+        return None
+
+    def _start(self, ticket: Ticket):
+        rank, seq, user_id = ticket
+        self._running += 1
+        self._started[seq] = time.monotonic()
+        if rank > 0:
+            self._running_batch += 1
+        if user_id is not None:
+            self._running_by_user[user_id] = self._running_by_user.get(user_id, 0) + 1
+
+    def _acquire(self, priority: str, user_id: Optional[str], handle: Optional[AdmissionHandle] = None) -> Ticket:
+        start = time.monotonic()
+        with self._cond:
+            if handle is not None:
+                # 대기열에 들어가기 전에 이미 올려졌을 수 있음
+                priority = handle.priority
+            rank, max_wait = PRIORITIES[priority]
+            ticket = (rank, next(self._seq), user_id)
+            bisect.insort(self._waiting, ticket)
+            deadline = start + max_wait
+            if handle is not None:
+                handle.ticket, handle.deadline = ticket, deadline
+
+            if self._next_runnable() != ticket:
+                reason = self._overload_reason(ticket, max_wait)
+                if reason:
+                    retry_after = self._estimate_wait(ticket)
+                    self._waiting.remove(ticket)
+                    LLM_ADMISSION_WAIT.observe(0, priority=priority, outcome="rejected")
+                    raise LLMBusyError(max(1, math.ceil(retry_after)), reason)
+
+            while True:
+                if handle is not None:
+                    # 기다리는 동안 upgrade()로 순위/마감이 바뀔 수 있음
+                    ticket, deadline, priority = handle.ticket, handle.deadline, handle.priority
+                if self._next_runnable() == ticket:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(ticket)
+                    LLM_ADMISSION_WAIT.observe(max_wait, priority=priority, outcome="timeout")
+                    raise LLMBusyError(max(1, math.ceil(self._avg_call_seconds)), "timeout")
+                self._cond.wait(remaining)
+
+            self._waiting.remove(ticket)
+            self._start(ticket)
+            if handle is not None:
+                handle.ticket = None
+            # 슬롯이 여러 개 남아 있으면 다음 대기자도 확인하도록
+            self._cond.notify_all()
+        LLM_ADMISSION_WAIT.observe(time.monotonic() - start, priority=priority, outcome="admitted")
+        return ticket
+
+    def _release(self, ticket: Ticket, elapsed: float):
+        rank, seq, user_id = ticket
+        with self._cond:
+            self._running -= 1
+            self._started.pop(seq, None)
+            if rank > 0:
+                self._running_batch -= 1
+            if user_id is not None:
+                left = self._running_by_user.get(user_id, 1) - 1
+                if left > 0:
+                    self._running_by_user[user_id] = left
+                else:
+                    self._running_by_user.pop(user_id, None)
+            self._avg_call_seconds = self._avg_call_seconds * 0.8 + elapsed * 0.2
+            self._cond.notify_all()
+
+    def upgrade(self, handle: AdmissionHandle, priority: str = "interactive") -> bool:
+        """대기 중인(또는 아직 대기열에 들어가지 않은) 호출의 우선순위를 올림 - 이미 실행 중이면 False
+
+        순번은 그대로 두고 순위만 바꾸며, 마감도 새 우선순위의 대기 한도를 넘지 않도록 줄인다.
+        """
+        rank, max_wait = PRIORITIES[priority]
+        with self._cond:
+            if rank >= PRIORITIES[handle.priority][0]:
+                return False
+            old = handle.ticket
+            if old is not None and old not in self._waiting:
+                return False
+            handle.priority = priority
+            if old is not None:
+                self._waiting.remove(old)
+                handle.ticket = (rank, old[1], old[2])
+                bisect.insort(self._waiting, handle.ticket)
+                handle.deadline = min(handle.deadline, time.monotonic() + max_wait)
+                self._cond.notify_all()
+            return True
+
+    @contextmanager
+    def admit(self, priority: str = "interactive", user_id: Optional[str] = None,
+              handle: Optional[AdmissionHandle] = None):
+        """슬롯을 받을 때까지 대기 (대기열이 가득 차거나 시간 초과면 LLMBusyError)
+
+        handle을 넘기면 기다리는 동안 upgrade(handle)로 우선순위를 올릴 수 있다.
+        """
+        if not self.enabled:
+            if handle is not None and handle.on_admit:
+                handle.on_admit()
+            yield
+            return
+        ticket = self._acquire(priority, user_id, handle)
+        start = time.monotonic()
+        try:
+            if handle is not None and handle.on_admit:
+                handle.on_admit()
+            yield
+        finally:
+            self._release(ticket, time.monotonic() - start)
+
+    def snapshot(self) -> Dict:
+        """현재 실행/대기 현황"""
+        with self._cond:
+            return {
+                "running": self._running,
+                "running_batch": self._running_batch,
+                "waiting": len(self._waiting),
+                "avg_call_seconds": round(self._avg_call_seconds, 3),
+            }
+
+
+admission = AdmissionController()
@@ -0,0 +1,199 @@
+# Backend/services/metrics.py
+"""
+운영 지표 수집 - Prometheus 텍스트 형식의 카운터/히스토그램 (외부 라이브러리 없이 프로세스 내 집계)
+
+워커 프로세스마다 따로 집계하므로 모든 시계열에 worker(pid) 라벨을 붙인다.
+uvicorn --workers N이면 한 번 수집할 때 요청을 받은 워커 하나의 값만 보인다 (README 참고).
+"""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+# 기본 지연시간 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 요청당 DB 쿼리 수 버킷
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], *extra: str) -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    parts.extend(label for label in extra if label)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self, worker: str = "") -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key, worker)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """누적 버킷 히스토그램"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # key -> [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self, worker: str = "") -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, worker, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key, worker)
+            lines.append(f"{self.name}_sum{labels} {_format_value(round(state[-2], 6))}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return "\n".join(lines)
+
+
+_registry = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    """등록된 모든 지표를 Prometheus 텍스트 형식으로 출력 (이 워커 프로세스의 값)"""
+    worker = f'worker="{os.getpid()}"'
+    return "\n".join(metric.render(worker) for metric in _registry) + "\n"
+
+
+# HTTP
+HTTP_REQUEST_DURATION = _register(Histogram(
+    "palearn_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+))
+
+# DB
+DB_QUERY_DURATION = _register(Histogram(
+    "palearn_db_query_duration_seconds", "SQLite 쿼리 실행 시간", ("operation",)
+))
+DB_QUERIES_PER_REQUEST = _register(Histogram(
+    "palearn_db_queries_per_request", "요청당 SQLite 쿼리 수", ("route",), buckets=QUERY_COUNT_BUCKETS
+))
+DB_TIME_PER_REQUEST = _register(Histogram(
+    "palearn_db_time_per_request_seconds", "요청당 SQLite 쿼리 시간 합계", ("route",)
+))
+
+# LLM
+LLM_REQUEST_DURATION = _register(Histogram(
+    "palearn_llm_request_duration_seconds", "LLM 호출 시간", ("model", "outcome")
+))
+LLM_FALLBACKS = _register(Counter(
+    "palearn_llm_fallbacks_total", "fallback 모델로 재시도한 횟수", ("from_model", "to_model")
+))
+LLM_ADMISSION_WAIT = _register(Histogram(
+    "palearn_llm_admission_wait_seconds", "LLM 슬롯 대기 시간", ("priority", "outcome")
+))
+
+# 검색
+SEARCH_REQUEST_DURATION = _register(Histogram(
+    "palearn_search_request_duration_seconds", "검색 API 호출 시간", ("provider", "outcome")
+))
+
+
+# 요청 단위 DB 집계 - 스레드풀로 넘어가도 같은 dict를 공유하도록 가변 객체를 담음
+_request_db: ContextVar[Optional[dict]] = ContextVar("palearn_request_db", default=None)
+
+
+def begin_request() -> dict:
+    """현재 요청의 DB 집계 시작"""
+    stats = {"queries": 0, "seconds": 0.0}
+    _request_db.set(stats)
+    return stats
+
+
+def current_request_db() -> Optional[dict]:
+    """현재 요청의 DB 집계 (요청 밖이면 None)"""
+    return _request_db.get()
+
+
+def record_db_query(sql: str, seconds: float):
+    """쿼리 1회 기록 (전역 히스토그램 + 현재 요청 집계)"""
+    operation = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "UNKNOWN"
+    DB_QUERY_DURATION.observe(seconds, operation=operation)
+    stats = _request_db.get()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["seconds"] += seconds
+
+
+def finish_request(method: str, route: str, status: int, seconds: float, stats: dict):
+    """요청 종료 시 HTTP/DB 지표 기록"""
+    HTTP_REQUEST_DURATION.observe(seconds, method=method, route=route, status=status)
+    DB_QUERIES_PER_REQUEST.observe(stats["queries"], route=route)
+    DB_TIME_PER_REQUEST.observe(stats["seconds"], route=route)
+
+
+class timed:
+    """with 블록 실행 시간을 히스토그램에 기록 (예외가 나면 outcome=error)"""
+
+    def __init__(self, histogram: Histogram, **labels):
+        self._histogram = histogram
+        self._labels = labels
+        self.outcome = "success"
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        outcome = "error" if exc_type is not None else self.outcome
+        self._histogram.observe(time.perf_counter() - self._start, outcome=outcome, **self._labels)
+        return False
@@ -0,0 +1,298 @@
+# Backend/services/migrations.py
+"""
+스키마 마이그레이션 - PRAGMA user_version 기준으로 아직 적용되지 않은 단계만 실행
+
+- 시작 시 한 번 호출 (main.py startup 이벤트, manage.py migrate)
+- 최신 버전이면 PRAGMA 조회 한 번으로 끝나고, DDL은 실행하지 않음
+- 여러 워커가 동시에 시작해도 BEGIN IMMEDIATE로 한 워커만 적용
+- 새 스키마 변경은 MIGRATIONS 끝에 (버전, 설명, SQL 목록)을 추가
+"""
+
+import sqlite3
+from typing import List, Tuple
+
+from utils.logger import log_info, log_success
+
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "기본 테이블", [
+        # Users 테이블
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            user_id TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            name TEXT NOT NULL,
+            birth TEXT,
+            photo_url TEXT,
+            friend_code TEXT UNIQUE NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        ''',
+        # Friendships 테이블
+        '''
+        CREATE TABLE IF NOT EXISTS friendships (
+            user_id TEXT NOT NULL,
+            friend_id TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (user_id, friend_id),
+            FOREIGN KEY (user_id) REFERENCES users(user_id),
+            FOREIGN KEY (friend_id) REFERENCES users(user_id)
+        )
+        ''',
+        # Plans 테이블
+        '''
+        CREATE TABLE IF NOT EXISTS plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            plan_name TEXT NOT NULL,
+            total_duration TEXT,
+            daily_schedule TEXT,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+        ''',
+        # Notifications 테이블
+        '''
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            message TEXT NOT NULL,
+            is_read INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+        ''',
+        # Quiz Answers 테이블
+        '''
+        CREATE TABLE IF NOT EXISTS quiz_answers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            quiz_data TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+        ''',
+        # Quiz Bank 테이블 (skill/level별 문제 은행)
+        '''
+        CREATE TABLE IF NOT EXISTS quiz_bank (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            skill TEXT NOT NULL,
+            level TEXT NOT NULL,
+            question TEXT NOT NULL,
+            question_hash TEXT NOT NULL,
+            type TEXT NOT NULL DEFAULT 'OX',
+            options TEXT,
+            answer_key TEXT NOT NULL,
+            explanation TEXT,
+            created_at TEXT NOT NULL,
+            UNIQUE (skill, level, question_hash)
+        )
+        ''',
+        # 워커 간 공유 상태 (키-값)
+        '''
+        CREATE TABLE IF NOT EXISTS shared_state (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        )
+        ''',
+        # 캐시 무효화 이벤트 (워커 간 전달)
+        '''
+        CREATE TABLE IF NOT EXISTS invalidations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        ''',
+        # Tokens 테이블 (블랙리스트용)
+        '''
+        CREATE TABLE IF NOT EXISTS token_blacklist (
+            token TEXT PRIMARY KEY,
+            blacklisted_at TEXT NOT NULL
+        )
+        ''',
+        # 강좌 추천 스냅샷 (skill/level별 미리 생성된 추천 결과)
+        '''
+        CREATE TABLE IF NOT EXISTS recommend_snapshots (
+            skill TEXT NOT NULL,
+            level TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            refreshed_at TEXT NOT NULL,
+            PRIMARY KEY (skill, level)
+        )
+        ''',
+        # 강좌 추천 요청 수 (인기 skill/level 집계)
+        '''
+        CREATE TABLE IF NOT EXISTS recommend_demand (
+            skill TEXT NOT NULL,
+            level TEXT NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            last_requested_at TEXT NOT NULL,
+            PRIMARY KEY (skill, level)
+        )
+        ''',
+        # 백그라운드 작업 리스 (여러 워커 중 하나만 실행)
+        '''
+        CREATE TABLE IF NOT EXISTS job_leases (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        ''',
+    ]),
+    (2, "조회 인덱스", [
+        # 사용자별 계획 목록 (ORDER BY created_at DESC)
+        "CREATE INDEX IF NOT EXISTS idx_plans_user_created ON plans (user_id, created_at)",
+        # 역방향 친구 조회
+        "CREATE INDEX IF NOT EXISTS idx_friendships_friend ON friendships (friend_id)",
+        # 사용자별 알림
+        "CREATE INDEX IF NOT EXISTS idx_notifications_user_created ON notifications (user_id, created_at)",
+        # 오래된 무효화 이벤트 정리
+        "CREATE INDEX IF NOT EXISTS idx_invalidations_created ON invalidations (created_at)",
+        # 인기 추천 집계
+        "CREATE INDEX IF NOT EXISTS idx_recommend_demand_recent ON recommend_demand (last_requested_at, hits)",
+    ]),
+    (3, "사용자 데이터 버전", [
+        # 계획/태스크/프로필이 바뀔 때마다 증가 - 조건부 GET(ETag) 기준
+        '''
+        CREATE TABLE IF NOT EXISTS user_data_versions (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+    ]),
+    (4, "계획 변경 기록", [
+        # 사용자별 변경 순번(= 데이터 버전)마다 추가된 계획/바뀐 태스크 - GET /plans/changes
+        '''
+        CREATE TABLE IF NOT EXISTS plan_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            plan_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            payload TEXT,
+            created_at TEXT NOT NULL
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_plan_changes_user_seq ON plan_changes (user_id, seq)",
+        # 이 순번 이하의 변경은 기록이 없음 (정리됐거나 기록 시작 전) - 그 이전부터 동기화하려면 전체 재동기화
+        "ALTER TABLE user_data_versions ADD COLUMN changes_floor INTEGER NOT NULL DEFAULT 0",
+        "UPDATE user_data_versions SET changes_floor = version",
+    ]),
+    (5, "요청 한도", [
+        # 슬라이딩 윈도우 요청 한도 - 버킷(정책:키)별 고정 윈도우 사용량 (직전 윈도우와 가중 합산)
+        '''
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            bucket TEXT NOT NULL,
+            window_start INTEGER NOT NULL,
+            used INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (bucket, window_start)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_rate_limits_expires ON rate_limits (expires_at)",
+    ]),
+    (6, "복습 스냅샷", [
+        # 날짜별 복습 응답 (자정 이후 미리 계산) - data_version이 현재 사용자 데이터 버전과 다르면 다시 계산
+        '''
+        CREATE TABLE IF NOT EXISTS review_snapshots (
+            user_id TEXT NOT NULL,
+            review_date TEXT NOT NULL,
+            data_version INTEGER NOT NULL,
+            review TEXT NOT NULL,
+            yesterday_review TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (user_id, review_date)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_review_snapshots_date ON review_snapshots (review_date)",
+    ]),
+    (7, "LLM 배치 요청", [
+        # 비대화형 GPT 요청 대기열 - queued → submitted(batch_id) → done / failed
+        '''
+        CREATE TABLE IF NOT EXISTS llm_batch_requests (
+            custom_id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            dedupe_key TEXT,
+            prompt TEXT NOT NULL,
+            use_search INTEGER NOT NULL,
+            context TEXT,
+            batch_id TEXT,
+            status TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_llm_batch_status ON llm_batch_requests (status, created_at)",
+        # 같은 작업(예: 같은 skill/level 추천 갱신)은 처리 중인 요청이 하나만
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_llm_batch_pending_key ON llm_batch_requests (dedupe_key) "
+        "WHERE status IN ('queued', 'submitted')",
+    ]),
+    (8, "멱등 키", [
+        # Idempotency-Key별 실행 상태 - running(owner가 실행 중) → done(response에 응답 JSON)
+        '''
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            user_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            request_hash TEXT NOT NULL,
+            status TEXT NOT NULL,
+            owner TEXT NOT NULL,
+            response TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (user_id, key)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys (expires_at)",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(db_path: str) -> int:
+    """DB의 스키마 버전"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def migrate(db_path: str) -> int:
+    """대기 중인 마이그레이션 적용 후 최종 버전 반환"""
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= LATEST_VERSION:
+            return LATEST_VERSION
+
+        # 여러 워커가 동시에 읽고 쓸 수 있도록 WAL 모드 사용 (DB 파일에 영구 저장됨)
+        conn.execute("PRAGMA journal_mode=WAL")
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 워커가 먼저 적용했을 수 있으므로 잠금 후 다시 확인
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, description, statements in MIGRATIONS:
+                if target <= version:
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target}")
+                log_info(f"마이그레이션 적용: v{target} {description}")
+                version = target
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        log_success(f"DB 스키마 버전: v{version}")
+        return version
+    finally:
+        conn.close()
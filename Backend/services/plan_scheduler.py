@@ -0,0 +1,348 @@
+# Backend/services/plan_scheduler.py
+"""커리큘럼 기반 학습 일정 스케줄러 - 강의 시간을 파싱해 하루 학습 시간에 맞게 배치 (LLM 호출 없음)"""
+
+import math
+import re
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+DAY_NAMES = ['월', '화', '수', '목', '금', '토', '일']
+
+# 최대 계획 기간 (달력 기준 4주)
+MAX_PLAN_DAYS = 28
+# 시간 정보가 없는 강의의 기본 길이 (분)
+DEFAULT_LECTURE_MINUTES = 30
+# 하루 예산 중 복습/퀴즈/유튜브 슬롯용으로 남겨두는 비율
+ANCILLARY_RESERVE = 0.2
+# 강의 대비 실습 시간 비율 후보 (4주 안에 들어가는 가장 큰 값을 사용)
+PRACTICE_RATIOS = (0.5, 0.25, 0.0)
+MIN_SLOT_MINUTES = 10
+
+# 단위 뒤에 영문자가 이어지면(예: 'min' 속의 'm') 다른 단위이므로 제외 - 숫자/한글은 허용 ('1시간30분', '1h30m')
+_HOUR_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:시간|hours?|hrs?|h)(?![A-Za-z])', re.IGNORECASE)
+_MINUTE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:분|minutes?|mins?|m)(?![A-Za-z])', re.IGNORECASE)
+_SECOND_RE = re.compile(r'(\d+)\s*(?:초|seconds?|secs?|s)(?![A-Za-z])', re.IGNORECASE)
+_CLOCK_RE = re.compile(r'^\s*(?:(\d+):)?(\d{1,2}):(\d{2})\s*$')
+
+
+def parse_duration(value) -> Optional[int]:
+    """'25분', '1시간 30분', '1시간30분', '1h30m', '1.5시간', '01:30:00' 등을 분 단위로 변환 (실패 시 None)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value > 0 else None
+
+    text = str(value).strip()
+    if not text:
+        return None
+
+    clock = _CLOCK_RE.match(text)
+    if clock:
+        hours, minutes, seconds = clock.groups()
+        if hours is None:
+            # mm:ss
+            total = int(minutes) + int(seconds) / 60
+        else:
+            total = int(hours) * 60 + int(minutes) + int(seconds) / 60
+        return max(1, round(total)) if total > 0 else None
+
+    total = 0.0
+    matched = False
+    for pattern, factor in ((_HOUR_RE, 60), (_MINUTE_RE, 1), (_SECOND_RE, 1 / 60)):
+        for m in pattern.finditer(text):
+            total += float(m.group(1)) * factor
+            matched = True
+
+    if not matched:
+        # 단위 없는 숫자는 분으로 간주
+        if re.fullmatch(r'\d+', text):
+            total = float(text)
+        else:
+            return None
+
+    return max(1, round(total)) if total > 0 else None
+
+
+def format_minutes(minutes: int) -> str:
+    """분 단위를 '1시간 30분' 형식으로 변환"""
+    minutes = max(0, int(round(minutes)))
+    hours, rest = divmod(minutes, 60)
+    if hours and rest:
+        return f"{hours}시간 {rest}분"
+    if hours:
+        return f"{hours}시간"
+    return f"{rest}분"
+
+
+def parse_start_date(start_date: str) -> date:
+    """ISO 문자열에서 시작 날짜 추출 (실패 시 오늘)"""
+    try:
+        return date.fromisoformat(str(start_date).split('T')[0])
+    except (ValueError, TypeError):
+        return date.today()
+
+
+def study_dates(start: date, rest_days: List[str], max_days: int = MAX_PLAN_DAYS) -> List[date]:
+    """시작일부터 max_days 기간 중 쉬는 요일을 제외한 학습일 목록"""
+    rest = set(rest_days or [])
+    dates = []
+    for offset in range(max_days):
+        current = start + timedelta(days=offset)
+        if DAY_NAMES[current.weekday()] not in rest:
+            dates.append(current)
+    return dates
+
+
+def _new_task(title: str, description: str, minutes: int, section: str, task_type: str) -> Dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "title": title,
+        "description": description,
+        "duration": format_minutes(minutes),
+        "completed": False,
+        "section": section,
+        "task_type": task_type,
+        "related_materials": [],
+        "review_materials": []
+    }
+
+
+def _split_long_lessons(lessons: List[Dict], capacity: int, practice_ratio: float) -> List[Dict]:
+    """하루 용량보다 긴 강의를 여러 파트로 분할"""
+    result = []
+    for lesson in lessons:
+        load = lesson['minutes'] + _practice_minutes(lesson['minutes'], practice_ratio)
+        if load <= capacity:
+            result.append(lesson)
+            continue
+        parts = math.ceil(load / capacity)
+        while True:
+            part_minutes = math.ceil(lesson['minutes'] / parts)
+            if part_minutes + _practice_minutes(part_minutes, practice_ratio) <= capacity or part_minutes <= 1:
+                break
+            parts += 1
+        for i in range(parts):
+            result.append({
+                **lesson,
+                "title": f"{lesson['title']} ({i + 1}/{parts})",
+                "minutes": part_minutes,
+            })
+    return result
+
+
+def _practice_minutes(lecture_minutes: int, ratio: float) -> int:
+    if ratio <= 0:
+        return 0
+    return max(MIN_SLOT_MINUTES, int(round(lecture_minutes * ratio / 5.0)) * 5)
+
+
+def _pack(lessons: List[Dict], capacity: int, practice_ratio: float, day_count: int) -> Optional[List[List[Dict]]]:
+    """
+    강의를 순서대로 하루 용량 안에 채워 넣음 (first-fit, 순서 유지)
+
+    새 섹션이 오늘 남은 시간에는 안 들어가지만 하루에는 통째로 들어가고, 일정에도 여유가 있으면
+    다음 날로 넘겨 섹션을 붙여 둔다. day_count 안에 다 들어가지 않으면 None.
+    """
+    units = _split_long_lessons(lessons, capacity, practice_ratio)
+    for unit in units:
+        unit['practice'] = _practice_minutes(unit['minutes'], practice_ratio)
+
+    section_load: Dict[str, int] = {}
+    for unit in units:
+        section_load[unit['section']] = section_load.get(unit['section'], 0) + unit['minutes'] + unit['practice']
+    remaining_load = sum(u['minutes'] + u['practice'] for u in units)
+
+    days: List[List[Dict]] = []
+    idx = 0
+    while idx < len(units):
+        if len(days) >= day_count:
+            return None
+        days_left = day_count - len(days)
+        day: List[Dict] = []
+        used = 0
+
+        while idx < len(units):
+            unit = units[idx]
+            load = unit['minutes'] + unit['practice']
+            if day and used + load > capacity:
+                break
+
+            starts_section = idx == 0 or units[idx - 1]['section'] != unit['section']
+            if (day and starts_section
+                    and section_load[unit['section']] <= capacity
+                    and used + section_load[unit['section']] > capacity
+                    and remaining_load <= capacity * (days_left - 1)):
+                break
+
+            day.append(unit)
+            used += load
+            remaining_load -= load
+            idx += 1
+
+        days.append(day)
+
+    return days
+
+
+def _pack_lessons(lessons: List[Dict], hour_per_day: float, day_count: int) -> Tuple[List[List[Dict]], int]:
+    """강의를 day_count일에 순서대로 나눠 담음 - (날짜별 강의 조각 목록, 하루 예산(분))
+
+    조각의 index는 원래 lessons에서의 위치 (긴 강의를 나눈 파트도 같은 index)
+    """
+    budget = max(MIN_SLOT_MINUTES * 2, int(round((hour_per_day or 1) * 60)))
+    capacity = int(budget * (1 - ANCILLARY_RESERVE))
+
+    lessons = [
+        {**lesson, "index": index, "minutes": parse_duration(lesson.get('duration')) or DEFAULT_LECTURE_MINUTES}
+        for index, lesson in enumerate(lessons)
+    ]
+
+    packed = None
+    for ratio in PRACTICE_RATIOS:
+        packed = _pack(lessons, capacity, ratio, day_count)
+        if packed is not None:
+            break
+
+    if packed is None:
+        # 실습을 빼도 넘치면 하루 용량을 늘려가며 재시도
+        total = sum(l['minutes'] for l in lessons)
+        capacity = max(capacity, math.ceil(total / day_count))
+        while packed is None:
+            packed = _pack(lessons, capacity, 0.0, day_count)
+            capacity += 5
+        budget = max(budget, math.ceil(capacity / (1 - ANCILLARY_RESERVE)))
+    return packed, budget
+
+
+def build_schedule(
+    lessons: List[Dict],
+    skill: str,
+    hour_per_day: float,
+    start_date: str,
+    rest_days: List[str],
+    max_days: int = MAX_PLAN_DAYS
+) -> List[Dict]:
+    """
+    강의 목록(section/title/duration/description)을 학습일에 순서대로 배치
+
+    - 강의 시간 + 실습 시간을 하루 예산의 (1 - ANCILLARY_RESERVE) 안에 순차 배치
+    - 남은 예산으로 복습(3일마다), 섹션 마무리 퀴즈, 유튜브(격일) 슬롯 추가
+    - 4주 안에 다 들어가지 않으면 실습 비율을 줄이고, 그래도 넘치면 하루 예산을 늘림
+    """
+    dates = study_dates(parse_start_date(start_date), rest_days, max_days)
+    if not lessons or not dates:
+        return []
+
+    packed, budget = _pack_lessons(lessons, hour_per_day, len(dates))
+
+    section_last = {}
+    for day_index, day in enumerate(packed):
+        for unit in day:
+            section_last[unit['section']] = id(unit)
+
+    schedule = []
+    for day_index, (current, day) in enumerate(zip(dates, packed)):
+        tasks: List[Dict] = []
+        used = 0
+        finished_sections = []
+
+        for unit in day:
+            description = unit.get('description') or f"{unit['title']} 강의 시청"
+            tasks.append(_new_task(
+                f"📹 {unit['title']}",
+                f"[{unit['section']}] {description}",
+                unit['minutes'], unit['section'], "lecture"
+            ))
+            if unit['practice']:
+                tasks.append(_new_task(
+                    f"💻 {unit['title']} 실습",
+                    "배운 내용을 직접 코드로 작성해보기",
+                    unit['practice'], unit['section'], "practice"
+                ))
+            used += unit['minutes'] + unit['practice']
+            if section_last[unit['section']] == id(unit):
+                finished_sections.append(unit['section'])
+
+        spare = budget - used
+
+        # 복습 (3일마다)
+        if day_index > 0 and day_index % 3 == 0 and spare >= MIN_SLOT_MINUTES:
+            minutes = min(spare, max(MIN_SLOT_MINUTES, int(budget * 0.15)))
+            tasks.append(_new_task(
+                "📝 이전 학습 내용 복습",
+                "지금까지 배운 내용을 정리하고 복습하기",
+                minutes, "복습", "review"
+            ))
+            spare -= minutes
+
+        # 섹션 마무리 퀴즈
+        for section in finished_sections:
+            if spare < MIN_SLOT_MINUTES:
+                break
+            minutes = min(spare, max(MIN_SLOT_MINUTES, int(budget * 0.1)))
+            tasks.append(_new_task(
+                f"🎯 {section} 마무리 퀴즈",
+                "학습한 내용에 대한 이해도 확인 퀴즈",
+                minutes, "평가", "quiz"
+            ))
+            spare -= minutes
+
+        # 유튜브 추가 학습 (격일)
+        if day_index % 2 == 0 and spare >= MIN_SLOT_MINUTES * 1.5:
+            first_topic = day[0]['title'] if day else skill
+            minutes = min(spare, max(MIN_SLOT_MINUTES, int(budget * 0.15)))
+            tasks.append(_new_task(
+                f"🎬 {skill} {first_topic} 관련 유튜브 영상",
+                "관련 유튜브 영상을 찾아 추가 학습하기",
+                minutes, "추가학습", "youtube"
+            ))
+
+        if tasks:
+            schedule.append({"date": current.isoformat(), "tasks": tasks})
+
+    return schedule
+
+
+def lesson_dates(
+    lessons: List[Dict],
+    hour_per_day: float,
+    start_date: str,
+    rest_days: List[str],
+    max_days: int = MAX_PLAN_DAYS
+) -> List[Optional[str]]:
+    """build_schedule과 같은 배치에서 각 강의가 처음 배치되는 날짜 (lessons와 같은 순서, 배치되지 않으면 None)
+
+    제목이 같은 강의가 여러 섹션에 있어도 위치로 구분한다.
+    """
+    result: List[Optional[str]] = [None] * len(lessons)
+    dates = study_dates(parse_start_date(start_date), rest_days, max_days)
+    if not lessons or not dates:
+        return result
+
+    packed, _ = _pack_lessons(lessons, hour_per_day, len(dates))
+    for current, day in zip(dates, packed):
+        for unit in day:
+            if result[unit['index']] is None:
+                result[unit['index']] = current.isoformat()
+    return result
+
+
+def lecture_topics(schedule: List[Dict]) -> List[Dict]:
+    """학습 자료 검색이 필요한 강의 태스크 목록"""
+    return [
+        task
+        for day in schedule
+        for task in day.get('tasks', [])
+        if task.get('task_type') == 'lecture'
+    ]
+
+
+def schedule_duration(schedule: List[Dict]) -> str:
+    """일정의 전체 기간을 'N주' 형식으로 반환"""
+    if not schedule:
+        return "1주"
+    first = date.fromisoformat(schedule[0]['date'])
+    last = date.fromisoformat(schedule[-1]['date'])
+    weeks = ((last - first).days + 1 + 6) // 7
+    return f"{weeks}주"
@@ -0,0 +1,224 @@
+# Backend/services/profiler.py
+"""
+요청 단위 프로파일링 - 관리자가 요청한 한 건만 프로파일러로 실행하고 결과를 파일로 저장
+
+- 트리거: X-Profile 헤더(또는 ?_profile= 쿼리)와 X-Admin-Token 헤더
+  (토큰은 접근/프록시 로그와 브라우저 기록에 남지 않도록 헤더로만 받음)
+- sample: 모든 스레드 스택을 주기적으로 샘플링해 collapsed stacks(flamegraph.pl/speedscope 호환) 저장
+  (스레드풀에서 실행되는 동기 엔드포인트도 잡히지만, 같은 시각 다른 요청의 스택도 섞일 수 있음)
+- cprofile: 이벤트 루프 스레드를 cProfile로 측정해 pstats 저장
+- 트리거되지 않은 요청은 헤더 확인 외에 아무 일도 하지 않음
+"""
+
+import cProfile
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+from utils.logger import log_info
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+# 보관할 프로파일 수 (오래된 것부터 삭제)
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+PROFILE_MODES = ("sample", "cprofile")
+PROFILE_EXTENSIONS = {"sample": "collapsed", "cprofile": "pstats"}
+
+# 대기 중인 스레드로 보고 버리는 최하단 프레임 (파일명, 함수명)
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("threading.py", "_wait_for_tstate_lock"),
+}
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """관리자 토큰 확인 (ADMIN_TOKEN이 없으면 항상 거부)"""
+    if not ADMIN_TOKEN or not token:
+        return False
+    # 헤더 값은 ASCII가 아닐 수 있으므로 bytes로 비교 (str끼리 비교하면 TypeError)
+    try:
+        return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+    except UnicodeError:
+        return False
+
+
+class _StackSampler(threading.Thread):
+    """주기적으로 모든 스레드의 스택을 수집"""
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True, name="profile-sampler")
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self._interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                leaf = frame.f_code
+                if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _profile_path(profile_id: str, ext: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{profile_id}.{ext}")
+
+
+def _prune():
+    metas = sorted(
+        (name for name in os.listdir(PROFILE_DIR) if name.endswith('.json')),
+        key=lambda name: os.path.getmtime(os.path.join(PROFILE_DIR, name))
+    )
+    for name in metas[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else metas:
+        profile_id = name[:-len('.json')]
+        for ext in ('json', *PROFILE_EXTENSIONS.values()):
+            try:
+                os.remove(_profile_path(profile_id, ext))
+            except FileNotFoundError:
+                pass
+
+
+def _save(profile_id: str, mode: str, meta: Dict, write_profile):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    write_profile(_profile_path(profile_id, PROFILE_EXTENSIONS[mode]))
+    with open(_profile_path(profile_id, 'json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    _prune()
+    log_info(f"프로파일 저장: {meta['method']} {meta['path']} ({mode}, {meta['duration_ms']}ms) → {profile_id}")
+
+
+def list_profiles() -> List[Dict]:
+    """저장된 프로파일 메타데이터 (최신순)"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    metas = []
+    for name in os.listdir(PROFILE_DIR):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(PROFILE_DIR, name), encoding='utf-8') as f:
+                metas.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(metas, key=lambda m: m.get('created_at', 0), reverse=True)
+
+
+def get_profile_file(profile_id: str) -> Optional[tuple]:
+    """(파일 경로, 모드) 반환 - 없으면 None"""
+    try:
+        uuid.UUID(profile_id)
+    except ValueError:
+        return None
+    try:
+        with open(_profile_path(profile_id, 'json'), encoding='utf-8') as f:
+            mode = json.load(f).get('mode')
+    except (OSError, ValueError):
+        return None
+    path = _profile_path(profile_id, PROFILE_EXTENSIONS.get(mode, ''))
+    return (path, mode) if mode in PROFILE_EXTENSIONS and os.path.exists(path) else None
+
+
+def _requested_mode(scope) -> Optional[str]:
+    """프로파일링 요청이면 모드 반환 (관리자 토큰 확인 포함)"""
+    mode = token = None
+    for name, value in scope.get("headers", ()):
+        if name == b"x-profile":
+            mode = value.decode('latin-1').strip().lower()
+        elif name == b"x-admin-token":
+            token = value.decode('latin-1')
+    if mode is None and b"_profile=" in scope.get("query_string", b""):
+        query = parse_qs(scope["query_string"].decode('latin-1'))
+        mode = query.get("_profile", [""])[0].strip().lower()
+    if mode is None:
+        return None
+    if mode in ("1", "true", ""):
+        mode = "sample"
+    if mode not in PROFILE_MODES or not is_admin_token(token):
+        return None
+    return mode
+
+
+class ProfilingMiddleware:
+    """관리자가 요청한 단일 요청을 프로파일링하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        mode = _requested_mode(scope)
+        if mode is None:
+            return await self.app(scope, receive, send)
+
+        profile_id = str(uuid.uuid4())
+        status = {"code": 500}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile_id.encode('ascii'))]
+            await send(message)
+
+        start = time.perf_counter()
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profiler.disable()
+            write_profile = profiler.dump_stats
+        else:
+            sampler = _StackSampler(PROFILE_SAMPLE_INTERVAL)
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                sampler.stop()
+
+            def write_profile(path):
+                with open(path, 'w', encoding='utf-8') as f:
+                    for stack, count in sampler.stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+
+        meta = {
+            "id": profile_id,
+            "mode": mode,
+            "method": scope.get("method", ""),
+            "path": scope.get("path", ""),
+            "status": status["code"],
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "created_at": time.time(),
+        }
+        if mode == "sample":
+            meta["samples"] = sampler.samples
+        _save(profile_id, mode, meta, write_profile)
@@ -0,0 +1,164 @@
+# Backend/services/quiz_bank.py
+"""퀴즈 문제 은행 서비스 - 은행에서 즉시 출제하고 부족한 풀은 백그라운드에서 GPT로 보충 (배치 백엔드가 켜져 있으면 배치로)"""
+
+import threading
+from typing import Dict, List, Optional
+
+from services.store import store
+from services.gpt_service import call_gpt, extract_json
+from services.quota import QUIZ_LLM_COST, charge_user_limit
+from services import batch_llm
+from utils.logger import log_info, log_error, log_success
+
+# 풀 크기가 이 값보다 작으면 백그라운드 보충
+QUIZ_POOL_LOW_WATERMARK = 40
+
+# GPT를 쓸 수 없을 때 출제하는 기본 퀴즈 (문제 은행의 별도 풀에 저장해 id를 부여)
+DEFAULT_QUIZ_POOL = ("__default__", "")
+DEFAULT_QUIZZES = [
+    {"id": 1, "type": "OX", "question": "컴퓨터는 0과 1로 모든 연산을 처리한다.", "options": [], "answerKey": "O", "explanation": "컴퓨터는 이진법(Binary)을 사용하여 0과 1만으로 모든 데이터를 표현하고 연산합니다. 이를 디지털 연산이라고 합니다."},
+    {"id": 2, "type": "OX", "question": "인터넷과 월드와이드웹(WWW)은 같은 의미이다.", "options": [], "answerKey": "X", "explanation": "인터넷은 컴퓨터들을 연결하는 네트워크 인프라이고, WWW는 인터넷 위에서 동작하는 서비스 중 하나입니다. WWW는 인터넷의 일부일 뿐입니다."},
+    {"id": 3, "type": "OX", "question": "프로그래밍 언어는 기계어만 존재한다.", "options": [], "answerKey": "X", "explanation": "프로그래밍 언어는 기계어 외에도 어셈블리어(저급 언어), Python/Java/C++ 같은 고급 언어 등 다양하게 존재합니다."},
+    {"id": 4, "type": "OX", "question": "RAM은 전원이 꺼지면 데이터가 사라지는 휘발성 메모리이다.", "options": [], "answerKey": "O", "explanation": "RAM(Random Access Memory)은 휘발성 메모리로, 전원이 꺼지면 저장된 데이터가 모두 사라집니다. 반면 SSD나 HDD는 비휘발성입니다."},
+    {"id": 5, "type": "OX", "question": "HTML은 프로그래밍 언어이다.", "options": [], "answerKey": "X", "explanation": "HTML은 HyperText Markup Language의 약자로, 웹 페이지의 구조를 정의하는 '마크업 언어'입니다. 프로그래밍 언어처럼 로직을 처리하지 않습니다."},
+    {"id": 6, "type": "OX", "question": "1바이트(Byte)는 8비트(bit)이다.", "options": [], "answerKey": "O", "explanation": "1바이트는 8비트로 구성됩니다. 비트는 0 또는 1의 최소 정보 단위이고, 바이트는 컴퓨터에서 문자 하나를 표현하는 기본 단위입니다."},
+    {"id": 7, "type": "OX", "question": "CPU는 컴퓨터의 장기 저장 장치이다.", "options": [], "answerKey": "X", "explanation": "CPU(Central Processing Unit)는 컴퓨터의 '두뇌'로, 연산과 제어를 담당합니다. 장기 저장은 HDD, SSD 같은 저장 장치가 담당합니다."},
+    {"id": 8, "type": "OX", "question": "운영체제(OS)는 하드웨어와 소프트웨어 사이를 중재하는 시스템 소프트웨어이다.", "options": [], "answerKey": "O", "explanation": "운영체제는 컴퓨터 하드웨어를 관리하고, 응용 프로그램이 하드웨어를 사용할 수 있도록 인터페이스를 제공하는 시스템 소프트웨어입니다."},
+    {"id": 9, "type": "OX", "question": "IP 주소는 인터넷에서 컴퓨터를 식별하는 고유한 주소이다.", "options": [], "answerKey": "O", "explanation": "IP(Internet Protocol) 주소는 네트워크상에서 각 장치를 식별하기 위한 고유한 숫자 주소입니다. IPv4는 32비트, IPv6는 128비트를 사용합니다."},
+    {"id": 10, "type": "OX", "question": "클라우드 컴퓨팅은 반드시 인터넷 연결 없이도 사용할 수 있다.", "options": [], "answerKey": "X", "explanation": "클라우드 컴퓨팅은 인터넷을 통해 원격 서버의 리소스를 사용하는 기술이므로, 기본적으로 인터넷 연결이 필요합니다."},
+]
+
+_refill_lock = threading.Lock()
+_refilling = set()
+_defaults_banked = False
+
+
+def build_quiz_prompt(skill: str, level: str) -> str:
+    """O/X 퀴즈 생성 프롬프트"""
+    return f"""
+'{skill}' 분야의 {level} 수준에 맞는 O/X 퀴즈 10개를 정성스럽게 만들어드리겠습니다.
+
+📌 **중요 규칙**:
+1. 각 문제는 반드시 O(참) 또는 X(거짓)로 명확히 답할 수 있어야 합니다.
+2. '{skill}' 분야의 핵심 개념을 다루는 문제를 출제해주세요.
+3. {level} 수준에 맞는 난이도로 조절해주세요.
+4. 각 문제에는 반드시 "왜 정답인지/오답인지" 설명하는 explanation을 포함해주세요.
+
+⚠️ **필수 출력 형식** (JSON):
+```json
+{{
+  "quizzes": [
+    {{
+      "id": 1,
+      "type": "OX",
+      "question": "질문 내용",
+      "options": [],
+      "answerKey": "O",
+      "explanation": "이 문제의 정답이 O인 이유는... (상세 해설)"
+    }},
+    {{
+      "id": 2,
+      "type": "OX",
+      "question": "질문 내용",
+      "options": [],
+      "answerKey": "X",
+      "explanation": "이 문제의 정답이 X인 이유는... (상세 해설)"
+    }}
+  ]
+}}
+```
+
+반드시 10개의 O/X 퀴즈를 만들어주세요.
+answerKey는 반드시 "O" 또는 "X" 중 하나여야 합니다.
+explanation은 학습에 도움이 되도록 상세하게 작성해주세요.
+"""
+
+
+def generate_quizzes(skill: str, level: str, priority: str = "background", user_id: Optional[str] = None) -> List[Dict]:
+    """GPT로 O/X 퀴즈 생성 (answerKey가 O/X인 문제만)"""
+    response = call_gpt(build_quiz_prompt(skill, level), use_search=False, priority=priority, user_id=user_id)
+    return parse_quizzes(response)
+
+
+def parse_quizzes(response: str) -> List[Dict]:
+    """GPT 응답에서 O/X 퀴즈 추출"""
+    data = extract_json(response)
+    if not data or not isinstance(data.get('quizzes'), list):
+        return []
+    return [
+        q for q in data['quizzes']
+        if isinstance(q, dict) and q.get('question') and str(q.get('answerKey', '')).strip().upper() in ('O', 'X')
+    ]
+
+
+def refill_pool(skill: str, level: str, priority: str = "background", user_id: Optional[str] = None) -> int:
+    """GPT로 문제를 생성해 은행에 추가 - 새로 추가된 개수 반환"""
+    quizzes = generate_quizzes(skill, level, priority, user_id)
+    if not quizzes:
+        return 0
+    added = store.add_quiz_bank_items(skill, level, quizzes)
+    log_success(f"문제 은행 보충: {skill}/{level} +{added}개")
+    return added
+
+
+def _apply_batch_result(context: Dict, response: str):
+    quizzes = parse_quizzes(response)
+    if quizzes:
+        added = store.add_quiz_bank_items(context['skill'], context['level'], quizzes)
+        log_success(f"문제 은행 보충 (배치): {context['skill']}/{context['level']} +{added}개")
+
+
+batch_llm.register_handler("quiz_refill", _apply_batch_result)
+
+
+def _refill_worker(key: tuple):
+    try:
+        refill_pool(*key)
+    except Exception as e:
+        log_error(f"문제 은행 보충 실패 ({key[0]}/{key[1]}): {e}")
+    finally:
+        with _refill_lock:
+            _refilling.discard(key)
+
+
+def request_refill(skill: str, level: str) -> bool:
+    """백그라운드 보충 요청 (같은 풀에 대해 동시에 하나만 실행)"""
+    key = store.skill_level_key(skill, level)
+    if batch_llm.enabled():
+        return batch_llm.enqueue("quiz_refill", build_quiz_prompt(*key), context={"skill": key[0], "level": key[1]},
+                                 dedupe_key=f"quiz:{key[0]}:{key[1]}")
+    with _refill_lock:
+        if key in _refilling:
+            return False
+        _refilling.add(key)
+    threading.Thread(target=_refill_worker, args=(key,), daemon=True, name=f"quiz-refill-{key[0]}").start()
+    return True
+
+
+def get_quiz_set(skill: str, level: str, limit: int, user_id: Optional[str] = None) -> List[Dict]:
+    """문제 은행에서 퀴즈 세트 출제 - 풀이 비어 있을 때만 동기 생성"""
+    quizzes = store.sample_quiz_bank(skill, level, limit)
+
+    if len(quizzes) < limit:
+        # 처음 요청된 풀: 한 번은 기다려서 채움
+        log_info(f"문제 은행 부족 ({skill}/{level}: {len(quizzes)}개), GPT로 생성")
+        if user_id:
+            # 문제 은행에서 바로 출제할 때가 아니라 GPT로 생성할 때만 한도 차감
+            charge_user_limit(user_id, QUIZ_LLM_COST)
+        if refill_pool(skill, level, priority="interactive", user_id=user_id):
+            quizzes = store.sample_quiz_bank(skill, level, limit)
+
+    pool_size = store.count_quiz_bank(skill, level)
+    if 0 < pool_size < QUIZ_POOL_LOW_WATERMARK:
+        request_refill(skill, level)
+
+    return quizzes
+
+
+def get_default_quiz_set(limit: int) -> List[Dict]:
+    """기본 퀴즈 출제 (처음 호출 시 문제 은행에 저장)"""
+    global _defaults_banked
+    if not _defaults_banked:
+        store.add_quiz_bank_items(*DEFAULT_QUIZ_POOL, DEFAULT_QUIZZES)
+        _defaults_banked = True
+    return store.sample_quiz_bank(*DEFAULT_QUIZ_POOL, limit)
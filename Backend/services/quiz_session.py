@@ -0,0 +1,75 @@
+# Backend/services/quiz_session.py
+"""서명된 퀴즈 세션 토큰 - 정답 키를 HMAC 서명 토큰에 담아 서버 상태 없이 채점"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from services.store import SECRET_KEY
+
+QUIZ_SESSION_SECRET = os.getenv("QUIZ_SESSION_SECRET", SECRET_KEY).encode('utf-8')
+QUIZ_SESSION_TTL_SECONDS = int(os.getenv("QUIZ_SESSION_TTL_SECONDS", str(6 * 60 * 60)))
+QUIZ_SESSION_HEADER = "X-Quiz-Session"
+
+# 서명 길이 (바이트) - 128비트
+_SIGNATURE_BYTES = 16
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _sign(body: str) -> str:
+    # 클라이언트가 보낸 토큰은 ASCII가 아닐 수 있으므로 utf-8 (발급한 본문은 base64라 결과 동일)
+    digest = hmac.new(QUIZ_SESSION_SECRET, body.encode('utf-8'), hashlib.sha256).digest()
+    return _b64encode(digest[:_SIGNATURE_BYTES])
+
+
+def issue_session(user_id: str, skill: str, level: str, quizzes: List[Dict]) -> str:
+    """출제한 퀴즈의 id/정답 키를 담은 서명 토큰 발급"""
+    payload = {
+        "u": user_id,
+        "s": skill,
+        "l": level,
+        "q": [q['id'] for q in quizzes],
+        "k": ''.join(str(q.get('answerKey', '')).strip().upper()[:1] or '-' for q in quizzes),
+        "e": int(time.time()) + QUIZ_SESSION_TTL_SECONDS,
+    }
+    body = _b64encode(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return f"{body}.{_sign(body)}"
+
+
+def verify_session(token: str, user_id: str) -> Optional[Dict]:
+    """토큰 검증 후 {'answers': {id: key}, 'skill', 'level'} 반환 (위조/만료/다른 사용자면 None)"""
+    if not token or '.' not in token:
+        return None
+
+    body, signature = token.rsplit('.', 1)
+    try:
+        # 위조 토큰에 어떤 문자가 들어와도 예외 없이 None이 되도록 bytes로 비교
+        if not hmac.compare_digest(signature.encode('utf-8'), _sign(body).encode('ascii')):
+            return None
+        payload = json.loads(_b64decode(body))
+        if not isinstance(payload, dict):
+            return None
+    except (ValueError, UnicodeError):
+        return None
+
+    if payload.get('u') != user_id or payload.get('e', 0) < time.time():
+        return None
+    if len(payload.get('q', [])) != len(payload.get('k', '')):
+        return None
+
+    return {
+        "answers": {quiz_id: key for quiz_id, key in zip(payload['q'], payload['k'])},
+        "skill": payload.get('s', ''),
+        "level": payload.get('l', ''),
+    }
@@ -0,0 +1,33 @@
+# Backend/services/quota.py
+"""
+요청 한도 차감 - 초과하면 429 + Retry-After
+
+라우트 의존성(routers/auth.py)뿐 아니라 서비스 안에서도 호출한다.
+LLM 한도는 스냅샷/문제 은행에서 바로 응답할 때가 아니라 실제로 GPT를 부르는 경로에서만 차감하기 위함.
+"""
+
+from fastapi import HTTPException
+
+from services.store import store
+from utils.logger import log_error
+
+# LLM 한도 비용 - 추천 생성(검색 모델), 퀴즈 세트 생성, 계획 생성
+RECOMMEND_LLM_COST = 5
+QUIZ_LLM_COST = 2
+PLAN_LLM_COST = 5
+
+
+def enforce_limit(policy: str, key: str, cost: int):
+    allowed, _, retry_after = store.rate_limits.hit(policy, key, cost)
+    if not allowed:
+        log_error(f"요청 한도 초과: {policy} ({key[:8]}...)")
+        raise HTTPException(
+            status_code=429,
+            detail=f"요청이 너무 많습니다. {retry_after}초 후 다시 시도해주세요.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+def charge_user_limit(user_id: str, cost: int, policy: str = "llm"):
+    """사용자별 요청 한도 차감 - 실제로 GPT를 부르기 직전처럼 실행 여부를 안에서 알 때 직접 호출"""
+    enforce_limit(policy, user_id, cost)
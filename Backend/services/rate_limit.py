@@ -0,0 +1,89 @@
+# Backend/services/rate_limit.py
+"""
+SQLite 기반 슬라이딩 윈도우 요청 한도 - 모든 워커가 같은 DB를 보므로 워커 수와 관계없이 한도 유지
+
+버킷(정책:키)별로 고정 윈도우 사용량을 기록하고, 직전 윈도우 사용량을 지난 비율만큼 줄여 더한 값을
+현재 사용량으로 본다 (sliding window counter). 요청마다 비용(cost)을 지정할 수 있어서
+GPT를 여러 번 부르는 엔드포인트는 더 많이 차감된다.
+
+정책 (RATE_LIMITS): 이름 → (윈도우당 한도, 윈도우 초)
+- signup / login: IP별 (인증 전)
+- llm: 사용자별 GPT/검색 비용 - 한 사용자가 LLM 처리량을 독점하지 않도록
+"""
+
+import math
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Tuple
+
+RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "true").lower() == "true"
+
+RATE_LIMITS: Dict[str, Tuple[int, int]] = {
+    "signup": (int(os.getenv("SIGNUP_LIMIT_PER_MINUTE", "5")), 60),
+    "login": (int(os.getenv("LOGIN_LIMIT_PER_MINUTE", "10")), 60),
+    "llm": (int(os.getenv("LLM_QUOTA_PER_HOUR", "100")), 60 * 60),
+}
+
+# 만료된 윈도우 정리 주기 (hit 횟수)
+_PRUNE_EVERY = 500
+
+
+def _retry_after(limit: int, window: int, cost: int, prev: float, curr: float, fraction: float) -> int:
+    """한도 초과 시 cost만큼 쓸 수 있게 될 때까지 남은 초"""
+    if cost > limit:
+        return window
+    room = limit - cost
+    if curr > room:
+        # 이번 윈도우로는 불가능 - 다음 윈도우에서 이번 사용량이 줄어들 때까지
+        wait = (1 - fraction) + (1 - room / curr)
+    else:
+        # 직전 윈도우 사용량이 충분히 줄어들 때까지
+        wait = (1 - (room - curr) / prev) - fraction if prev else 0
+    return max(1, math.ceil(wait * window))
+
+
+class SlidingWindowLimiter:
+    """여러 워커가 공유하는 요청 한도"""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection]):
+        self._connect = connect
+        self._hits = 0
+
+    def hit(self, policy: str, key: str, cost: int = 1) -> Tuple[bool, int, int]:
+        """요청 1건 차감 시도 - (허용 여부, 남은 양, 재시도까지 초)"""
+        limit, window = RATE_LIMITS[policy]
+        if not RATELIMIT_ENABLED:
+            return True, limit, 0
+
+        now = time.time()
+        current = int(now // window)
+        fraction = now / window - current
+        bucket = f"{policy}:{key}"
+
+        conn = self._connect()
+        try:
+            # 읽고 더하는 사이에 다른 워커가 끼어들지 않도록 쓰기 잠금
+            conn.execute("BEGIN IMMEDIATE")
+            used = dict(conn.execute(
+                "SELECT window_start, used FROM rate_limits WHERE bucket = ? AND window_start >= ?",
+                (bucket, current - 1)
+            ).fetchall())
+            prev, curr = used.get(current - 1, 0), used.get(current, 0)
+            estimate = prev * (1 - fraction) + curr
+
+            if estimate + cost > limit:
+                conn.rollback()
+                return False, max(0, int(limit - estimate)), _retry_after(limit, window, cost, prev, curr, fraction)
+
+            conn.execute('''
+                INSERT INTO rate_limits (bucket, window_start, used, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(bucket, window_start) DO UPDATE SET used = used + excluded.used
+            ''', (bucket, current, cost, (current + 2) * window))
+            self._hits += 1
+            if self._hits % _PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+            conn.commit()
+            return True, max(0, int(limit - estimate - cost)), 0
+        finally:
+            conn.close()
@@ -0,0 +1,381 @@
+# Backend/services/recommend_cache.py
+"""
+강좌 추천 스냅샷 캐시 - 인기 skill/level 추천을 주기적으로 미리 생성 (stale-while-revalidate)
+
+퀴즈 채점 직후에는 결과 레벨의 추천을 미리 생성해서(prefetch_for_user) 추천 화면의 검색 모델 대기를 결과 화면 뒤로 숨긴다.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.store import store
+from services.gpt_service import call_gpt, extract_json
+from services.llm_admission import PRIORITIES, AdmissionHandle, LLMBusyError, admission
+from services.quota import RECOMMEND_LLM_COST, charge_user_limit
+from services import batch_llm
+from utils.logger import log_info, log_error, log_success
+
+# 스냅샷이 이 시간보다 오래되면 응답은 그대로 주고 백그라운드에서 갱신
+RECOMMEND_FRESH_SECONDS = int(os.getenv("RECOMMEND_FRESH_SECONDS", str(6 * 60 * 60)))
+# 미리 생성할 인기 skill/level 개수
+RECOMMEND_PREWARM_TOP_N = int(os.getenv("RECOMMEND_PREWARM_TOP_N", "20"))
+# 인기 집계 대상 기간
+RECOMMEND_PREWARM_WINDOW_DAYS = 7
+# 갱신 주기
+RECOMMEND_REFRESH_INTERVAL_SECONDS = int(os.getenv("RECOMMEND_REFRESH_INTERVAL_SECONDS", str(30 * 60)))
+RECOMMEND_PREWARM_ENABLED = os.getenv("RECOMMEND_PREWARM_ENABLED", "true").lower() == "true"
+# 서버 시작 직후 첫 요청들과 경쟁하지 않도록 첫 미리 생성은 잠시 뒤에
+RECOMMEND_PREWARM_START_DELAY_SECONDS = int(os.getenv("RECOMMEND_PREWARM_START_DELAY_SECONDS", "30"))
+# 채점 후 미리 생성 - 사용자별 슬롯 유지 시간 (다른 워커의 추천 요청이 이 시간까지 결과를 기다림)
+RECOMMEND_PREFETCH_ENABLED = os.getenv("RECOMMEND_PREFETCH_ENABLED", "true").lower() == "true"
+RECOMMEND_PREFETCH_TTL_SECONDS = int(os.getenv("RECOMMEND_PREFETCH_TTL_SECONDS", "120"))
+_PREFETCH_NAMESPACE = "recommend_prefetch"
+_PREFETCH_POLL_SECONDS = 0.5
+
+_LEASE_NAME = "recommend_prewarm"
+_worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_refresh_lock = threading.Lock()
+_refreshing = set()
+# 이 워커에서 생성 중인 skill/level → (결과 Future, 입장 제어 핸들) (같은 추천을 동시에 두 번 만들지 않도록)
+_inflight: Dict[tuple, Tuple[Future, AdmissionHandle]] = {}
+_inflight_lock = threading.Lock()
+_stop_event = threading.Event()
+_refresher_thread: Optional[threading.Thread] = None
+
+
+def build_recommend_prompt(skill: str, level: str) -> str:
+    """강좌 추천 프롬프트 - 상세한 커리큘럼 정보 요청"""
+    return f"""[시스템 지시] 당신은 교육 콘텐츠 추천 API입니다. 반드시 JSON만 출력하세요. 질문, 확인, 설명 없이 오직 JSON 데이터만 반환합니다.
+
+'{skill}' 분야 {level} 수준 학습자를 위한 강좌/도서 6개를 추천하세요.
+
+검색 플랫폼: 인프런, 유데미(Udemy), 부스트코스, 코세라(Coursera), 교보문고, 예스24
+
+⚠️ 절대 규칙:
+1. JSON 외의 텍스트 출력 금지 (질문, 설명, 확인 요청 금지)
+2. 찾을 수 없다는 응답 금지 - 반드시 6개 추천
+3. example.com URL 사용 금지
+4. 숫자에 쉼표 금지 (1234 형식)
+
+📚 커리큘럼 필수 요구사항 (매우 중요!):
+- 각 강좌의 전체 목차/커리큘럼을 상세히 포함
+- 섹션명과 각 섹션별 강의 목록 모두 포함
+- 각 강의가 무엇을 다루는지 간단한 설명 포함
+- 최소 15개 이상의 강의 항목 포함 (실제 강좌 구조 반영)
+
+필수 JSON 형식:
+```json
+{{
+  "recommendations": [
+    {{
+      "id": "unique_id_1",
+      "title": "강좌/도서 제목",
+      "provider": "플랫폼명",
+      "instructor": "강사/저자명",
+      "type": "course",
+      "weeks": 4,
+      "free": false,
+      "rating": 4.5,
+      "students": "1234명",
+      "total_lectures": 25,
+      "total_duration": "총 15시간 30분",
+      "summary": "상세 설명 2-3문장",
+      "reason": "{level} 학습자가 {skill} 기초를 다지기에 적합합니다",
+      "curriculum": [
+        {{
+          "section": "섹션 1: 입문",
+          "lectures": [
+            {{"title": "1강: 오리엔테이션", "duration": "10분", "description": "강좌 소개 및 학습 방법 안내"}},
+            {{"title": "2강: 개발환경 설정", "duration": "25분", "description": "필요한 도구 설치 및 환경 구성"}},
+            {{"title": "3강: 첫 번째 코드 작성", "duration": "30분", "description": "Hello World부터 시작하기"}}
+          ]
+        }},
+        {{
+          "section": "섹션 2: 기초 문법",
+          "lectures": [
+            {{"title": "4강: 변수와 자료형", "duration": "40분", "description": "데이터를 저장하는 방법"}},
+            {{"title": "5강: 연산자", "duration": "35분", "description": "다양한 연산 방법 학습"}}
+          ]
+        }}
+      ],
+      "link": "https://www.inflearn.com/course/실제강좌주소",
+      "price": "55000원",
+      "level_detail": "{level} 수준"
+    }}
+  ]
+}}
+```
+
+지금 바로 JSON을 출력하세요:"""
+
+
+def fetch_recommendations(skill: str, level: str, priority: str = "background",
+                          user_id: Optional[str] = None,
+                          handle: Optional[AdmissionHandle] = None) -> Optional[List[Dict]]:
+    """검색 모델로 강좌 추천 생성 (실패 시 None)"""
+    response = call_gpt(build_recommend_prompt(skill, level), use_search=True, priority=priority, user_id=user_id,
+                        handle=handle)
+    return parse_recommendations(response)
+
+
+def parse_recommendations(response: str) -> Optional[List[Dict]]:
+    """검색 모델 응답에서 추천 강좌 목록 추출 (실패 시 None)"""
+    data = extract_json(response)
+
+    if data and 'error' not in data:
+        # recommendations 또는 courses 키 모두 지원
+        courses = data.get('recommendations', data.get('courses', []))
+        # example.com 필터링
+        valid_courses = [c for c in courses if 'example' not in c.get('link', '').lower()]
+        if valid_courses:
+            return valid_courses[:6]
+    return None
+
+
+def _generate(skill: str, level: str, priority: str, user_id: Optional[str] = None,
+              on_admit: Optional[Callable[[], None]] = None) -> Optional[List[Dict]]:
+    """추천 생성 후 스냅샷 저장 - 같은 skill/level을 이 워커에서 이미 생성 중이면 그 결과를 기다림
+
+    기다리는 쪽의 우선순위가 더 높으면(예: 미리 생성(batch)에 붙은 추천 화면 요청) 아직 대기열에 있는
+    생성을 그 우선순위로 올려서, 사용자 요청이 batch 대기 한도(LLM_BATCH_WAIT_SECONDS)만큼 묶이지 않도록 한다.
+    """
+    key = store.skill_level_key(skill, level)
+    with _inflight_lock:
+        entry = _inflight.get(key)
+        owner = entry is None
+        if owner:
+            entry = _inflight[key] = (Future(), AdmissionHandle(priority, on_admit))
+    future, handle = entry
+
+    if not owner:
+        upgraded = PRIORITIES[priority][0] < PRIORITIES[handle.priority][0] and admission.upgrade(handle, priority)
+        if upgraded:
+            log_info(f"진행 중인 추천 생성 우선순위 상향: {key[0]}/{key[1]} → {priority}")
+        try:
+            return future.result()
+        except LLMBusyError:
+            if upgraded:
+                # 이미 내 우선순위로 기다렸다가 거절됨 - 다시 줄 서지 않음
+                raise
+        except Exception:
+            # 먼저 시작한 쪽(예: 대기열에서 거절된 background 갱신)이 실패 - 내 우선순위로 직접 생성
+            pass
+        handle = None
+
+    try:
+        if priority == "interactive" and user_id:
+            # 사용자 요청으로 검색 모델을 직접 부를 때만 한도 차감 (스냅샷/미리 생성 결과는 차감 없음)
+            charge_user_limit(user_id, RECOMMEND_LLM_COST)
+        courses = fetch_recommendations(skill, level, priority, user_id, handle)
+        if courses:
+            store.save_recommend_snapshot(skill, level, courses)
+    except BaseException as e:
+        if owner:
+            future.set_exception(e)
+        raise
+    else:
+        if owner:
+            future.set_result(courses)
+        return courses
+    finally:
+        if owner:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+
+
+def _is_inflight(skill: str, level: str) -> bool:
+    with _inflight_lock:
+        return store.skill_level_key(skill, level) in _inflight
+
+
+def refresh_snapshot(skill: str, level: str) -> bool:
+    """추천을 다시 생성해 스냅샷 저장"""
+    courses = _generate(skill, level, "background")
+    if not courses:
+        return False
+    log_success(f"추천 스냅샷 갱신: {skill}/{level}")
+    return True
+
+
+def _enqueue_refresh(skill: str, level: str) -> bool:
+    """추천 갱신을 배치 대기열에 추가 (같은 skill/level 요청이 처리 중이면 False)"""
+    return batch_llm.enqueue("recommend_refresh", build_recommend_prompt(skill, level), use_search=True,
+                             context={"skill": skill, "level": level}, dedupe_key=f"recommend:{skill}:{level}")
+
+
+def _apply_batch_result(context: Dict, response: str):
+    courses = parse_recommendations(response)
+    if courses:
+        store.save_recommend_snapshot(context['skill'], context['level'], courses)
+        log_success(f"추천 스냅샷 갱신 (배치): {context['skill']}/{context['level']}")
+
+
+batch_llm.register_handler("recommend_refresh", _apply_batch_result)
+
+
+def _refresh_worker(key: tuple):
+    try:
+        refresh_snapshot(*key)
+    except Exception as e:
+        log_error(f"추천 스냅샷 갱신 실패 ({key[0]}/{key[1]}): {e}")
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+
+def request_refresh(skill: str, level: str) -> bool:
+    """백그라운드 갱신 요청 (같은 skill/level은 동시에 하나만) - 배치 백엔드가 켜져 있으면 배치로"""
+    key = store.skill_level_key(skill, level)
+    if batch_llm.enabled():
+        return _enqueue_refresh(*key)
+    with _refresh_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+    threading.Thread(target=_refresh_worker, args=(key,), daemon=True, name=f"recommend-refresh-{key[0]}").start()
+    return True
+
+
+def _is_stale(snapshot: Dict) -> bool:
+    return datetime.now() - snapshot['refreshed_at'] > timedelta(seconds=RECOMMEND_FRESH_SECONDS)
+
+
+def _mark_prefetch_admitted(user_id: str):
+    """미리 생성이 슬롯을 받았음을 다른 워커에 알림 (그 전까지는 다른 워커가 오래 기다리지 않음)"""
+    slot = store.shared.get(_PREFETCH_NAMESPACE, user_id)
+    if slot:
+        store.shared.set(_PREFETCH_NAMESPACE, user_id, {**slot, "admitted": True})
+
+
+def _prefetch_worker(user_id: str, skill: str, level: str):
+    try:
+        _generate(skill, level, "batch", user_id, on_admit=lambda: _mark_prefetch_admitted(user_id))
+    except Exception as e:
+        log_error(f"추천 미리 생성 실패 ({skill}/{level}): {e}")
+    finally:
+        store.shared.delete(_PREFETCH_NAMESPACE, user_id)
+
+
+def prefetch_for_user(user_id: str, skill: str, level: str) -> bool:
+    """퀴즈 채점 직후 결과 레벨의 추천을 백그라운드에서 생성 - 새로 시작했으면 True
+
+    스냅샷이 이미 있으면 추천 화면이 바로 응답하므로 시작하지 않음 (오래됐으면 갱신만 요청)
+    """
+    if not RECOMMEND_PREFETCH_ENABLED:
+        return False
+    snapshot = store.get_recommend_snapshot(skill, level)
+    if snapshot:
+        if _is_stale(snapshot):
+            request_refresh(skill, level)
+        return False
+
+    skill_key, level_key = store.skill_level_key(skill, level)
+    store.shared.set(_PREFETCH_NAMESPACE, user_id, {
+        "skill": skill_key, "level": level_key, "admitted": False,
+        "expires_at": time.time() + RECOMMEND_PREFETCH_TTL_SECONDS
+    })
+    threading.Thread(target=_prefetch_worker, args=(user_id, skill, level), daemon=True,
+                     name=f"recommend-prefetch-{skill_key}").start()
+    return True
+
+
+def _wait_for_prefetch(user_id: str, skill: str, level: str) -> Optional[List[Dict]]:
+    """다른 워커에서 이 사용자를 위해 생성 중인 추천이 있으면 스냅샷이 저장될 때까지 대기 (없거나 실패하면 None)
+
+    다른 워커의 생성은 우선순위를 올릴 수 없으므로, 그 생성이 interactive 대기 한도 안에 슬롯을 받지 못하면
+    기다리지 않고 None (호출한 쪽이 interactive 우선순위로 직접 생성)
+    """
+    slot = store.shared.get(_PREFETCH_NAMESPACE, user_id)
+    if not slot or (slot['skill'], slot['level']) != store.skill_level_key(skill, level):
+        return None
+    admit_deadline = time.time() + PRIORITIES["interactive"][1]
+    while time.time() < slot['expires_at']:
+        snapshot = store.get_recommend_snapshot(skill, level)
+        if snapshot:
+            return snapshot['courses']
+        if store.shared.get(_PREFETCH_NAMESPACE, user_id) is None:
+            # 슬롯이 지워짐 - 완료 직후일 수 있으므로 한 번 더 확인
+            snapshot = store.get_recommend_snapshot(skill, level)
+            return snapshot['courses'] if snapshot else None
+        if time.time() >= admit_deadline:
+            slot = store.shared.get(_PREFETCH_NAMESPACE, user_id) or slot
+            if not slot.get('admitted'):
+                log_info(f"다른 워커의 추천 미리 생성이 대기열에 있음 - 직접 생성: {skill}/{level}")
+                return None
+        time.sleep(_PREFETCH_POLL_SECONDS)
+    return None
+
+
+def get_recommendations(skill: str, level: str, user_id: Optional[str] = None) -> Optional[List[Dict]]:
+    """
+    추천 조회 - 스냅샷이 있으면 즉시 반환하고, 오래된 스냅샷은 백그라운드에서 갱신
+    스냅샷이 없으면 채점 후 시작된 미리 생성(같은 워커면 진행 중인 생성, 다른 워커면 사용자 슬롯)을 기다리고,
+    그것도 없을 때만 검색 모델을 직접 호출
+    """
+    store.record_recommend_request(skill, level)
+
+    snapshot = store.get_recommend_snapshot(skill, level)
+    if snapshot:
+        if _is_stale(snapshot):
+            request_refresh(skill, level)
+        return snapshot['courses']
+
+    if user_id and not _is_inflight(skill, level):
+        courses = _wait_for_prefetch(user_id, skill, level)
+        if courses:
+            return courses
+    return _generate(skill, level, "interactive", user_id)
+
+
+def prewarm_popular() -> int:
+    """인기 skill/level 중 스냅샷이 없거나 오래된 것 갱신 - 갱신한(배치면 대기열에 추가한) 개수 반환"""
+    since = datetime.now() - timedelta(days=RECOMMEND_PREWARM_WINDOW_DAYS)
+    refreshed = 0
+    for skill, level in store.get_popular_recommend_keys(RECOMMEND_PREWARM_TOP_N, since):
+        if _stop_event.is_set():
+            break
+        snapshot = store.get_recommend_snapshot(skill, level)
+        if snapshot and not _is_stale(snapshot):
+            continue
+        try:
+            if batch_llm.enabled():
+                if _enqueue_refresh(skill, level):
+                    refreshed += 1
+            elif refresh_snapshot(skill, level):
+                refreshed += 1
+        except Exception as e:
+            log_error(f"추천 미리 생성 실패 ({skill}/{level}): {e}")
+    return refreshed
+
+
+def _refresher_loop():
+    if _stop_event.wait(RECOMMEND_PREWARM_START_DELAY_SECONDS):
+        return
+    while not _stop_event.is_set():
+        # 여러 워커 중 리스를 가진 하나만 실행
+        if store.try_acquire_lease(_LEASE_NAME, _worker_id, RECOMMEND_REFRESH_INTERVAL_SECONDS):
+            refreshed = prewarm_popular()
+            if refreshed:
+                log_info(f"인기 추천 {refreshed}개 미리 생성 완료")
+        _stop_event.wait(RECOMMEND_REFRESH_INTERVAL_SECONDS)
+
+
+def start_refresher():
+    """주기적 추천 미리 생성 스레드 시작"""
+    global _refresher_thread
+    if not RECOMMEND_PREWARM_ENABLED or (_refresher_thread and _refresher_thread.is_alive()):
+        return
+    _stop_event.clear()
+    _refresher_thread = threading.Thread(target=_refresher_loop, daemon=True, name="recommend-prewarm")
+    _refresher_thread.start()
+
+
+def stop_refresher():
+    """추천 미리 생성 스레드 종료"""
+    _stop_event.set()
@@ -0,0 +1,199 @@
+# Backend/services/review_jobs.py
+"""
+어제 복습 자료 미리 계산 - 자정이 지나면 "어제 완료한 태스크"는 더 바뀌지 않으므로 사용자별로 한 번 계산해 저장
+
+- 자료: 태스크에 저장된 review_materials/related_materials 우선, 부족하면 유튜브/블로그 검색 결과
+- 결과는 review_snapshots에 (사용자, 날짜)별로 저장하고 GET /review/yesterday, GET /plans/yesterday_review는 한 행만 읽음
+- 스냅샷을 만든 뒤 그 날짜의 태스크를 바꾸거나 계획을 추가하면(plan_changes 기록) 다음 조회 때 그 사용자만 다시 계산
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from services.store import store
+from services.web_search import search_materials_for_topic
+from utils.logger import log_error, log_success
+
+# /review/yesterday 자료 개수
+REVIEW_MATERIALS_MAX = 5
+# 자정 후 이만큼 지나서 실행 (자정 직전 태스크 변경 반영)
+REVIEW_PRECOMPUTE_AFTER_MIDNIGHT_SECONDS = int(os.getenv("REVIEW_PRECOMPUTE_AFTER_MIDNIGHT_SECONDS", "300"))
+# 서버 시작 후 밀린 계산(오늘 실행 전에 꺼져 있었던 경우)까지 대기
+REVIEW_PRECOMPUTE_START_DELAY_SECONDS = int(os.getenv("REVIEW_PRECOMPUTE_START_DELAY_SECONDS", "60"))
+REVIEW_PRECOMPUTE_ENABLED = os.getenv("REVIEW_PRECOMPUTE_ENABLED", "true").lower() == "true"
+# 스냅샷 보관 일수
+REVIEW_SNAPSHOT_KEEP_DAYS = 7
+
+_LEASE_NAME = "review_precompute"
+_LEASE_SECONDS = 30 * 60
+_worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_stop_event = threading.Event()
+_scheduler_thread: Optional[threading.Thread] = None
+
+
+def _search_links(topics_str: str) -> List[Dict]:
+    """자료를 찾지 못했을 때의 검색 링크"""
+    search_query = topics_str.replace(' ', '+').replace(',', '')
+    return [
+        {"title": f"{topics_str} - 유튜브 검색", "type": "유튜브", "url": f"https://www.youtube.com/results?search_query={search_query}", "description": "유튜브에서 관련 영상을 검색합니다.", "duration": "-"},
+        {"title": f"{topics_str} - 네이버 블로그", "type": "블로그", "url": f"https://search.naver.com/search.naver?where=post&query={search_query}", "description": "네이버 블로그에서 관련 글을 검색합니다.", "duration": "-"},
+        {"title": f"{topics_str} - 구글 검색", "type": "기타", "url": f"https://www.google.com/search?q={search_query}+강의", "description": "구글에서 관련 강의를 검색합니다.", "duration": "-"},
+    ]
+
+
+def _collect_materials(tasks: List[Dict]) -> List[Dict]:
+    """완료한 태스크의 저장된 자료를 모으고, 모자라면 자료가 없는 태스크만 검색 (URL 중복 제거)"""
+    materials, seen = [], set()
+
+    def add(items: List[Dict]):
+        for item in items or []:
+            url = item.get('url', '')
+            if url and url not in seen and 'example' not in url.lower():
+                seen.add(url)
+                materials.append(item)
+
+    for task in tasks:
+        add(task.get('review_materials'))
+        add(task.get('related_materials'))
+
+    for task in tasks:
+        if len(materials) >= REVIEW_MATERIALS_MAX:
+            break
+        if task.get('review_materials') or task.get('related_materials'):
+            continue
+        try:
+            add(search_materials_for_topic(task['title'])['review_materials'])
+        except Exception as e:
+            log_error(f"복습 자료 검색 실패 ({task['title']}): {e}")
+
+    return materials[:REVIEW_MATERIALS_MAX]
+
+
+def build_review(tasks: Optional[List[Dict]]) -> Dict:
+    """GET /review/yesterday 응답 - 어제 완료한 태스크의 복습 자료 (tasks가 None이면 계획 없음)"""
+    if tasks is None:
+        return {"materials": [], "topics": [], "message": "아직 학습 계획이 없습니다."}
+
+    completed = [t for t in tasks if t.get('completed', False)]
+    if not completed:
+        return {"materials": [], "topics": [], "message": "어제 완료한 학습 항목이 없습니다."}
+
+    topics = [t['title'] for t in completed]
+    topics_str = ', '.join(topics)
+    materials = _collect_materials(completed)
+    if materials:
+        return {"materials": materials, "topics": topics, "message": f"'{topics_str}'에 대한 복습 자료입니다."}
+    return {"materials": _search_links(topics_str), "topics": topics, "message": f"'{topics_str}'에 대한 검색 링크입니다."}
+
+
+def build_yesterday_review(tasks: Optional[List[Dict]]) -> Dict:
+    """GET /plans/yesterday_review 응답 - 어제 첫 태스크 주제의 복습 자료 2개 (유튜브 1 + 블로그 1)"""
+    if not tasks:
+        return {"has_review": False, "materials": [], "yesterday_topic": ""}
+
+    topic = tasks[0].get('title', '')
+    for task in tasks:
+        if task.get('review_materials'):
+            return {"has_review": True, "materials": task['review_materials'][:2], "yesterday_topic": topic}
+
+    search_query = topic.replace(' ', '+')
+    return {
+        "has_review": True,
+        "materials": [
+            {"title": f"{topic} 복습 영상", "type": "유튜브", "url": f"https://www.youtube.com/results?search_query={search_query}+강의"},
+            {"title": f"{topic} 복습 글", "type": "블로그", "url": f"https://www.google.com/search?q={search_query}+블로그"}
+        ],
+        "yesterday_topic": topic
+    }
+
+
+def compute_review_snapshot(user_id: str, review_date: str) -> Tuple[Dict, Dict]:
+    """사용자의 review_date 복습 응답 두 가지를 계산해 저장 (그날 계획이 있을 때만) - (review, yesterday_review)"""
+    # 계획보다 먼저 읽어서, 계산 중에 태스크가 바뀌면 스냅샷이 곧바로 오래된 것으로 보이도록
+    version = store.get_data_version(user_id)
+    found = store.get_day_tasks_json(user_id, review_date)
+    if found is None:
+        tasks = None
+    else:
+        tasks = json.loads(found[1]) if found[1] else []
+
+    review = build_review(tasks)
+    yesterday_review = build_yesterday_review(tasks)
+    if found is not None:
+        # 계획이 없으면 응답이 고정이므로 저장하지 않음 (없는 user_id로 행이 쌓이지 않도록)
+        store.save_review_snapshot(user_id, review_date, version, review, yesterday_review)
+    return review, yesterday_review
+
+
+def get_review_json(user_id: str, kind: str) -> str:
+    """어제 복습 응답 JSON 텍스트 (kind: review / yesterday_review) - 스냅샷이 없거나 오래됐으면 지금 계산"""
+    review_date = (date.today() - timedelta(days=1)).isoformat()
+    cached = store.get_review_snapshot(user_id, review_date, kind)
+    if cached is not None:
+        return cached
+
+    review, yesterday_review = compute_review_snapshot(user_id, review_date)
+    return json.dumps(review if kind == "review" else yesterday_review, ensure_ascii=False)
+
+
+def precompute_reviews(review_date: Optional[str] = None) -> int:
+    """review_date(기본 어제) 일정이 있는 사용자의 복습 스냅샷 계산 - 새로 계산한 사용자 수 반환
+
+    이미 최신 스냅샷이 있는 사용자는 건너뛰므로 여러 번 실행해도 됨
+    """
+    review_date = review_date or (date.today() - timedelta(days=1)).isoformat()
+    computed = 0
+    for user_id in store.get_review_targets(review_date):
+        if _stop_event.is_set():
+            break
+        try:
+            compute_review_snapshot(user_id, review_date)
+            computed += 1
+        except Exception as e:
+            log_error(f"복습 스냅샷 계산 실패 ({user_id}): {e}")
+
+    keep_from = (date.fromisoformat(review_date) - timedelta(days=REVIEW_SNAPSHOT_KEEP_DAYS)).isoformat()
+    store.prune_review_snapshots(keep_from)
+    return computed
+
+
+def _seconds_until_next_run() -> float:
+    now = datetime.now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (next_midnight - now).total_seconds() + REVIEW_PRECOMPUTE_AFTER_MIDNIGHT_SECONDS
+
+
+def _scheduler_loop():
+    # 시작 직후 한 번 (서버가 꺼져 있어 오늘 계산을 놓친 경우), 이후 매일 자정 이후
+    if _stop_event.wait(REVIEW_PRECOMPUTE_START_DELAY_SECONDS):
+        return
+    while not _stop_event.is_set():
+        # 여러 워커 중 리스를 가진 하나만 실행
+        if store.try_acquire_lease(_LEASE_NAME, _worker_id, _LEASE_SECONDS):
+            try:
+                computed = precompute_reviews()
+                if computed:
+                    log_success(f"복습 스냅샷 {computed}명 계산 완료")
+            except Exception as e:
+                log_error(f"복습 스냅샷 계산 실패: {e}")
+        _stop_event.wait(_seconds_until_next_run())
+
+
+def start_scheduler():
+    """매일 복습 스냅샷 계산 스레드 시작"""
+    global _scheduler_thread
+    if not REVIEW_PRECOMPUTE_ENABLED or (_scheduler_thread and _scheduler_thread.is_alive()):
+        return
+    _stop_event.clear()
+    _scheduler_thread = threading.Thread(target=_scheduler_loop, daemon=True, name="review-precompute")
+    _scheduler_thread.start()
+
+
+def stop_scheduler():
+    """복습 스냅샷 계산 스레드 종료"""
+    _stop_event.set()
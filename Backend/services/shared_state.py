@@ -0,0 +1,136 @@
+# Backend/services/shared_state.py
+"""워커 간 공유 상태 - SQLite 기반 키-값 저장소와 캐시 무효화 버스 (PRAGMA data_version 폴링)"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+# 무효화 이벤트 보관 시간 (이보다 오래된 이벤트는 정리)
+INVALIDATION_RETENTION_SECONDS = 60 * 60
+# 몇 번 발행할 때마다 오래된 이벤트를 정리할지
+_PRUNE_EVERY = 500
+
+
+class SharedState:
+    """모든 워커가 같은 값을 보는 JSON 키-값 저장소 (shared_state 테이블)"""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection]):
+        self._connect = connect
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace: str, key: str, value: Any):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO shared_state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, namespace: str, key: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class InvalidationBus:
+    """
+    프로세스 간 캐시 무효화 버스 (로컬 pub/sub 대용)
+
+    - publish: invalidations 테이블에 (scope, key) 기록 후 같은 프로세스 구독자에게 즉시 전달
+    - poll: 전용 연결의 PRAGMA data_version이 바뀌었을 때만 새 이벤트를 읽어 구독자에게 전달
+      (data_version은 다른 연결이 커밋해야 바뀌므로, 변경이 없으면 쿼리 한 번으로 끝남)
+    """
+
+    def __init__(self, db_path: str, connect: Callable[[], sqlite3.Connection]):
+        self._db_path = db_path
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._watch_conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._last_id = 0
+        self._published = 0
+
+    def subscribe(self, scope: str, callback: Callable[[str], None]):
+        """scope의 무효화 이벤트를 받을 콜백 등록 (인자: key, None이면 전체 무효화)"""
+        self._subscribers[scope].append(callback)
+
+    def _dispatch(self, scope: str, key: str):
+        for callback in self._subscribers.get(scope, []):
+            callback(key)
+
+    def _ensure_watcher(self):
+        if self._watch_conn is None:
+            self._watch_conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._data_version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+            row = self._watch_conn.execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()
+            self._last_id = row[0]
+
+    def publish(self, scope: str, key: str, conn: Optional[sqlite3.Connection] = None):
+        """
+        무효화 이벤트 발행
+
+        conn을 넘기면 호출자의 트랜잭션 안에서 기록만 하고 커밋은 호출자가 한다.
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO invalidations (scope, key, created_at) VALUES (?, ?, ?)",
+                (scope, key, time.time())
+            )
+            self._published += 1
+            if self._published % _PRUNE_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM invalidations WHERE created_at < ?",
+                    (time.time() - INVALIDATION_RETENTION_SECONDS,)
+                )
+            if own_conn:
+                conn.commit()
+        finally:
+            if own_conn:
+                conn.close()
+        self._dispatch(scope, key)
+
+    def poll(self):
+        """다른 연결/워커의 변경이 있으면 새 무효화 이벤트를 구독자에게 전달"""
+        with self._lock:
+            self._ensure_watcher()
+            version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            self._data_version = version
+            # 오래 폴링하지 않아 이벤트가 정리됐다면 전체 무효화
+            oldest = self._watch_conn.execute("SELECT MIN(id) FROM invalidations").fetchone()[0]
+            missed = oldest is not None and oldest > self._last_id + 1
+            rows = self._watch_conn.execute(
+                "SELECT id, scope, key FROM invalidations WHERE id > ? ORDER BY id", (self._last_id,)
+            ).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+
+        if missed:
+            for scope in list(self._subscribers):
+                self._dispatch(scope, None)
+            return
+        for _, scope, key in rows:
+            self._dispatch(scope, key)
@@ -1,23 +1,81 @@
 # Backend/services/store.py
 """SQLite 기반 영속성 데이터 저장소 + bcrypt 비밀번호 해싱"""
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import uuid
 import hashlib
+import re
 import sqlite3
 import json
 import os
-import bcrypt
-from jose import jwt
+import time
+
+from services.shared_state import SharedState, InvalidationBus
+from services.rate_limit import SlidingWindowLimiter
+from services.migrations import migrate
+from services.metrics import record_db_query
+from services.db_trace import trace_statement
 
 # JWT 설정
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "palearn-secret-key-change-in-production-2024")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 
-# 데이터베이스 경로
-DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "palearn.db")
+# 계획 변경 기록 보관 - 사용자당 최근 PLAN_CHANGES_KEEP개 버전 (COMPACT_EVERY 버전마다 정리)
+PLAN_CHANGES_KEEP = int(os.getenv("PLAN_CHANGES_KEEP", "500"))
+PLAN_CHANGES_COMPACT_EVERY = 50
+
+# 복습 스냅샷 종류 → 컬럼 (GET /review/yesterday, GET /plans/yesterday_review)
+_REVIEW_SNAPSHOT_COLUMNS = {"review": "review", "yesterday_review": "yesterday_review"}
+# 스냅샷(r)이 최신인지 - 만든 뒤의 변경 중 그 날짜 태스크 변경이나 계획 추가가 없을 때만
+# (다른 날짜 태스크를 바꿔도 다시 계산하지 않음, 변경 기록이 정리된 구간이면 알 수 없으므로 오래된 것으로 봄)
+_REVIEW_SNAPSHOT_FRESH = """
+    r.data_version >= COALESCE((SELECT changes_floor FROM user_data_versions WHERE user_id = r.user_id), 0)
+    AND NOT EXISTS (
+        SELECT 1 FROM plan_changes c
+        WHERE c.user_id = r.user_id AND c.seq > r.data_version
+          AND (c.kind != 'task' OR json_extract(c.payload, '$.date') = r.review_date)
+    )
+"""
+
+# 데이터베이스 경로 (PALEARN_DB_PATH로 변경 가능 - 벤치마크/테스트용 임시 DB)
+DB_PATH = os.getenv("PALEARN_DB_PATH") or os.path.join(os.path.dirname(__file__), "..", "data", "palearn.db")
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """쿼리 실행 시간을 지표/요청별 추적에 기록하는 커서"""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(sql, None, time.perf_counter() - start)
+
+    def _record(self, sql, parameters, seconds):
+        record_db_query(sql, seconds)
+        trace_statement(self.connection, sql, parameters, seconds)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """모든 쿼리가 InstrumentedCursor를 거치도록 하는 연결"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
 
 
 class PlansList(list):
@@ -40,10 +98,18 @@ class PlansList(list):
 
 
 class PlansProxy:
-    """plans 딕셔너리처럼 동작하는 프록시 클래스"""
+    """plans 딕셔너리처럼 동작하는 프록시 클래스 (캐시는 무효화 버스로 워커 간 동기화)"""
     def __init__(self, store):
         self._store = store
         self._cache = {}
+        store.invalidations.subscribe("plans", self.invalidate)
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """사용자 캐시 무효화 (None이면 전체)"""
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(user_id, None)
 
     def get(self, user_id: str, default=None):
         """딕셔너리의 get처럼 동작"""
@@ -52,6 +118,7 @@ class PlansProxy:
 
     def __getitem__(self, user_id: str):
         """plans[user_id] 접근"""
+        self._store.invalidations.poll()
         if user_id not in self._cache:
             plans = self._store.get_plans(user_id)
             self._cache[user_id] = PlansList(self._store, user_id, plans)
@@ -63,6 +130,7 @@ class PlansProxy:
 
     def setdefault(self, user_id: str, default=None):
         """딕셔너리의 setdefault처럼 동작"""
+        self._store.invalidations.poll()
         if user_id not in self._cache:
             plans = self._store.get_plans(user_id)
             self._cache[user_id] = PlansList(self._store, user_id, plans if plans else (default if default is not None else []))
@@ -72,12 +140,13 @@ class PlansProxy:
 class DataStore:
     def __init__(self):
         self._ensure_db_dir()
-        self._init_db()
+        # 워커 간 공유 상태 / 캐시 무효화
+        self.shared = SharedState(self._get_connection)
+        self.invalidations = InvalidationBus(DB_PATH, self._get_connection)
+        # 워커 간 공유 요청 한도
+        self.rate_limits = SlidingWindowLimiter(self._get_connection)
         # plans 프록시 - 기존 코드와 호환성 유지
         self.plans = PlansProxy(self)
-        # 기타 메모리 캐시
-        self.quiz_answers = {}
-        self.notifications_cache = {}
 
     def _ensure_db_dir(self):
         """데이터베이스 디렉토리 생성"""
@@ -87,98 +156,25 @@ class DataStore:
 
     def _get_connection(self):
         """SQLite 연결 반환"""
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, factory=InstrumentedConnection)
         conn.row_factory = sqlite3.Row
         return conn
 
-    def _init_db(self):
-        """데이터베이스 테이블 초기화"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Users 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                user_id TEXT PRIMARY KEY,
-                username TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                name TEXT NOT NULL,
-                birth TEXT,
-                photo_url TEXT,
-                friend_code TEXT UNIQUE NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        ''')
-
-        # Friendships 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS friendships (
-                user_id TEXT NOT NULL,
-                friend_id TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                PRIMARY KEY (user_id, friend_id),
-                FOREIGN KEY (user_id) REFERENCES users(user_id),
-                FOREIGN KEY (friend_id) REFERENCES users(user_id)
-            )
-        ''')
-
-        # Plans 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS plans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT NOT NULL,
-                plan_name TEXT NOT NULL,
-                total_duration TEXT,
-                daily_schedule TEXT,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(user_id)
-            )
-        ''')
-
-        # Notifications 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notifications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT NOT NULL,
-                message TEXT NOT NULL,
-                is_read INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(user_id)
-            )
-        ''')
-
-        # Quiz Answers 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS quiz_answers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT NOT NULL,
-                quiz_data TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(user_id)
-            )
-        ''')
-
-        # Tokens 테이블 (블랙리스트용)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS token_blacklist (
-                token TEXT PRIMARY KEY,
-                blacklisted_at TEXT NOT NULL
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+    def migrate(self) -> int:
+        """스키마 마이그레이션 실행 (서버 시작 시 한 번)"""
+        return migrate(DB_PATH)
 
     # ==================== 비밀번호 해싱 (bcrypt) ====================
 
     def _hash_password(self, password: str) -> str:
         """bcrypt로 비밀번호 해싱"""
+        import bcrypt
         salt = bcrypt.gensalt()
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
     def _verify_password(self, password: str, hashed: str) -> bool:
         """bcrypt로 비밀번호 검증"""
+        import bcrypt
         try:
             return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
         except Exception:
@@ -188,6 +184,7 @@ class DataStore:
 
     def _create_access_token(self, user_id: str) -> str:
         """JWT 액세스 토큰 생성"""
+        from jose import jwt  # jose(+cryptography) import는 첫 로그인 때 (서버 시작 시간 단축)
         expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
         to_encode = {
             "sub": user_id,
@@ -209,6 +206,7 @@ class DataStore:
                 return None
             conn.close()
 
+            from jose import jwt
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             return payload.get("sub")
         except Exception:
@@ -410,6 +408,43 @@ class DataStore:
         conn.close()
         return True
 
+    # ==================== 사용자 데이터 버전 (ETag / 변경 동기화) ====================
+
+    def _bump_data_version(self, conn: sqlite3.Connection, user_id: str, changes: List[Tuple[int, str, Optional[Dict]]] = ()) -> int:
+        """계획/태스크 변경과 같은 트랜잭션에서 사용자 데이터 버전 증가 + 변경 기록 - 새 버전 반환
+
+        changes: (plan_id, kind, payload) 목록 - 새 버전을 순번으로 plan_changes에 기록
+        """
+        version = conn.execute('''
+            INSERT INTO user_data_versions (user_id, version) VALUES (?, 1)
+            ON CONFLICT(user_id) DO UPDATE SET version = version + 1
+            RETURNING version
+        ''', (user_id,)).fetchone()[0]
+
+        if changes:
+            now = datetime.now().isoformat()
+            conn.executemany(
+                "INSERT INTO plan_changes (user_id, seq, plan_id, kind, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(user_id, version, plan_id, kind, json.dumps(payload, ensure_ascii=False) if payload is not None else None, now)
+                 for plan_id, kind, payload in changes]
+            )
+        if version % PLAN_CHANGES_COMPACT_EVERY == 0 and version > PLAN_CHANGES_KEEP:
+            # 오래된 변경 정리 - 그보다 이전 버전에서 동기화하는 클라이언트는 전체 재동기화
+            floor = version - PLAN_CHANGES_KEEP
+            conn.execute("DELETE FROM plan_changes WHERE user_id = ? AND seq <= ?", (user_id, floor))
+            conn.execute("UPDATE user_data_versions SET changes_floor = max(changes_floor, ?) WHERE user_id = ?",
+                         (floor, user_id))
+        return version
+
+    def get_data_version(self, user_id: str) -> int:
+        """사용자 데이터 버전 (변경 이력이 없으면 0)"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute("SELECT version FROM user_data_versions WHERE user_id = ?", (user_id,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else 0
+
     # ==================== 학습 계획 관리 ====================
 
     def get_plans(self, user_id: str) -> List[Dict]:
@@ -430,6 +465,125 @@ class DataStore:
 
         return result
 
+    # 목록 화면용 요약 - 일정 JSON은 SQLite json1로 집계해서 파이썬에서 파싱하지 않음
+    _PLAN_SUMMARY_COLUMNS = """
+        p.id, p.plan_name, p.total_duration, p.created_at,
+        json_extract(p.daily_schedule, '$[0].date') AS start_date,
+        json_extract(p.daily_schedule, '$[#-1].date') AS end_date,
+        json_array_length(p.daily_schedule) AS total_days,
+        (SELECT count(*) FROM json_each(p.daily_schedule) d, json_each(d.value, '$.tasks') t) AS total_tasks,
+        (SELECT count(*) FROM json_each(p.daily_schedule) d, json_each(d.value, '$.tasks') t
+          WHERE json_extract(t.value, '$.completed')) AS completed_tasks
+    """
+
+    def get_plans_page(self, user_id: str, fields: str = "full", limit: Optional[int] = None,
+                       before: Optional[Tuple[str, int]] = None, decode: bool = True) -> Tuple[List[Dict], bool]:
+        """학습 계획 페이지 조회 (최신순) - (계획 목록, 다음 페이지 존재 여부)
+
+        fields: full(전체) | summary(진행률 요약, 일정 제외) | schedule(일정 포함, 태스크별 자료 제외)
+        before: 이전 페이지 마지막 계획의 (created_at, id) - 그보다 오래된 계획부터 조회
+        decode: False면 full의 daily_schedule을 저장된 JSON 텍스트 그대로 반환 (응답에 바로 끼워 넣을 때)
+        """
+        columns = self._PLAN_SUMMARY_COLUMNS if fields == "summary" else "p.*"
+        sql = f"SELECT {columns} FROM plans p WHERE p.user_id = ?"
+        params: list = [user_id]
+        if before:
+            sql += " AND (p.created_at < ? OR (p.created_at = ? AND p.id < ?))"
+            params += [before[0], before[0], before[1]]
+        sql += " ORDER BY p.created_at DESC, p.id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+        has_more = bool(limit) and len(rows) > limit
+        result = []
+        for row in rows[:limit] if limit else rows:
+            plan = dict(row)
+            if fields != "summary" and plan.get('daily_schedule') and (decode or fields != "full"):
+                plan['daily_schedule'] = json.loads(plan['daily_schedule'])
+                if fields == "schedule":
+                    for day in plan['daily_schedule']:
+                        for task in day.get('tasks', []):
+                            task.pop('related_materials', None)
+                            task.pop('review_materials', None)
+            result.append(plan)
+        return result, has_more
+
+    def get_plan_changes(self, user_id: str, since: int) -> Dict:
+        """since 이후의 계획 변경 - {version, resync, changes}
+
+        changes는 순번 순서이고, 같은 태스크는 마지막 상태만, 구간 안에서 추가된 계획은 현재 내용 전체로 돌려준다.
+        since가 정리된 구간 이전이거나 현재 버전보다 크면 resync=True (전체를 다시 받아야 함)
+        """
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT version, changes_floor FROM user_data_versions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            version, floor = (row['version'], row['changes_floor']) if row else (0, 0)
+            if since < floor or since > version:
+                return {"version": version, "resync": True, "changes": []}
+            if since == version:
+                return {"version": version, "resync": False, "changes": []}
+
+            rows = conn.execute(
+                "SELECT seq, plan_id, kind, payload FROM plan_changes WHERE user_id = ? AND seq > ? ORDER BY seq, id",
+                (user_id, since)
+            ).fetchall()
+            added_ids = [r['plan_id'] for r in rows if r['kind'] == 'plan_added']
+            plans = {}
+            if added_ids:
+                placeholders = ",".join("?" * len(added_ids))
+                for plan_row in conn.execute(
+                    f"SELECT id, plan_name, total_duration, daily_schedule, created_at FROM plans WHERE user_id = ? AND id IN ({placeholders})",
+                    [user_id, *added_ids]
+                ):
+                    plan = dict(plan_row)
+                    plan['daily_schedule'] = json.loads(plan['daily_schedule']) if plan['daily_schedule'] else []
+                    plans[plan['id']] = plan
+        finally:
+            conn.close()
+
+        latest: Dict[tuple, Dict] = {}
+        for r in rows:
+            if r['kind'] == 'plan_added':
+                if r['plan_id'] in plans:
+                    latest[('plan', r['plan_id'])] = {"seq": r['seq'], "type": "plan_added", "plan": plans[r['plan_id']]}
+            elif r['plan_id'] not in plans:
+                # 구간 안에서 추가된 계획의 태스크 변경은 계획 내용에 이미 반영됨
+                payload = json.loads(r['payload'])
+                key = ('task', r['plan_id'], payload['date'], payload['task_id'])
+                latest.pop(key, None)
+                latest[key] = {"seq": r['seq'], "type": "task", "plan_id": r['plan_id'], **payload}
+        changes = sorted(latest.values(), key=lambda change: change['seq'])
+        return {"version": version, "resync": False, "changes": changes}
+
+    def get_day_tasks_json(self, user_id: str, target_date: str) -> Optional[Tuple[str, Optional[str]]]:
+        """현재 계획(plans[-1], 가장 먼저 만든 계획)의 해당 날짜 태스크 - (계획 이름, tasks JSON 텍스트)
+
+        계획이 없으면 None, 해당 날짜가 없으면 tasks가 None. 일정 JSON은 SQLite에서 잘라내고 파이썬에서 파싱하지 않음
+        """
+        conn = self._get_connection()
+        try:
+            row = conn.execute('''
+                SELECT p.plan_name,
+                       (SELECT json_extract(d.value, '$.tasks') FROM json_each(NULLIF(p.daily_schedule, '')) d
+                         WHERE json_extract(d.value, '$.date') = ? LIMIT 1) AS tasks
+                FROM plans p WHERE p.user_id = ?
+                ORDER BY p.created_at ASC, p.id ASC LIMIT 1
+            ''', (target_date, user_id)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return row['plan_name'], row['tasks']
+
     def save_plan(self, user_id: str, plan_name: str, total_duration: str, daily_schedule: List[Dict]) -> bool:
         """학습 계획 저장"""
         conn = self._get_connection()
@@ -439,6 +593,8 @@ class DataStore:
             INSERT INTO plans (user_id, plan_name, total_duration, daily_schedule, created_at)
             VALUES (?, ?, ?, ?, ?)
         ''', (user_id, plan_name, total_duration, json.dumps(daily_schedule, ensure_ascii=False), datetime.now().isoformat()))
+        self._bump_data_version(conn, user_id, [(cursor.lastrowid, "plan_added", None)])
+        self.invalidations.publish("plans", user_id, conn)
 
         conn.commit()
         conn.close()
@@ -446,37 +602,72 @@ class DataStore:
 
     def update_task(self, user_id: str, date: str, task_id: str, completed: bool) -> bool:
         """태스크 완료 상태 업데이트"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        return self.update_tasks_batch(user_id, [(date, task_id, completed)])[0]
 
-        cursor.execute("SELECT id, daily_schedule FROM plans WHERE user_id = ?", (user_id,))
-        rows = cursor.fetchall()
+    def update_tasks_batch(self, user_id: str, updates: List[Tuple[str, str, bool]]) -> List[bool]:
+        """여러 태스크 완료 상태를 한 트랜잭션에서 업데이트 - 작업별 성공 여부 반환
 
-        for row in rows:
-            schedule = json.loads(row['daily_schedule']) if row['daily_schedule'] else []
-            modified = False
+        updates: (date, task_id, completed) 목록 (같은 태스크가 여러 번 나오면 마지막 값)
+        바뀐 계획마다 일정 JSON을 한 번만 다시 쓰고, 데이터 버전/캐시 무효화도 한 번만
+        """
+        if not updates:
+            return []
 
-            for day in schedule:
-                if day.get('date') == date:
+        conn = self._get_connection()
+        try:
+            # 읽고 다시 쓰는 사이에 다른 요청의 변경을 덮어쓰지 않도록 쓰기 잠금부터
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("SELECT id, daily_schedule FROM plans WHERE user_id = ?", (user_id,)).fetchall()
+
+            wanted = {(date, task_id) for date, task_id, _ in updates}
+            wanted_ids = {task_id for _, task_id, _ in updates}
+            # (date, task_id) → (계획 id, 태스크) - 같은 태스크가 여러 계획에 있으면 먼저 나온 계획
+            located: Dict[Tuple[str, str], Tuple[int, Dict]] = {}
+            schedules: Dict[int, List[Dict]] = {}
+            for row in rows:
+                raw = row['daily_schedule']
+                # 대상 태스크 id가 텍스트에 없으면 파싱하지 않음
+                if not raw or not any(task_id in raw for task_id in wanted_ids):
+                    continue
+                schedule = json.loads(raw)
+                schedules[row['id']] = schedule
+                for day in schedule:
                     for task in day.get('tasks', []):
-                        if task.get('id') == task_id:
-                            task['completed'] = completed
-                            modified = True
-                            break
-                if modified:
-                    break
+                        key = (day.get('date'), task.get('id'))
+                        if key in wanted and key not in located:
+                            located[key] = (row['id'], task)
+
+            results = []
+            modified = set()
+            final: Dict[Tuple[str, str], Tuple[int, bool]] = {}
+            for date, task_id, completed in updates:
+                found = located.get((date, task_id))
+                if found is None:
+                    results.append(False)
+                    continue
+                plan_id, task = found
+                task['completed'] = completed
+                modified.add(plan_id)
+                final[(date, task_id)] = (plan_id, completed)
+                results.append(True)
 
             if modified:
-                cursor.execute(
+                conn.executemany(
                     "UPDATE plans SET daily_schedule = ? WHERE id = ?",
-                    (json.dumps(schedule, ensure_ascii=False), row['id'])
+                    [(json.dumps(schedules[plan_id], ensure_ascii=False), plan_id) for plan_id in modified]
                 )
-                conn.commit()
-                conn.close()
-                return True
-
-        conn.close()
-        return False
+                self._bump_data_version(conn, user_id, [
+                    (plan_id, "task", {"date": date, "task_id": task_id, "completed": completed})
+                    for (date, task_id), (plan_id, completed) in final.items()
+                ])
+                self.invalidations.publish("plans", user_id, conn)
+            conn.commit()
+            return results
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
     # ==================== 알림 관리 ====================
 
@@ -555,6 +746,241 @@ class DataStore:
             return json.loads(row['quiz_data'])
         return []
 
+    # ==================== 퀴즈 문제 은행 ====================
+
+    @staticmethod
+    def skill_level_key(skill: str, level: str) -> tuple:
+        """skill/level 키 정규화 (문제 은행, 추천 스냅샷, 인메모리 작업 키 공용)"""
+        return (skill or 'general').strip().lower(), (level or '').strip()
+
+    @staticmethod
+    def _question_hash(question: str) -> str:
+        """중복 판별용 문제 해시 (공백/문장부호/대소문자 무시)"""
+        normalized = re.sub(r'[\W_]+', '', question.lower())
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+    def add_quiz_bank_items(self, skill: str, level: str, quizzes: List[Dict]) -> int:
+        """문제 은행에 퀴즈 추가 (중복 문제는 무시) - 추가된 개수 반환"""
+        skill_key, level_key = self.skill_level_key(skill, level)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        added = 0
+        created_at = datetime.now().isoformat()
+        for quiz in quizzes:
+            question = (quiz.get('question') or '').strip()
+            answer_key = (quiz.get('answerKey') or '').strip().upper()
+            if not question or not answer_key:
+                continue
+            cursor.execute('''
+                INSERT OR IGNORE INTO quiz_bank
+                    (skill, level, question, question_hash, type, options, answer_key, explanation, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                skill_key, level_key, question, self._question_hash(question),
+                quiz.get('type', 'OX'), json.dumps(quiz.get('options', []), ensure_ascii=False),
+                answer_key, quiz.get('explanation', ''), created_at
+            ))
+            added += cursor.rowcount
+
+        conn.commit()
+        conn.close()
+        return added
+
+    def count_quiz_bank(self, skill: str, level: str) -> int:
+        """문제 은행 풀 크기"""
+        skill_key, level_key = self.skill_level_key(skill, level)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT COUNT(*) FROM quiz_bank WHERE skill = ? AND level = ?", (skill_key, level_key))
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+
+    def sample_quiz_bank(self, skill: str, level: str, limit: int) -> List[Dict]:
+        """문제 은행에서 무작위로 퀴즈 추출 (id는 문제 은행 id)"""
+        skill_key, level_key = self.skill_level_key(skill, level)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT id, type, question, options, answer_key, explanation FROM quiz_bank
+            WHERE skill = ? AND level = ?
+            ORDER BY RANDOM() LIMIT ?
+        ''', (skill_key, level_key, limit))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [
+            {
+                'id': row['id'],
+                'type': row['type'],
+                'question': row['question'],
+                'options': json.loads(row['options']) if row['options'] else [],
+                'answerKey': row['answer_key'],
+                'explanation': row['explanation'] or ''
+            }
+            for row in rows
+        ]
+
+    def get_quiz_bank_answers(self, quiz_ids: List[int]) -> Dict[int, str]:
+        """문제 은행 id로 정답 키 조회"""
+        if not quiz_ids:
+            return {}
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        placeholders = ', '.join('?' for _ in quiz_ids)
+        cursor.execute(f"SELECT id, answer_key FROM quiz_bank WHERE id IN ({placeholders})", list(quiz_ids))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return {row['id']: row['answer_key'] for row in rows}
+
+    # ==================== 강좌 추천 스냅샷 ====================
+
+    def record_recommend_request(self, skill: str, level: str):
+        """추천 요청 수 집계"""
+        skill_key, level_key = self.skill_level_key(skill, level)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO recommend_demand (skill, level, hits, last_requested_at) VALUES (?, ?, 1, ?)
+            ON CONFLICT (skill, level) DO UPDATE SET
+                hits = hits + 1, last_requested_at = excluded.last_requested_at
+        ''', (skill_key, level_key, datetime.now().isoformat()))
+
+        conn.commit()
+        conn.close()
+
+    def get_popular_recommend_keys(self, limit: int, since: datetime) -> List[tuple]:
+        """최근 요청이 있었던 skill/level을 요청 수 순으로 반환"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT skill, level FROM recommend_demand
+            WHERE last_requested_at >= ?
+            ORDER BY hits DESC LIMIT ?
+        ''', (since.isoformat(), limit))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [(row['skill'], row['level']) for row in rows]
+
+    def get_recommend_snapshot(self, skill: str, level: str) -> Optional[Dict]:
+        """저장된 추천 스냅샷 조회 ({'courses': [...], 'refreshed_at': datetime})"""
+        skill_key, level_key = self.skill_level_key(skill, level)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            "SELECT payload, refreshed_at FROM recommend_snapshots WHERE skill = ? AND level = ?",
+            (skill_key, level_key)
+        )
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row:
+            return None
+        return {
+            'courses': json.loads(row['payload']),
+            'refreshed_at': datetime.fromisoformat(row['refreshed_at'])
+        }
+
+    def save_recommend_snapshot(self, skill: str, level: str, courses: List[Dict]):
+        """추천 스냅샷 저장 (기존 스냅샷 교체)"""
+        skill_key, level_key = self.skill_level_key(skill, level)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            "INSERT OR REPLACE INTO recommend_snapshots (skill, level, payload, refreshed_at) VALUES (?, ?, ?, ?)",
+            (skill_key, level_key, json.dumps(courses, ensure_ascii=False), datetime.now().isoformat())
+        )
+
+        conn.commit()
+        conn.close()
+
+    # ==================== 복습 스냅샷 ====================
+
+    def get_review_snapshot(self, user_id: str, review_date: str, kind: str) -> Optional[str]:
+        """미리 계산된 복습 응답 JSON 텍스트 (kind: review / yesterday_review)
+
+        스냅샷이 없거나 만든 뒤로 그 날짜의 태스크가 바뀌었거나 계획이 추가됐으면 None
+        """
+        column = _REVIEW_SNAPSHOT_COLUMNS[kind]
+        conn = self._get_connection()
+        try:
+            row = conn.execute(f'''
+                SELECT r.{column} FROM review_snapshots r
+                WHERE r.user_id = ? AND r.review_date = ? AND {_REVIEW_SNAPSHOT_FRESH}
+            ''', (user_id, review_date)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def save_review_snapshot(self, user_id: str, review_date: str, data_version: int, review: Dict, yesterday_review: Dict):
+        """복습 스냅샷 저장 (data_version은 계획을 읽기 전에 조회한 값)"""
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO review_snapshots (user_id, review_date, data_version, review, yesterday_review, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, review_date, data_version, json.dumps(review, ensure_ascii=False),
+                 json.dumps(yesterday_review, ensure_ascii=False), datetime.now().isoformat())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_review_targets(self, review_date: str) -> List[str]:
+        """현재 계획에 해당 날짜가 있는데 최신 복습 스냅샷이 없는 사용자"""
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(f'''
+                SELECT p.user_id FROM plans p
+                LEFT JOIN review_snapshots r ON r.user_id = p.user_id AND r.review_date = ?
+                WHERE p.id = (SELECT id FROM plans WHERE user_id = p.user_id ORDER BY created_at ASC, id ASC LIMIT 1)
+                  AND (r.user_id IS NULL OR NOT ({_REVIEW_SNAPSHOT_FRESH}))
+                  AND EXISTS (SELECT 1 FROM json_each(NULLIF(p.daily_schedule, '')) d
+                              WHERE json_extract(d.value, '$.date') = ?)
+            ''', (review_date, review_date)).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def prune_review_snapshots(self, before_date: str) -> int:
+        """before_date 이전 날짜의 복습 스냅샷 삭제 - 삭제한 개수 반환"""
+        conn = self._get_connection()
+        try:
+            deleted = conn.execute("DELETE FROM review_snapshots WHERE review_date < ?", (before_date,)).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        return deleted
+
+    # ==================== 백그라운드 작업 리스 ====================
+
+    def try_acquire_lease(self, name: str, holder: str, ttl_seconds: float) -> bool:
+        """작업 리스 획득 (만료됐거나 내가 가진 리스만 갱신 가능)"""
+        now = time.time()
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO job_leases (name, holder, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE job_leases.expires_at < ? OR job_leases.holder = excluded.holder
+        ''', (name, holder, now + ttl_seconds, now))
+        acquired = cursor.rowcount > 0
+
+        conn.commit()
+        conn.close()
+        return acquired
+
     # ==================== 샘플 데이터 ====================
 
     def init_sample_data(self):
@@ -775,7 +1201,5 @@ class DataStore:
         return []
 
 
-# 싱글톤 인스턴스
+# 싱글톤 인스턴스 (DB 작업은 하지 않음 - 스키마는 store.migrate(), 샘플 데이터는 manage.py seed)
 store = DataStore()
-# 샘플 데이터 초기화
-store.init_sample_data()
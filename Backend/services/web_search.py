@@ -2,29 +2,42 @@
 """웹 검색 서비스 - 유튜브/블로그 링크 검색"""
 
 import os
-import requests
+import time
 from typing import List, Dict
 from urllib.parse import quote_plus
-from dotenv import load_dotenv
 
 from utils.logger import log_info, log_error, log_success
-
-load_dotenv()
+from services.metrics import timed, SEARCH_REQUEST_DURATION
+from services.cassette import cassette
 
 # Google API 설정 (선택적)
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+# API 주소 (벤치마크에서 로컬 가짜 서버로 교체할 때 사용)
+YOUTUBE_API_URL = os.getenv("YOUTUBE_API_URL", "https://www.googleapis.com/youtube/v3/search")
+GOOGLE_CSE_API_URL = os.getenv("GOOGLE_CSE_API_URL", "https://www.googleapis.com/customsearch/v1")
+
+
+def _http():
+    """requests 모듈 - import 비용(~0.1초)을 서버 시작이 아닌 첫 검색 API 호출 때 지불"""
+    import requests
+    return requests
 
 
 def search_youtube(query: str, max_results: int = 1) -> List[Dict]:
     """유튜브에서 강의 영상 검색"""
     log_info(f"유튜브 검색: {query}")
 
+    # cassette 재생 모드: 기록된 결과만 사용 (없으면 검색 URL)
+    if cassette.replaying:
+        recorded = cassette.replay("youtube", {"query": query, "max_results": max_results})
+        if recorded:
+            return recorded
     # YouTube Data API 사용 (API 키가 있는 경우)
-    if YOUTUBE_API_KEY:
+    elif YOUTUBE_API_KEY:
         try:
-            url = "https://www.googleapis.com/youtube/v3/search"
+            url = YOUTUBE_API_URL
             params = {
                 "part": "snippet",
                 "q": f"{query} 강의 튜토리얼",
@@ -34,7 +47,11 @@ def search_youtube(query: str, max_results: int = 1) -> List[Dict]:
                 "relevanceLanguage": "ko",
                 "videoDuration": "medium"  # 4-20분 영상
             }
-            response = requests.get(url, params=params, timeout=10)
+            start = time.perf_counter()
+            with timed(SEARCH_REQUEST_DURATION, provider="youtube") as call:
+                response = _http().get(url, params=params, timeout=10)
+                if response.status_code != 200:
+                    call.outcome = "http_error"
 
             if response.status_code == 200:
                 data = response.json()
@@ -50,6 +67,9 @@ def search_youtube(query: str, max_results: int = 1) -> List[Dict]:
                     })
                 if results:
                     log_success(f"유튜브 검색 성공: {len(results)}개")
+                    if cassette.recording:
+                        cassette.record("youtube", {"query": query, "max_results": max_results}, results,
+                                        time.perf_counter() - start)
                     return results
         except Exception as e:
             log_error(f"YouTube API 오류: {e}")
@@ -68,10 +88,15 @@ def search_blog(query: str, max_results: int = 1) -> List[Dict]:
     """블로그에서 학습 자료 검색"""
     log_info(f"블로그 검색: {query}")
 
+    # cassette 재생 모드: 기록된 결과만 사용 (없으면 검색 URL)
+    if cassette.replaying:
+        recorded = cassette.replay("blog", {"query": query, "max_results": max_results})
+        if recorded:
+            return recorded
     # Google Custom Search API 사용 (API 키가 있는 경우)
-    if GOOGLE_API_KEY and GOOGLE_CSE_ID:
+    elif GOOGLE_API_KEY and GOOGLE_CSE_ID:
         try:
-            url = "https://www.googleapis.com/customsearch/v1"
+            url = GOOGLE_CSE_API_URL
             params = {
                 "key": GOOGLE_API_KEY,
                 "cx": GOOGLE_CSE_ID,
@@ -79,7 +104,11 @@ def search_blog(query: str, max_results: int = 1) -> List[Dict]:
                 "num": max_results,
                 "lr": "lang_ko"
             }
-            response = requests.get(url, params=params, timeout=10)
+            start = time.perf_counter()
+            with timed(SEARCH_REQUEST_DURATION, provider="blog") as call:
+                response = _http().get(url, params=params, timeout=10)
+                if response.status_code != 200:
+                    call.outcome = "http_error"
 
             if response.status_code == 200:
                 data = response.json()
@@ -93,6 +122,9 @@ def search_blog(query: str, max_results: int = 1) -> List[Dict]:
                     })
                 if results:
                     log_success(f"블로그 검색 성공: {len(results)}개")
+                    if cassette.recording:
+                        cassette.record("blog", {"query": query, "max_results": max_results}, results,
+                                        time.perf_counter() - start)
                     return results
         except Exception as e:
             log_error(f"Google Search API 오류: {e}")
@@ -1,5 +1,22 @@
 # Backend/utils/logger.py
-"""터미널 컬러 로깅 유틸리티"""
+"""
+로깅 유틸리티 - 큐 기반 비동기 로깅
+
+- log_* 호출은 레코드를 큐에 넣기만 하고, 포맷/출력은 백그라운드 스레드가 담당
+- 운영(ENV != development): 한 줄 JSON, 개발: 기존 컬러 박스 형식 (LOG_FORMAT=json|pretty로 강제 가능)
+- LOG_LEVEL로 레벨, LOG_SAMPLING="request=0.1,navigation=0"으로 카테고리별 샘플링 비율 설정
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+
 
 class Colors:
     HEADER = '\033[95m'
@@ -15,71 +32,214 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+ENV = os.getenv("ENV", "development")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "pretty" if ENV == "development" else "json")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if ENV == "development" else "INFO").upper()
+# 큐가 가득 차면 버림 (요청 처리를 막지 않음)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# GPT 응답 미리보기 길이
+LOG_GPT_PREVIEW_CHARS = int(os.getenv("LOG_GPT_PREVIEW_CHARS", "500" if ENV == "development" else "200"))
+
+STAGES = {
+    1: "🔐 회원가입",
+    2: "🔑 로그인",
+    3: "🏠 홈 화면",
+    4: "📝 퀴즈 시작",
+    5: "✅ 퀴즈 채점",
+    6: "📚 강좌 추천",
+    7: "📋 계획 생성",
+    8: "👥 친구 목록",
+    9: "🔔 알림 확인",
+    10: "👤 프로필"
+}
+
+# 카테고리별 기본 레벨
+_CATEGORY_LEVELS = {
+    "request": logging.INFO,
+    "stage": logging.DEBUG,
+    "navigation": logging.DEBUG,
+    "divider": logging.DEBUG,
+    "gpt": logging.INFO,
+    "success": logging.INFO,
+    "info": logging.INFO,
+    "error": logging.ERROR,
+}
+
+
+def _parse_sampling(spec: str) -> dict:
+    rates = {}
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        name, rate = item.split('=', 1)
+        try:
+            rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+_sampling = _parse_sampling(os.getenv("LOG_SAMPLING", ""))
+
+
+class _PrettyFormatter(logging.Formatter):
+    """개발용 컬러 박스 형식"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        category = getattr(record, 'category', 'info')
+        f = getattr(record, 'fields', {})
+
+        if category == "request":
+            lines = [
+                f"\n{Colors.CYAN}┌{'─'*68}┐{Colors.ENDC}",
+                f"{Colors.CYAN}│{Colors.ENDC} {Colors.BOLD}[REQUEST]{Colors.ENDC} {f['endpoint']}",
+                f"{Colors.CYAN}│{Colors.ENDC} {Colors.YELLOW}User:{Colors.ENDC} {f['user']}",
+            ]
+            if f.get('details'):
+                lines.append(f"{Colors.CYAN}│{Colors.ENDC} {Colors.YELLOW}Details:{Colors.ENDC} {f['details']}")
+            lines.append(f"{Colors.CYAN}└{'─'*68}┘{Colors.ENDC}")
+            return '\n'.join(lines)
+
+        if category == "gpt":
+            response = f['response']
+            lines = [
+                f"\n{Colors.MAGENTA}┌{'─'*68}┐{Colors.ENDC}",
+                f"{Colors.MAGENTA}│{Colors.ENDC} {Colors.BOLD}[GPT REQUEST]{Colors.ENDC}",
+                f"{Colors.MAGENTA}│{Colors.ENDC} Prompt: {f['prompt']}...",
+                f"{Colors.MAGENTA}├{'─'*68}┤{Colors.ENDC}",
+                f"{Colors.MAGENTA}│{Colors.ENDC} {Colors.BOLD}[GPT RESPONSE]{Colors.ENDC}",
+            ]
+            for line in response.split('\n')[:10]:
+                lines.append(f"{Colors.MAGENTA}│{Colors.ENDC} {line[:66]}")
+            if f['response_length'] > len(response):
+                lines.append(f"{Colors.MAGENTA}│{Colors.ENDC} ... (총 {f['response_length']} 글자)")
+            lines.append(f"{Colors.MAGENTA}└{'─'*68}┘{Colors.ENDC}")
+            return '\n'.join(lines)
+
+        if category == "stage":
+            return '\n'.join([
+                f"\n{Colors.YELLOW}{'='*70}{Colors.ENDC}",
+                f"{Colors.YELLOW}  STAGE {f['stage']}: {f['stage_name']}{Colors.ENDC}",
+                f"{Colors.YELLOW}  User: {f['user']}{Colors.ENDC}",
+                f"{Colors.YELLOW}{'='*70}{Colors.ENDC}\n",
+            ])
+
+        if category == "navigation":
+            return f"{Colors.YELLOW}→ [NAVIGATION]{Colors.ENDC} {Colors.BOLD}{f['user']}{Colors.ENDC} → {Colors.UNDERLINE}{f['screen']}{Colors.ENDC}"
+
+        if category == "divider":
+            return f"{Colors.CYAN}{'─'*70}{Colors.ENDC}"
+
+        if category == "success":
+            return f"{Colors.GREEN}✓ [SUCCESS]{Colors.ENDC} {record.msg}"
+        if category == "error":
+            return f"{Colors.RED}✗ [ERROR]{Colors.ENDC} {record.msg}"
+        return f"{Colors.BLUE}ℹ [INFO]{Colors.ENDC} {record.msg}"
+
+
+class _JsonFormatter(logging.Formatter):
+    """운영용 한 줄 JSON 형식"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "category": getattr(record, 'category', 'info'),
+        }
+        if record.msg:
+            entry["msg"] = record.msg
+        entry.update(getattr(record, 'fields', {}))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """포맷은 리스너 스레드에서 하고, 큐가 가득 차면 레코드를 버림"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
+
+
+_logger = logging.getLogger("palearn")
+_logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+_logger.propagate = False
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(_PrettyFormatter() if LOG_FORMAT == "pretty" else _JsonFormatter())
+
+_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_logger.addHandler(_NonBlockingQueueHandler(_queue))
+_listener = logging.handlers.QueueListener(_queue, _stream_handler, respect_handler_level=False)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def _emit(category: str, msg: str = "", **fields):
+    level = _CATEGORY_LEVELS.get(category, logging.INFO)
+    if not _logger.isEnabledFor(level):
+        return
+    rate = _sampling.get(category)
+    if rate is not None and (rate <= 0 or random.random() >= rate):
+        return
+    record = _logger.makeRecord(_logger.name, level, "", 0, msg, None, None)
+    record.category = category
+    record.fields = fields
+    record.created = time.time()
+    _logger.handle(record)
+
+
 def log_divider():
-    print(f"{Colors.CYAN}{'─'*70}{Colors.ENDC}")
+    _emit("divider")
 
 
 def log_request(endpoint: str, user: str = "Anonymous", details: str = ""):
     """API 요청 로깅"""
-    print(f"\n{Colors.CYAN}┌{'─'*68}┐{Colors.ENDC}")
-    print(f"{Colors.CYAN}│{Colors.ENDC} {Colors.BOLD}[REQUEST]{Colors.ENDC} {endpoint}")
-    print(f"{Colors.CYAN}│{Colors.ENDC} {Colors.YELLOW}User:{Colors.ENDC} {user}")
-    if details:
-        print(f"{Colors.CYAN}│{Colors.ENDC} {Colors.YELLOW}Details:{Colors.ENDC} {details}")
-    print(f"{Colors.CYAN}└{'─'*68}┘{Colors.ENDC}")
+    _emit("request", endpoint=endpoint, user=user, details=details)
 
 
 def log_success(message: str):
     """성공 로깅"""
-    print(f"{Colors.GREEN}✓ [SUCCESS]{Colors.ENDC} {message}")
+    _emit("success", message)
 
 
 def log_error(message: str):
     """에러 로깅"""
-    print(f"{Colors.RED}✗ [ERROR]{Colors.ENDC} {message}")
+    _emit("error", message)
 
 
 def log_info(message: str):
     """정보 로깅"""
-    print(f"{Colors.BLUE}ℹ [INFO]{Colors.ENDC} {message}")
+    _emit("info", message)
 
 
 def log_gpt(prompt_preview: str, response_preview: str):
     """GPT 요청/응답 로깅"""
-    print(f"\n{Colors.MAGENTA}┌{'─'*68}┐{Colors.ENDC}")
-    print(f"{Colors.MAGENTA}│{Colors.ENDC} {Colors.BOLD}[GPT REQUEST]{Colors.ENDC}")
-    print(f"{Colors.MAGENTA}│{Colors.ENDC} Prompt: {prompt_preview[:100]}...")
-    print(f"{Colors.MAGENTA}├{'─'*68}┤{Colors.ENDC}")
-    print(f"{Colors.MAGENTA}│{Colors.ENDC} {Colors.BOLD}[GPT RESPONSE]{Colors.ENDC}")
-    lines = response_preview[:500].split('\n')
-    for line in lines[:10]:
-        print(f"{Colors.MAGENTA}│{Colors.ENDC} {line[:66]}")
-    if len(response_preview) > 500:
-        print(f"{Colors.MAGENTA}│{Colors.ENDC} ... (총 {len(response_preview)} 글자)")
-    print(f"{Colors.MAGENTA}└{'─'*68}┘{Colors.ENDC}")
+    _emit(
+        "gpt",
+        prompt=prompt_preview[:100],
+        response=response_preview[:LOG_GPT_PREVIEW_CHARS],
+        response_length=len(response_preview)
+    )
 
 
 def log_navigation(user: str, screen: str):
     """사용자 화면 이동 로깅"""
-    print(f"{Colors.YELLOW}→ [NAVIGATION]{Colors.ENDC} {Colors.BOLD}{user}{Colors.ENDC} → {Colors.UNDERLINE}{screen}{Colors.ENDC}")
+    _emit("navigation", user=user, screen=screen)
 
 
 def log_stage(stage_num: int, stage_name: str, user: str = ""):
     """사용자 단계 로깅"""
-    stages = {
-        1: "🔐 회원가입",
-        2: "🔑 로그인",
-        3: "🏠 홈 화면",
-        4: "📝 퀴즈 시작",
-        5: "✅ 퀴즈 채점",
-        6: "📚 강좌 추천",
-        7: "📋 계획 생성",
-        8: "👥 친구 목록",
-        9: "🔔 알림 확인",
-        10: "👤 프로필"
-    }
-    emoji_stage = stages.get(stage_num, f"📍 {stage_name}")
-    print(f"\n{Colors.YELLOW}{'='*70}{Colors.ENDC}")
-    print(f"{Colors.YELLOW}  STAGE {stage_num}: {emoji_stage}{Colors.ENDC}")
-    print(f"{Colors.YELLOW}  User: {user}{Colors.ENDC}")
-    print(f"{Colors.YELLOW}{'='*70}{Colors.ENDC}\n")
+    _emit("stage", stage=stage_num, stage_name=STAGES.get(stage_num, f"📍 {stage_name}"), user=user)
+
+
+def flush_logs():
+    """큐에 남은 로그를 모두 출력 (종료/테스트용)"""
+    _listener.stop()
+    _listener.start()